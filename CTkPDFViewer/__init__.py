@@ -10,3 +10,6 @@ __version__ = '0.2'
 
 from .ctk_pdf_viewer import CTkPDFViewer
 from .ctk_pdf_viewer_navigate import CTkPDFViewerNavigate
+from .page_cache import PageCache, shared_page_cache
+from .disk_cache import DiskPageCache
+from .render_pool import RenderPool, RenderTicket, shared_render_pool
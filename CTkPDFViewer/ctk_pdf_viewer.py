@@ -5,12 +5,25 @@ License: MIT
 """
 
 import customtkinter
-from PIL import Image
-import fitz
+from PIL import Image, ImageDraw
 from threading import Thread
+import tkinter
 import math
-import io
 import os
+import queue
+
+from .disk_cache import DiskPageCache
+from .page_cache import PageCache, shared_page_cache
+from .render_pool import RenderPool, RenderTicket, shared_render_pool
+from .rendering import rasterize_page, rasterize_tile
+
+# tile edge in screen pixels used for zoomed pages
+TILE_SIZE = 512
+# resolution of the quick first render, relative to the display size
+PREVIEW_SCALE = 0.25
+MIN_ZOOM = 0.25
+MAX_ZOOM = 8.0
+OVERLAY_COLOR = "#1f6aa5"
 
 class CTkPDFViewer(customtkinter.CTkScrollableFrame):
 
@@ -20,6 +33,13 @@ class CTkPDFViewer(customtkinter.CTkScrollableFrame):
                  page_width: int = 600,
                  page_height: int = 700,
                  page_separation_height: int = 2,
+                 virtualized: bool = False,
+                 prefetch_pages: int = 2,
+                 page_cache: PageCache = None,
+                 disk_cache: DiskPageCache = None,
+                 render_pool: RenderPool = None,
+                 zoom: float = 1.0,
+                 fit_width: bool = False,
                  **kwargs):
         
         super().__init__(master, **kwargs)
@@ -30,6 +50,58 @@ class CTkPDFViewer(customtkinter.CTkScrollableFrame):
         self.pdf_images = []
         self.labels = []
         self.file = file
+        self.file_mtime = 0.0
+        self.page_cache = page_cache if page_cache is not None else shared_page_cache
+
+        # optional persistent cache: pages are shown from disk and the file hash is validated in the background
+        self.disk_cache = disk_cache
+        self.file_hash = None
+        self.validated_hash = None
+        # bumped for every load, so hash checks of an earlier load stop
+        self.hash_generation = 0
+
+        # pending after() callbacks, cancelled in destroy()
+        self.after_ids = set()
+
+        # pages are rendered by worker threads, finished images are picked up in the Tk thread
+        self.render_pool = render_pool if render_pool is not None else shared_render_pool
+        self.render_results = queue.Queue()
+        self.ticket = None
+        self.poll_id = None
+        self.poll_interval = 30
+        self.loaded_images = {}
+
+        # virtualized mode: only pages around the viewport are rendered
+        self.virtualized = virtualized
+        self.prefetch_pages = prefetch_pages
+        self.total_pages = 0
+        self.page_container = None
+        # shown items are whole pages (page number) or tiles of zoomed pages ((page, column, row))
+        self.visible_pages = {}
+        self.visible_images = {}
+        self.exact_items = set()
+        self.free_labels = []
+        self.pending_jobs = set()
+        self.wanted_pages = frozenset()
+        self.wanted_tiles = frozenset()
+        self.update_pending = False
+
+        # zoom (virtualized mode): a cheap preview is shown first and refined at the exact display scale
+        self.zoom = min(max(zoom, MIN_ZOOM), MAX_ZOOM)
+        self.fit_width = fit_width
+        self.page_aspect = None
+        self.relayout_id = None
+        self.x_scrollbar = None
+        self.canvas_bound = False
+        self.zoom_bindings = []
+
+        # optional field overlay: overlay.items(page) -> [(u0, v0, u1, v1, label)] and
+        # overlay.hit(page, u, v) -> (u0, v0, u1, v1, label, payload) or None, coordinates normalized to 0..1
+        self.overlay = None
+        self.overlay_click = None
+        self.hovered = None
+        self.highlight = []
+        self.label_items = {}
 
         self.percentage_view = 0
         self.percentage_load = customtkinter.StringVar()
@@ -41,62 +113,622 @@ class CTkPDFViewer(customtkinter.CTkScrollableFrame):
         self.loading_bar.set(0)
         self.loading_bar.pack(side="top", fill="x", padx=10)
 
-        self.after(250, self.start_process)
+        self.schedule(250, self.start_process)
+
+    def schedule(self, delay, callback):
+        """ after() (after_idle() for delay None) that destroy() cancels if it has not run yet """
+        def run():
+            self.after_ids.discard(after_id)
+            callback()
+
+        after_id = self.after_idle(run) if delay is None else self.after(delay, run)
+        self.after_ids.add(after_id)
+        return after_id
 
     def start_process(self):
-        Thread(target=self.add_pages).start()
-        
-    def add_pages(self):
-        """ add images and labels """
-        self.percentage_bar = 0
-        open_pdf = fitz.open(self.file)
-        
-        for page in open_pdf:
-            page_data = page.get_pixmap()
-            pix = fitz.Pixmap(page_data, 0) if page_data.alpha else page_data
-            img = Image.open(io.BytesIO(pix.tobytes('ppm')))
-            label_img = customtkinter.CTkImage(img, size=(self.page_width, self.page_height))
+        """ start loading the file: the page count and all pages are produced by the render workers """
+        self.new_ticket()
+        self.loaded_images = {}
+
+        self.file_mtime = PageCache.file_mtime(self.file)
+        self.resolve_file_hash()
+        self.render_pool.submit(self.ticket, self.render_results, "count", self.count_pages, self.file)
+
+        if self.poll_id is None:
+            self.poll_render_results()
+
+    def new_ticket(self):
+        """ cancel everything queued or rendering for the previous layout """
+        if self.ticket is not None:
+            self.ticket.cancel()
+        self.ticket = RenderTicket()
+        self.pending_jobs = set()
+
+    def count_pages(self, file):
+        """ runs in a render worker: page count and size of the first page """
+        document = self.render_pool.document(file)
+        if len(document) == 0:
+            return 0, 1.0, 1.0
+        return len(document), document[0].rect.width, document[0].rect.height
+
+    def display_size(self):
+        """ page size on screen in widget units (before widget scaling) """
+        if not self.virtualized:
+            return self.page_width, self.page_height
+        return round(self.page_width * self.zoom), round(self.page_height * self.zoom)
+
+    def render_size(self):
+        """ pixel size of a page on screen - pages are rendered at exactly this size """
+        width, height = self.display_size()
+        return round(self._apply_widget_scaling(width)), round(self._apply_widget_scaling(height))
+
+    def is_tiled(self):
+        """ zoomed pages are split into tiles so only the part on screen is rendered """
+        return self.virtualized and self.zoom > 1.0
+
+    def page_image(self, file, page_number, size):
+        """ runs in a render worker: PIL image of a page (served from the page cache if unchanged) """
+        page = self.render_pool.document(file)[page_number]
+        return self.page_cache.get_page_image(file, self.file_mtime, page, size, self.rasterize)
+
+    def render_page_image(self, file, page_number, size):
+        """ runs in a render worker: page image with the field overlay drawn on top """
+        if self.virtualized and page_number not in self.wanted_pages:
+            return None  # scrolled away before the worker got to it
+        return self.draw_overlay(self.page_image(file, page_number, size), page_number)
+
+    def render_tile_image(self, file, tile, page_size, box, preview_size=None):
+        """ runs in a render worker: one tile, either exact or cut from the cached preview of its page """
+        if tile not in self.wanted_tiles:
+            return None
+
+        if preview_size is not None:
+            preview = self.page_image(file, tile[0], preview_size)
+            scale_x = preview.width / page_size[0]
+            scale_y = preview.height / page_size[1]
+            crop = (box[0] * scale_x, box[1] * scale_y, box[2] * scale_x, box[3] * scale_y)
+            img = preview.resize((box[2] - box[0], box[3] - box[1]), Image.BILINEAR, box=crop)
+        else:
+            page = self.render_pool.document(file)[tile[0]]
+            img = self.page_cache.get_page_image(file, self.file_mtime, page, ("tile",) + page_size + box,
+                                                 lambda p, key: rasterize_tile(p, key[1:3], key[3:]))
+
+        return self.draw_overlay(img, tile[0], page_size, box)
+
+    def draw_overlay(self, img, page_number, page_size=None, box=(0, 0)):
+        """ runs in a render worker: draw field rectangles and names onto a copy of a page or tile image """
+        overlay = self.overlay
+        if overlay is None:
+            return img
+
+        items = overlay.items(page_number)
+        if not items:
+            return img
+
+        width, height = page_size or img.size
+        img = img.copy()
+        draw = ImageDraw.Draw(img)
+        for u0, v0, u1, v1, label in items:
+            rect = (u0 * width - box[0], v0 * height - box[1], u1 * width - box[0], v1 * height - box[1])
+            if rect[2] < 0 or rect[3] < 0 or rect[0] > img.width or rect[1] > img.height:
+                continue
+            draw.rectangle(rect, outline=OVERLAY_COLOR, width=max(1, round(width / 800)))
+            if label and rect[2] - rect[0] > 40 and rect[3] - rect[1] > 10:
+                draw.text((rect[0] + 3, rect[1] + 1), label, fill=OVERLAY_COLOR)
+        return img
+
+    def set_field_overlay(self, overlay, on_click=None):
+        """ show field rectangles from overlay; on_click(page, u, v, hit) is called for clicks on a page """
+        self.overlay = overlay
+        self.overlay_click = on_click
+        self.hide_highlight()
+
+        # redraw what is on screen (clean page images come from the cache)
+        if self.virtualized and self.page_container is not None:
+            self.relayout()
+        elif not self.virtualized and self.labels:
+            self.configure(file=self.file)
+
+    def bind_overlay_events(self, widget):
+        # no <Leave> handling: the highlight sits on top of the page and would flicker at its own border
+        widget.bind("<Motion>", self.on_overlay_motion)
+        widget.bind("<Button-1>", self.on_overlay_click)
+
+    def overlay_position(self, event):
+        """ page number, normalized position and label of the page under the mouse, or None """
+        label = event.widget
+        while label is not None and label not in self.label_items:
+            label = label.master
+        if label is None:
+            return None
+
+        item = self.label_items[label]
+        page_number = item[0] if isinstance(item, tuple) else item
+        offset = self.tile_box(item)[:2] if isinstance(item, tuple) else (0, 0)
+        width, height = self.render_size()
+
+        u = (event.x_root - label.winfo_rootx() + offset[0]) / width
+        v = (event.y_root - label.winfo_rooty() + offset[1]) / height
+        return page_number, min(max(u, 0.0), 1.0), min(max(v, 0.0), 1.0), label, offset
+
+    def on_overlay_motion(self, event):
+        """ highlight the field under the mouse (O(log n) hit test in the overlay index) """
+        if self.overlay is None:
+            return
+        position = self.overlay_position(event)
+        if position is None:
+            return
+
+        page_number, u, v, label, offset = position
+        hit = self.overlay.hit(page_number, u, v)
+        if hit is None:
+            self.hide_highlight()
+            return
+        if self.hovered == (page_number, hit[:4]):
+            return
+
+        self.hide_highlight()
+        self.hovered = (page_number, hit[:4])
+
+        width, height = self.render_size()
+        x0, y0 = round(hit[0] * width) - offset[0], round(hit[1] * height) - offset[1]
+        x1, y1 = round(hit[2] * width) - offset[0], round(hit[3] * height) - offset[1]
+
+        parent = label.master
+        for x, y, w, h in ((x0, y0, x1 - x0, 2), (x0, y1 - 2, x1 - x0, 2), (x0, y0, 2, y1 - y0), (x1 - 2, y0, 2, y1 - y0)):
+            border = tkinter.Frame(parent, bg=OVERLAY_COLOR, width=max(1, w), height=max(1, h))
+            border.place(in_=label, x=x, y=y)
+            self.bind_overlay_events(border)
+            self.highlight.append(border)
+
+        name_tag = tkinter.Label(parent, text=hit[4], bg=OVERLAY_COLOR, fg="white")
+        name_tag.place(in_=label, x=x0, y=max(0, y0 - 20))
+        self.bind_overlay_events(name_tag)
+        self.highlight.append(name_tag)
+
+    def hide_highlight(self):
+        for widget in self.highlight:
+            widget.destroy()
+        self.highlight = []
+        self.hovered = None
+
+    def on_overlay_click(self, event):
+        if self.overlay_click is None:
+            return
+        position = self.overlay_position(event)
+        if position is None:
+            return
+
+        page_number, u, v, _, _ = position
+        hit = self.overlay.hit(page_number, u, v) if self.overlay is not None else None
+        self.overlay_click(page_number, u, v, hit)
+
+    def rasterize(self, page, size):
+        """ render a page bitmap, going through the disk cache if one is configured """
+        if self.disk_cache is not None and self.file_hash is not None:
+            return self.disk_cache.get_page_image(self.file_hash, page, size, rasterize_page)
+        return rasterize_page(page, size)
+
+    def poll_render_results(self):
+        """ runs in the Tk thread: hand finished pages of the current load to the widgets """
+        while True:
+            try:
+                ticket, key, result, error = self.render_results.get_nowait()
+            except queue.Empty:
+                break
+
+            if ticket is not self.ticket:
+                continue
+            if error is not None:
+                self.percentage_load.set(f"Error loading {os.path.basename(self.file)} \n{error}")
+                continue
+
+            if key == "count":
+                self.on_page_count(*result)
+            else:
+                self.on_page_rendered(key, result)
+
+        self.poll_id = self.after(self.poll_interval, self.poll_render_results)
+
+    def on_page_count(self, total_pages, first_page_width, first_page_height):
+        self.total_pages = total_pages
+        self.page_aspect = first_page_height / first_page_width
+        if self.virtualized:
+            self.setup_virtual_pages()
+            return
+
+        size = self.render_size()
+        for page_number in range(total_pages):
+            self.render_pool.submit(self.ticket, self.render_results, page_number,
+                                    self.render_page_image, self.file, page_number, size)
+
+    def on_page_rendered(self, key, img):
+        if not self.virtualized:
+            self.add_page(key, img)
+            return
+
+        self.pending_jobs.discard(key)
+        kind, item = key
+        exact = kind in ("page", "tile")
+        wanted = self.wanted_tiles if kind.startswith("tile") else self.wanted_pages
+        if img is None or item not in wanted:
+            return
+        if not exact and item in self.exact_items:
+            return  # the sharp version arrived first (e.g. from the cache)
+
+        self.show_item(item, img)
+        if exact:
+            self.exact_items.add(item)
+
+    def add_page(self, page_number, img):
+        """ add image and label of a page, keeping the page order if workers finish out of order """
+        self.loaded_images[page_number] = img
+
+        percentage_view = float(len(self.loaded_images)) / float(self.total_pages) * float(100)
+        self.loading_bar.set(percentage_view / 100)
+        self.percentage_load.set(f"Loading {os.path.basename(self.file)} \n{int(math.floor(percentage_view))}%")
+
+        while len(self.labels) in self.loaded_images:
+            label_img = customtkinter.CTkImage(self.loaded_images.pop(len(self.labels)), size=(self.page_width, self.page_height))
             self.pdf_images.append(label_img)
-                
-            self.percentage_bar = self.percentage_bar + 1
-            percentage_view = (float(self.percentage_bar) / float(len(open_pdf)) * float(100))
-            self.loading_bar.set(percentage_view)
-            self.percentage_load.set(f"Loading {os.path.basename(self.file)} \n{int(math.floor(percentage_view))}%")
-            
-        self.loading_bar.pack_forget()
-        self.loading_message.pack_forget()
-        open_pdf.close()
-        
-        for i in self.pdf_images:
-            label = customtkinter.CTkLabel(self, image=i, text="")
+
+            label = customtkinter.CTkLabel(self, image=label_img, text="")
             label.pack(pady=(0, self.separation))
+            self.label_items[label] = len(self.labels)
+            self.bind_overlay_events(label)
             self.labels.append(label)
+
+        if len(self.labels) == self.total_pages:
+            self.loading_bar.pack_forget()
+            self.loading_message.pack_forget()
+
+    def resolve_file_hash(self):
+        """ look up the content hash for the disk cache; an unverified hash is checked in a background thread """
+        self.file_hash = None
+        self.validated_hash = None
+        self.hash_generation += 1
+        if self.disk_cache is None:
+            return
+
+        try:
+            self.file_hash, trusted = self.disk_cache.lookup_hash(self.file)
+        except OSError:
+            return
+
+        if not trusted:
+            generation = self.hash_generation
+            Thread(target=self.validate_file_hash, args=(self.file, generation), daemon=True).start()
+            self.schedule(100, lambda: self.check_file_hash(self.file, generation))
+
+    def validate_file_hash(self, file, generation):
+        try:
+            file_hash = self.disk_cache.validate(file)
+        except OSError:
+            file_hash = self.file_hash
+        # ignore results for a file that was replaced or reloaded in the meantime
+        if file == self.file and generation == self.hash_generation:
+            self.validated_hash = file_hash
+
+    def check_file_hash(self, file, generation):
+        """ runs in the Tk thread: reload if the cached pages turned out to belong to other file contents """
+        if file != self.file or generation != self.hash_generation:
+            return  # a newer load runs its own check
+
+        if self.validated_hash is None:
+            self.schedule(100, lambda: self.check_file_hash(file, generation))
+            return
+
+        if self.validated_hash != self.file_hash:
+            self.page_cache.discard(self.file)
+            self.configure(file=self.file)
+
+    def fit_page_to_width(self):
+        """ size pages to the viewport width (keeping the aspect ratio of the first page) """
+        if not self.fit_width or self.page_aspect is None:
+            return False
+
+        width = int(self._reverse_widget_scaling(self._parent_canvas.winfo_width())) - 2 * self.separation
+        if width < 50 or width == self.page_width:
+            return False
+
+        self.page_width = width
+        self.page_height = round(width * self.page_aspect)
+        return True
+
+    def setup_virtual_pages(self):
+        """ reserve space for all pages but render only the ones near the viewport """
+        self.loading_bar.pack_forget()
+        self.loading_message.pack_forget()
+        self.fit_page_to_width()
+
+        width, height = self.display_size()
+        slot_height = height + self.separation
+        self.page_container = customtkinter.CTkFrame(self, width=width, height=max(1, self.total_pages * slot_height),
+                                                     corner_radius=0, fg_color="transparent")
+        self.page_container.pack()
+
+        if not self.canvas_bound:
+            # get notified on every scroll and resize of the viewport
+            self._parent_canvas.configure(yscrollcommand=self.on_scroll, xscrollcommand=self.on_xscroll)
+            self._parent_canvas.bind("<Configure>", lambda e: self.schedule_update(), add="+")
+            for sequence in ("<Control-MouseWheel>", "<Control-Button-4>", "<Control-Button-5>"):
+                self.zoom_bindings.append((sequence, self.bind_all(sequence, self.on_zoom_wheel, add=True)))
+
+            self.x_scrollbar = customtkinter.CTkScrollbar(self._parent_frame, orientation="horizontal",
+                                                          command=self._parent_canvas.xview)
+            self.canvas_bound = True
+
+        self._fit_frame_dimensions_to_canvas(None)
+        self.schedule(50, self.update_visible_pages)
+
+    def _fit_frame_dimensions_to_canvas(self, event):
+        """ like CTkScrollableFrame, but zoomed pages may be wider than the viewport (scrolled horizontally) """
+        canvas_width = self._parent_canvas.winfo_width()
+        content_width = canvas_width
+
+        if getattr(self, "page_container", None) is not None:
+            content_width = max(canvas_width, self.render_size()[0])
+            if self.fit_page_to_width():
+                self.schedule_relayout()
+
+        self._parent_canvas.itemconfigure(self._create_window_id, width=content_width)
+
+        if getattr(self, "x_scrollbar", None) is not None:
+            if content_width > canvas_width:
+                self.x_scrollbar.grid(row=2, column=0, sticky="ew")
+            else:
+                self.x_scrollbar.grid_forget()
+
+    def on_scroll(self, first, last):
+        """ forward scroll position to the scrollbar and refresh visible pages """
+        self._scrollbar.set(first, last)
+        self.schedule_update()
+
+    def on_xscroll(self, first, last):
+        if self.x_scrollbar is not None:
+            self.x_scrollbar.set(first, last)
+        self.schedule_update()
+
+    def on_zoom_wheel(self, event):
+        """ Ctrl + mouse wheel zooms in and out """
+        if not self.virtualized or not self._check_if_valid_scroll(event.widget):
+            return
+        zoom_in = event.num == 4 if event.num in (4, 5) else event.delta > 0
+        self.set_zoom(self.zoom * 1.25 if zoom_in else self.zoom / 1.25)
+
+    def set_zoom(self, zoom: float):
+        """ change the zoom factor of the virtualized view """
+        zoom = min(max(zoom, MIN_ZOOM), MAX_ZOOM)
+        if zoom != self.zoom:
+            self.zoom = zoom
+            self.schedule_relayout()
+
+    def schedule_relayout(self):
+        """ coalesce resize and zoom steps into one relayout """
+        if self.relayout_id is not None:
+            self.after_cancel(self.relayout_id)
+        self.relayout_id = self.after(150, self.relayout)
+
+    def relayout(self):
+        """ rebuild the page slots for a new page size, keeping the scroll position """
+        self.relayout_id = None
+        if self.page_container is None:
+            return
+
+        first = self._parent_canvas.yview()[0]
+        self.new_ticket()
+        self.reset_virtual_pages()
+        self.setup_virtual_pages()
+        self.schedule(60, lambda: self._parent_canvas.yview_moveto(first))
+
+    def schedule_update(self):
+        """ coalesce several scroll events into one update """
+        if self.virtualized and not self.update_pending:
+            self.update_pending = True
+            self.schedule(None, self.update_visible_pages)
+
+    def visible_page_range(self):
+        """ page numbers intersecting the viewport, extended by the prefetch window """
+        first, last = self._parent_canvas.yview()
+        content_height = max(1, self.winfo_height())
+        slot_height = self._apply_widget_scaling(self.display_size()[1] + self.separation)
+
+        first_page = max(0, int(first * content_height // slot_height) - self.prefetch_pages)
+        last_page = min(self.total_pages - 1, int(last * content_height // slot_height) + self.prefetch_pages)
+        return range(first_page, last_page + 1)
+
+    def tile_box(self, tile):
+        """ pixel rectangle of a tile inside its rendered page """
+        width, height = self.render_size()
+        _, column, row = tile
+        return (column * TILE_SIZE, row * TILE_SIZE,
+                min(width, (column + 1) * TILE_SIZE), min(height, (row + 1) * TILE_SIZE))
+
+    def visible_tiles(self, pages):
+        """ tiles of the given pages inside the viewport (plus half a viewport above and below) """
+        width, height = self.render_size()
+        slot_height = self._apply_widget_scaling(self.display_size()[1] + self.separation)
+        content_width = max(1, self.winfo_width())
+        content_height = max(1, self.winfo_height())
+        container_x = self.page_container.winfo_x()
+
+        x_first, x_last = self._parent_canvas.xview()
+        y_first, y_last = self._parent_canvas.yview()
+        margin = (y_last - y_first) * content_height / 2
+        left = x_first * content_width - container_x
+        right = x_last * content_width - container_x
+        top = y_first * content_height - margin
+        bottom = y_last * content_height + margin
+
+        tiles = []
+        columns = range(max(0, int(left // TILE_SIZE)), min(math.ceil(width / TILE_SIZE), int(right // TILE_SIZE) + 1))
+        for page_number in pages:
+            page_top = page_number * slot_height
+            rows = range(max(0, int((top - page_top) // TILE_SIZE)),
+                         min(math.ceil(height / TILE_SIZE), int((bottom - page_top) // TILE_SIZE) + 1))
+            tiles.extend((page_number, column, row) for row in rows for column in columns)
+        return tiles
+
+    def update_visible_pages(self):
+        """ request pages entering the viewport, recycle labels and images of pages leaving it """
+        self.update_pending = False
+        if self.page_container is None:
+            return
+
+        pages = self.visible_page_range()
+        tiles = self.visible_tiles(pages) if self.is_tiled() else []
+        self.wanted_pages = frozenset(pages)
+        self.wanted_tiles = frozenset(tiles)
+        items = tiles if self.is_tiled() else list(pages)
+        wanted = self.wanted_tiles if self.is_tiled() else self.wanted_pages
+
+        for item in list(self.visible_pages):
+            if item not in wanted:
+                label = self.visible_pages.pop(item)
+                label.place_forget()
+                self.free_labels.append(label)
+                self.visible_images.pop(item, None)
+                self.exact_items.discard(item)
+
+        size = self.render_size()
+        preview_size = (max(1, round(size[0] * PREVIEW_SCALE)), max(1, round(size[1] * PREVIEW_SCALE)))
+        if self.is_tiled():
+            # previews come from the page at zoom 1, which is usually cached already
+            preview_size = (max(1, round(size[0] / self.zoom)), max(1, round(size[1] / self.zoom)))
+
+        # all quick previews first, then the exact renders
+        for exact in (False, True):
+            for item in items:
+                if item in self.exact_items or (not exact and item in self.visible_pages):
+                    continue
+
+                if self.is_tiled():
+                    key = ("tile" if exact else "tile-preview", item)
+                    job = (self.render_tile_image, self.file, item, size, self.tile_box(item), None if exact else preview_size)
+                else:
+                    key = ("page" if exact else "preview", item)
+                    job = (self.render_page_image, self.file, item, size if exact else preview_size)
+
+                if key not in self.pending_jobs:
+                    self.pending_jobs.add(key)
+                    self.render_pool.submit(self.ticket, self.render_results, key, *job)
+
+    def show_item(self, item, img):
+        """ place a rendered page or tile at its slot, reusing a free label if possible """
+        width, height = self.display_size()
+        x = 0
+        y = (item[0] if isinstance(item, tuple) else item) * (height + self.separation)
+
+        if isinstance(item, tuple):
+            box = self.tile_box(item)
+            x = self._reverse_widget_scaling(box[0])
+            y += self._reverse_widget_scaling(box[1])
+            width = self._reverse_widget_scaling(box[2] - box[0])
+            height = self._reverse_widget_scaling(box[3] - box[1])
+
+        image = customtkinter.CTkImage(img, size=(width, height))
+        self.visible_images[item] = image
+
+        if item in self.visible_pages:
+            self.visible_pages[item].configure(image=image)
+            return
+
+        if self.free_labels:
+            label = self.free_labels.pop()
+            label.configure(image=image)
+        else:
+            label = customtkinter.CTkLabel(self.page_container, image=image, text="")
+            self.bind_overlay_events(label)
+
+        label.place(x=x, y=y)
+        self.visible_pages[item] = label
+        self.label_items[label] = item
+
+    def reset_virtual_pages(self):
+        """ drop all virtual page widgets """
+        self.hide_highlight()
+        for label in list(self.visible_pages.values()) + self.free_labels:
+            self.label_items.pop(label, None)
+            label.destroy()
+        self.visible_pages = {}
+        self.visible_images = {}
+        self.exact_items = set()
+        self.free_labels = []
+        self.pending_jobs = set()
+        self.wanted_pages = frozenset()
+        self.wanted_tiles = frozenset()
+
+        if self.page_container is not None:
+            self.page_container.destroy()
+            self.page_container = None
+
+    def unbind_zoom_wheel(self):
+        """ remove only this viewer's Ctrl + wheel handlers from the application-wide bindings """
+        for sequence, funcid in self.zoom_bindings:
+            script = self.tk.call("bind", "all", sequence)
+            lines = [line for line in script.split("\n") if funcid not in line]
+            self.tk.call("bind", "all", sequence, "\n".join(lines))
+            self.deletecommand(funcid)
+        self.zoom_bindings = []
+
+    def destroy(self):
+        self.unbind_zoom_wheel()
+        if self.ticket is not None:
+            self.ticket.cancel()
+        for after_id in [self.poll_id, self.relayout_id] + list(self.after_ids):
+            if after_id is not None:
+                self.after_cancel(after_id)
+        self.poll_id = None
+        self.relayout_id = None
+        self.after_ids = set()
+        self.reset_virtual_pages()
+        super().destroy()
         
     def configure(self, **kwargs):
         """ configurable options """
         
+        relayout = False
+
         if "file" in kwargs:
             self.file = kwargs.pop("file")
+            # drop everything still queued or rendering for the previous file
+            if self.ticket is not None:
+                self.ticket.cancel()
             self.pdf_images = []
+            self.loaded_images = {}
             for i in self.labels:
+                self.label_items.pop(i, None)
                 i.destroy()
             self.labels = []
-            self.after(250, self.start_process)
+            self.reset_virtual_pages()
+            self.loading_bar.set(0)
+            self.loading_message.pack(pady=10)
+            self.loading_bar.pack(side="top", fill="x", padx=10)
+            self.schedule(250, self.start_process)
             
         if "page_width" in kwargs:
             self.page_width = kwargs.pop("page_width")
+            relayout = True
             for i in self.pdf_images:
                 i.configure(size=(self.page_width, self.page_height))
                 
         if "page_height" in kwargs:
             self.page_height = kwargs.pop("page_height")
+            relayout = True
             for i in self.pdf_images:
                 i.configure(size=(self.page_width, self.page_height))
             
         if "page_separation_height" in kwargs:
             self.separation = kwargs.pop("page_separation_height")
+            relayout = True
             for i in self.labels:
                 i.pack_forget()
                 i.pack(pady=(0,self.separation))
+
+        if "zoom" in kwargs:
+            self.set_zoom(kwargs.pop("zoom"))
+
+        if relayout and self.virtualized and self.page_container is not None:
+            self.relayout()
         
         super().configure(**kwargs)
@@ -5,9 +5,12 @@ License: MIT
 """
 
 import customtkinter
-from PIL import Image
-import fitz
-import io
+from collections import OrderedDict
+import queue
+
+from .page_cache import PageCache, shared_page_cache
+from .render_pool import RenderPool, RenderTicket, shared_render_pool
+from .rendering import rasterize_page
 
 
 class CTkPDFViewerNavigate(customtkinter.CTkFrame):
@@ -17,6 +20,10 @@ class CTkPDFViewerNavigate(customtkinter.CTkFrame):
                  file: str,
                  page_width: int = 600,
                  page_height: int = 700,
+                 page_cache: PageCache = None,
+                 render_pool: RenderPool = None,
+                 prefetch_pages: int = 2,
+                 debounce_ms: int = 400,
                  **kwargs):
         
         super().__init__(master, **kwargs)
@@ -24,11 +31,24 @@ class CTkPDFViewerNavigate(customtkinter.CTkFrame):
         self.page_width = page_width
         self.page_height = page_height
         self.file = file
+        self.page_cache = page_cache if page_cache is not None else shared_page_cache
 
         self.current_page = 0
         self.total_pages = 0
-        self.open_pdf = None
-        self.page_images = []
+        self.file_mtime = 0.0
+
+        # pages are rendered on demand by the render workers; neighbors are prefetched into a small ring
+        self.render_pool = render_pool if render_pool is not None else shared_render_pool
+        self.render_results = queue.Queue()
+        self.ticket = None
+        self.poll_id = None
+        self.poll_interval = 30
+        self.prefetch_pages = prefetch_pages
+        self.ring_size = 2 * prefetch_pages + 1
+        self.page_images = OrderedDict()
+        self.pending_pages = set()
+        self.debounce_ms = debounce_ms
+        self.debounce_id = None
 
         # Create widgets
         self.image_label = customtkinter.CTkLabel(self, text="")
@@ -56,21 +76,76 @@ class CTkPDFViewerNavigate(customtkinter.CTkFrame):
         self.load_pdf()
 
     def load_pdf(self):
-        """ Load the PDF file and extract page images """
-        self.open_pdf = fitz.open(self.file)
-        self.total_pages = len(self.open_pdf)
-
-        self.page_images = []
-        for page in self.open_pdf:
-            pixmap = page.get_pixmap()
-            pix = fitz.Pixmap(pixmap, 0) if pixmap.alpha else pixmap
-            img = Image.open(io.BytesIO(pix.tobytes("ppm")))
-            resized_img = img.resize((self.page_width, self.page_height))
-            ctk_image = customtkinter.CTkImage(resized_img, size=(self.page_width, self.page_height))
-            self.page_images.append(ctk_image)
-
-        self.total_pages_label.configure(text=f"/{self.total_pages}")
-        self.show_page(0)
+        """ Load the PDF file - only the page count here, pages are rendered when they are shown """
+        if self.ticket is not None:
+            self.ticket.cancel()
+        self.ticket = RenderTicket()
+        self.page_images = OrderedDict()
+        self.pending_pages = set()
+
+        self.file_mtime = PageCache.file_mtime(self.file)
+        self.render_pool.submit(self.ticket, self.render_results, "count", self.count_pages, self.file)
+
+        if self.poll_id is None:
+            self.poll_render_results()
+
+    def count_pages(self, file):
+        """ runs in a render worker """
+        return len(self.render_pool.document(file))
+
+    def render_page_image(self, file, page_number, size):
+        """ runs in a render worker - pages the user already navigated away from are skipped """
+        if abs(page_number - self.current_page) > self.prefetch_pages:
+            return None
+        page = self.render_pool.document(file)[page_number]
+        return self.page_cache.get_page_image(file, self.file_mtime, page, size, rasterize_page)
+
+    def poll_render_results(self):
+        """ runs in the Tk thread: pick up finished pages """
+        while True:
+            try:
+                ticket, key, result, error = self.render_results.get_nowait()
+            except queue.Empty:
+                break
+
+            if ticket is not self.ticket or error is not None:
+                continue
+
+            if key == "count":
+                self.total_pages = result
+                self.total_pages_label.configure(text=f"/{self.total_pages}")
+                self.show_page(0)
+            else:
+                self.on_page_rendered(key, result)
+
+        self.poll_id = self.after(self.poll_interval, self.poll_render_results)
+
+    def request_page(self, page_number: int):
+        """ queue a page for rendering unless it is ready or already queued """
+        if not 0 <= page_number < self.total_pages:
+            return
+        if page_number in self.page_images or page_number in self.pending_pages:
+            return
+
+        # render at the on-screen size right away instead of resizing afterwards
+        size = (round(self._apply_widget_scaling(self.page_width)), round(self._apply_widget_scaling(self.page_height)))
+        self.pending_pages.add(page_number)
+        self.render_pool.submit(self.ticket, self.render_results, page_number,
+                                self.render_page_image, self.file, page_number, size)
+
+    def on_page_rendered(self, page_number: int, img):
+        self.pending_pages.discard(page_number)
+        if img is None:
+            return
+
+        self.page_images[page_number] = customtkinter.CTkImage(img, size=(self.page_width, self.page_height))
+        # keep only the ring of pages closest to the current one
+        while len(self.page_images) > self.ring_size:
+            farthest = max(self.page_images, key=lambda number: abs(number - self.current_page))
+            del self.page_images[farthest]
+
+        if page_number == self.current_page:
+            self.image_label.configure(image=self.page_images[page_number], text="")
 
     def validate_number(self, value: str) -> bool:
         """ Validate that the input contains only numbers """
@@ -80,7 +155,15 @@ class CTkPDFViewerNavigate(customtkinter.CTkFrame):
         """ Display the specified page number """
         if 0 <= page_number < self.total_pages:
             self.current_page = page_number
-            self.image_label.configure(image=self.page_images[page_number])
+            if page_number in self.page_images:
+                self.image_label.configure(image=self.page_images[page_number], text="")
+            else:
+                self.request_page(page_number)
+
+            # the current page first, then its neighbors
+            for distance in range(1, self.prefetch_pages + 1):
+                self.request_page(page_number + distance)
+                self.request_page(page_number - distance)
 
             self.page_entry.delete(0, "end")
             self.page_entry.insert(0, str(self.current_page + 1))
@@ -97,6 +180,9 @@ class CTkPDFViewerNavigate(customtkinter.CTkFrame):
 
     def goto_page(self, event=None):
         """ Navigate to a specific page entered by the user """
+        if self.debounce_id is not None:
+            self.after_cancel(self.debounce_id)
+            self.debounce_id = None
         try:
             page_number = int(self.page_entry.get()) - 1
             if 0 <= page_number < self.total_pages:
@@ -105,10 +191,24 @@ class CTkPDFViewerNavigate(customtkinter.CTkFrame):
             pass  # Ignore invalid input
 
     def goto_page_key_release(self, event=None):
-        """ Navigate to the page during key release """
+        """ Navigate to the page during key release - debounced, typing "123" only renders page 123 """
+        if self.debounce_id is not None:
+            self.after_cancel(self.debounce_id)
+        self.debounce_id = self.after(self.debounce_ms, self.goto_page_debounced)
+
+    def goto_page_debounced(self):
+        self.debounce_id = None
         try:
             page_number = int(self.page_entry.get()) - 1
-            if 0 <= page_number < self.total_pages:
+            if 0 <= page_number < self.total_pages and page_number != self.current_page:
                 self.show_page(page_number)
         except ValueError:
             pass  # Ignore invalid input
+
+    def destroy(self):
+        if self.ticket is not None:
+            self.ticket.cancel()
+        for after_id in (self.poll_id, self.debounce_id):
+            if after_id is not None:
+                self.after_cancel(after_id)
+        super().destroy()
@@ -0,0 +1,174 @@
+"""
+Persistent on-disk cache of rendered pages, keyed by file content hash and render size.
+"""
+
+from PIL import Image
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+def content_hash(path, chunk_size: int = 1024 * 1024):
+    """ sha1 of the file contents - identical templates share cached pages regardless of their path """
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DiskPageCache:
+    """ size bounded cache of page bitmaps stored as <directory>/<content hash>/<page>_<size>.png """
+
+    def __init__(self, directory: str, max_bytes: int = 512 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.index_file = os.path.join(directory, "index.json")
+        self.lock = threading.Lock()
+        # file path -> {"size", "mtime", "hash"} of the last time the file was seen
+        self.known_files = None
+        # cached bitmap path -> [bytes, last use], loaded lazily
+        self.entries = None
+        self.current_bytes = 0
+
+    def _load(self):
+        if self.entries is not None:
+            return
+
+        os.makedirs(self.directory, exist_ok=True)
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                self.known_files = json.load(f)
+        except (OSError, ValueError):
+            self.known_files = {}
+
+        self.entries = {}
+        self.current_bytes = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".png"):
+                    stat = os.stat(os.path.join(root, name))
+                    self.entries[os.path.join(root, name)] = [stat.st_size, stat.st_mtime]
+                    self.current_bytes += stat.st_size
+
+    def _save_index(self):
+        temp_file = self.index_file + ".tmp"
+        with open(temp_file, "w", encoding="utf-8") as f:
+            json.dump(self.known_files, f)
+        os.replace(temp_file, self.index_file)
+
+    def configure(self, max_bytes: int):
+        """ change the size cap, evicting entries if needed """
+        with self.lock:
+            self._load()
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def lookup_hash(self, path):
+        """ content hash for a file - (hash, trusted). A hash remembered for an unchanged size/mtime is returned
+            without reading the file and is not trusted until validate() confirmed it """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+
+        with self.lock:
+            self._load()
+            known = self.known_files.get(path)
+            if known and known["size"] == stat.st_size and known["mtime"] == stat.st_mtime:
+                return known["hash"], False
+
+        return self.validate(path), True
+
+    def validate(self, path):
+        """ hash the file contents and remember them for the next start """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        file_hash = content_hash(path)
+
+        with self.lock:
+            self._load()
+            self.known_files[path] = {"size": stat.st_size, "mtime": stat.st_mtime, "hash": file_hash}
+            try:
+                self._save_index()
+            except OSError:
+                pass
+        return file_hash
+
+    def entry_path(self, file_hash, page_number, size):
+        """ size is a zoom factor or a (width, height) target in pixels """
+        size_name = f"{size[0]}x{size[1]}" if isinstance(size, tuple) else f"{size:g}"
+        return os.path.join(self.directory, file_hash, f"{page_number}_{size_name}.png")
+
+    def get(self, file_hash, page_number, size):
+        """ cached bitmap or None """
+        entry_path = self.entry_path(file_hash, page_number, size)
+        with self.lock:
+            self._load()
+            entry = self.entries.get(entry_path)
+            if entry is None:
+                return None
+
+        try:
+            with Image.open(entry_path) as image:
+                image.load()
+                result = image.convert("RGB")
+        except OSError:
+            with self.lock:
+                self._drop(entry_path)
+            return None
+
+        # the file mtime doubles as "last used" so the LRU order survives restarts
+        now = time.time()
+        try:
+            os.utime(entry_path, (now, now))
+        except OSError:
+            pass
+        with self.lock:
+            entry[1] = now
+        return result
+
+    def put(self, file_hash, page_number, size, image):
+        """ store a bitmap, evicting least recently used files above the size cap """
+        entry_path = self.entry_path(file_hash, page_number, size)
+        try:
+            os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+            temp_path = entry_path + ".tmp"
+            image.save(temp_path, format="PNG", compress_level=1)
+            os.replace(temp_path, entry_path)
+            stat = os.stat(entry_path)
+        except OSError:
+            return
+
+        with self.lock:
+            self._load()
+            if entry_path in self.entries:
+                self.current_bytes -= self.entries[entry_path][0]
+            self.entries[entry_path] = [stat.st_size, stat.st_mtime]
+            self.current_bytes += stat.st_size
+            self._evict()
+
+    def get_page_image(self, file_hash, page, size, render):
+        """ bitmap for a fitz page from disk, rendered with render(page, size) and stored on a miss """
+        image = self.get(file_hash, page.number, size)
+        if image is None:
+            image = render(page, size)
+            self.put(file_hash, page.number, size, image)
+        return image
+
+    def _drop(self, entry_path):
+        entry = self.entries.pop(entry_path, None)
+        if entry is not None:
+            self.current_bytes -= entry[0]
+        try:
+            os.remove(entry_path)
+        except OSError:
+            pass
+
+    def _evict(self):
+        if self.current_bytes <= self.max_bytes:
+            return
+        for entry_path in sorted(self.entries, key=lambda p: self.entries[p][1]):
+            if self.current_bytes <= self.max_bytes:
+                break
+            self._drop(entry_path)
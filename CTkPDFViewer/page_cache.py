@@ -0,0 +1,150 @@
+"""
+Bounded LRU cache for rendered page images, shared by all viewer widgets.
+"""
+
+from collections import OrderedDict
+import hashlib
+import os
+import re
+import threading
+
+# indirect references ("12 0 R") inside PDF objects
+XREF_PATTERN = re.compile(r"(\d+) \d+ R")
+
+# field name and tooltip entries do not change how an annotation looks (renames keep the cache)
+NON_VISUAL_PATTERN = re.compile(r"/(?:T|TU)\s*(?:\((?:\\.|[^\\)])*\)|<[0-9A-Fa-f\s]*>)")
+
+
+def page_fingerprint(page):
+    """ hash of everything that changes a page's look: page object, content streams, annotations
+        (without field names) and their appearance streams - shared resources like fonts are not included """
+    doc = page.parent
+    digest = hashlib.sha1()
+    digest.update(doc.xref_object(page.xref, compressed=True).encode())
+
+    for xref in page.get_contents():
+        digest.update(doc.xref_stream_raw(xref) or b"")
+
+    for annot_xref, _, _ in page.annot_xrefs():
+        annot_source = doc.xref_object(annot_xref, compressed=True)
+        digest.update(NON_VISUAL_PATTERN.sub("", annot_source).encode())
+
+        kind, appearance = doc.xref_get_key(annot_xref, "AP/N")
+        if kind == "dict":
+            appearance_xrefs = XREF_PATTERN.findall(appearance)
+        elif kind == "xref":
+            appearance_xrefs = [appearance.split()[0]]
+        else:
+            appearance_xrefs = []
+
+        for xref in appearance_xrefs:
+            digest.update(doc.xref_stream_raw(int(xref)) or b"")
+
+    return digest.hexdigest()
+
+
+class PageCache:
+    """ thread safe LRU cache of PIL page images keyed by (file path, mtime, page, size) -
+        size is the zoom factor or (width, height) the page was rendered at """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.entries = OrderedDict()
+        # (file path, page, size) -> (fingerprint, key) to reuse unchanged pages after an edit
+        self.fingerprints = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def image_size(image):
+        """ approximate memory footprint of a PIL image """
+        return image.width * image.height * len(image.getbands())
+
+    @staticmethod
+    def file_mtime(path):
+        """ modification time used as part of the cache key """
+        try:
+            return os.path.getmtime(path)
+        except OSError:
+            return 0.0
+
+    def configure(self, max_bytes: int):
+        """ change the memory cap, evicting entries if needed """
+        with self.lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def get(self, key):
+        """ return a cached image (and mark it as recently used) or None """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            self.entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, image, fingerprint=None):
+        """ store an image, evicting least recently used entries above the memory cap """
+        nbytes = self.image_size(image)
+        with self.lock:
+            if key in self.entries:
+                self.current_bytes -= self.entries.pop(key)[1]
+            self.entries[key] = (image, nbytes)
+            self.current_bytes += nbytes
+
+            if fingerprint is not None:
+                path, _, page_number, size = key
+                self.fingerprints[(path, page_number, size)] = (fingerprint, key)
+            self._evict()
+
+    def get_page_image(self, path, mtime, page, size, render):
+        """ cached image for a fitz page - rendered with render(page, size) only if the page changed """
+        path = os.path.abspath(path)
+        key = (path, mtime, page.number, size)
+
+        image = self.get(key)
+        if image is not None:
+            return image
+
+        # file changed (e.g. after a field edit): reuse pages whose content is identical
+        fingerprint = page_fingerprint(page)
+        with self.lock:
+            previous = self.fingerprints.get((path, page.number, size))
+            if previous is not None and previous[0] == fingerprint and previous[1] in self.entries:
+                image, nbytes = self.entries.pop(previous[1])
+                self.entries[key] = (image, nbytes)
+                self.fingerprints[(path, page.number, size)] = (fingerprint, key)
+                return image
+
+        image = render(page, size)
+        self.put(key, image, fingerprint)
+        return image
+
+    def discard(self, path):
+        """ drop all cached images of one file """
+        path = os.path.abspath(path)
+        with self.lock:
+            for key in [key for key in self.entries if key[0] == path]:
+                self.current_bytes -= self.entries.pop(key)[1]
+            for key in [key for key in self.fingerprints if key[0] == path]:
+                del self.fingerprints[key]
+
+    def clear(self):
+        """ drop all cached images """
+        with self.lock:
+            self.entries.clear()
+            self.fingerprints.clear()
+            self.current_bytes = 0
+
+    def _evict(self):
+        while self.current_bytes > self.max_bytes and self.entries:
+            key, (_, nbytes) = self.entries.popitem(last=False)
+            self.current_bytes -= nbytes
+            path, _, page_number, size = key
+            previous = self.fingerprints.get((path, page_number, size))
+            if previous is not None and previous[1] == key:
+                del self.fingerprints[(path, page_number, size)]
+
+
+# cache shared by CTkPDFViewer and CTkPDFViewerNavigate
+shared_page_cache = PageCache()
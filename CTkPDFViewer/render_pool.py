@@ -0,0 +1,85 @@
+"""
+Background render workers shared by the viewer widgets.
+"""
+
+from collections import OrderedDict
+import fitz
+import os
+import queue
+import threading
+
+
+class RenderTicket:
+    """ one load of a document - cancelling it drops its pending and in-flight pages """
+
+    def __init__(self):
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class RenderPool:
+    """ worker threads that run render jobs off the Tk thread and hand results to the caller's queue.
+        PyMuPDF is not thread safe, so fitz documents are only ever touched by the workers
+        (one worker by default) """
+
+    def __init__(self, workers: int = 1, max_documents: int = 4):
+        self.workers = workers
+        self.max_documents = max_documents
+        self.jobs = queue.Queue()
+        self.threads = []
+        self.local = threading.local()
+        self.lock = threading.Lock()
+
+    def start(self):
+        with self.lock:
+            while len(self.threads) < self.workers:
+                thread = threading.Thread(target=self.work, name=f"pdf-render-{len(self.threads)}", daemon=True)
+                thread.start()
+                self.threads.append(thread)
+
+    def submit(self, ticket, results, key, job, *args):
+        """ run job(*args) in a worker and put (ticket, key, result, error) on the results queue """
+        self.start()
+        self.jobs.put((ticket, results, key, job, args))
+
+    def document(self, path):
+        """ fitz document owned by the calling worker thread, reopened when the file changed on disk """
+        documents = getattr(self.local, "documents", None)
+        if documents is None:
+            documents = self.local.documents = OrderedDict()
+
+        mtime = os.path.getmtime(path)
+        entry = documents.get(path)
+        if entry is not None and entry[0] == mtime:
+            documents.move_to_end(path)
+            return entry[1]
+
+        if entry is not None:
+            entry[1].close()
+        documents[path] = (mtime, fitz.open(path))
+        documents.move_to_end(path)
+
+        while len(documents) > self.max_documents:
+            _, (_, old_document) = documents.popitem(last=False)
+            old_document.close()
+        return documents[path][1]
+
+    def work(self):
+        while True:
+            ticket, results, key, job, args = self.jobs.get()
+            if ticket.cancelled:
+                continue
+
+            try:
+                result, error = job(*args), None
+            except Exception as e:
+                result, error = None, e
+
+            if not ticket.cancelled:
+                results.put((ticket, key, result, error))
+
+
+# pool shared by all viewer widgets
+shared_render_pool = RenderPool()
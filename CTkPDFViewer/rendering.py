@@ -0,0 +1,29 @@
+"""
+Page rasterization helpers shared by the viewer widgets.
+"""
+
+from PIL import Image
+import fitz
+
+
+def render_matrix(page, size):
+    """ fitz matrix for a zoom factor or for an exact (width, height) target in pixels """
+    if isinstance(size, tuple):
+        width, height = size
+        return fitz.Matrix(width / page.rect.width, height / page.rect.height)
+    return fitz.Matrix(size, size)
+
+
+def rasterize_page(page, size=1.0):
+    """ render a fitz page to a PIL image - size is a zoom factor or a (width, height) target.
+        The image is built straight from the pixmap samples (no PPM encode/decode, no later resize) """
+    pix = page.get_pixmap(matrix=render_matrix(page, size), alpha=False)
+    return Image.frombytes("RGB", (pix.width, pix.height), pix.samples_mv, "raw", "RGB", pix.stride)
+
+
+def rasterize_tile(page, page_size, box):
+    """ render only the pixel rectangle box = (x0, y0, x1, y1) of a page rendered at page_size = (width, height) """
+    matrix = render_matrix(page, page_size)
+    clip = fitz.Rect(box) * ~matrix
+    pix = page.get_pixmap(matrix=matrix, clip=clip, alpha=False)
+    return Image.frombytes("RGB", (pix.width, pix.height), pix.samples_mv, "raw", "RGB", pix.stride)
@@ -11,12 +11,28 @@ import threading
 import subprocess
 import shutil
 from datetime import datetime
+from src.utils.file_handler import read_definition_table, describe_dialect
+from src.utils.definitions import iter_definition_records
+from src.utils.spatial_index import SpatialIndex
 
 # Sicherheitseinstellungen
 pyautogui.FAILSAFE = True
 pyautogui.PAUSE = 0.8
 
 class AcrobatFormAutomator:
+    # Kategorien für intelligente Positionierung: Präfix → Versatz zur Startposition
+    FIELD_CATEGORIES = {
+        'obj_': (0, 0),                 # Objektdaten oben links
+        'erfasser_': (300, 0),          # Erfasser oben rechts
+        'mieter1_': (0, 200),           # Mieter 1 links mittig
+        'mieter2_': (300, 200),         # Mieter 2 rechts mittig
+        'zaehler': (0, 400),            # Zähler unten links
+        'schluessel': (150, 500),       # Übergabegegenstände
+        'handsender': (150, 520),
+        'chips': (150, 540),
+        'unterschrift': (0, 650)        # Unterschriften ganz unten
+    }
+    
     def __init__(self, root):
         self.root = root
         self.root.title("🤖 Adobe Acrobat DC Formular-Automatisierung v4.0 - Vollversion")
@@ -29,6 +45,9 @@ class AcrobatFormAutomator:
         self.is_running = False
         self.pause_automation = False
         self.field_positions = {}
+        # Räumlicher Index der platzierten Felder (Bildschirmkoordinaten) und Felder je Kategorie
+        self.position_index = SpatialIndex()
+        self.category_counts = {}
         self.created_fields = []
         self.current_task = ""
         
@@ -540,46 +559,9 @@ class AcrobatFormAutomator:
         self.log_message("Lade Feld-Definitionen...", "INFO")
         
         try:
-            # Verschiedene Encodings probieren
-            encodings = ['utf-8', 'utf-16', 'windows-1252', 'latin1', 'iso-8859-1']
-            df = None
-            used_encoding = None
-            
-            for encoding in encodings:
-                try:
-                    if self.data_path.endswith('.json'):
-                        with open(self.data_path, 'r', encoding=encoding) as f:
-                            data = json.load(f)
-                        df = pd.DataFrame(data)
-                    elif self.data_path.endswith('.csv'):
-                        # Versuche verschiedene Separatoren
-                        for sep in [';', ',', '\t']:
-                            try:
-                                df = pd.read_csv(self.data_path, sep=sep, encoding=encoding)
-                                if len(df.columns) > 1:  # Erfolgreich geparst
-                                    break
-                            except:
-                                continue
-                    else:  # TXT-Datei
-                        for sep in ['\t', ';', ',']:
-                            try:
-                                df = pd.read_csv(self.data_path, sep=sep, encoding=encoding)
-                                if len(df.columns) > 1:  # Erfolgreich geparst
-                                    break
-                            except:
-                                continue
-                    
-                    if df is not None and len(df) > 0:
-                        used_encoding = encoding
-                        break
-                        
-                except (UnicodeDecodeError, pd.errors.EmptyDataError):
-                    continue
-                    
-            if df is None:
-                raise Exception("Konnte Datei mit keinem Encoding/Separator lesen")
-                
-            self.log_message(f"Daten erfolgreich geladen mit {used_encoding} Encoding", "SUCCESS")
+            # Encoding und Separator einmal aus dem Dateianfang erkennen, dann genau ein Parse-Durchlauf
+            df, dialect = read_definition_table(self.data_path)
+            self.log_message(f"Daten erfolgreich geladen ({describe_dialect(dialect)})", "SUCCESS")
             
             # Validiere erforderliche Spalten
             required_cols = ['original_name', 'new_name']
@@ -589,7 +571,7 @@ class AcrobatFormAutomator:
                 
             # Filtere gültige Einträge
             initial_count = len(df)
-            df = df[df['new_name'].notna() & (df['new_name'].str.strip() != '')]
+            df = df[df['new_name'].notna() & (df['new_name'].astype(str).str.strip() != '')]
             valid_count = len(df)
             
             if valid_count != initial_count:
@@ -888,7 +870,9 @@ class AcrobatFormAutomator:
             self.log_message(f"Starte Erstellung von {total} Feldern...", "INFO")
             self.log_message(f"Startposition: ({start_x}, {start_y}), Abstand: {spacing}px", "DEBUG")
             
-            for index, row in df.iterrows():
+            self._rebuild_position_index()
+            
+            for index, row in enumerate(iter_definition_records(df)):
                 if not self.is_running:
                     self.log_message("Erstellung vom Benutzer gestoppt", "WARNING")
                     break
@@ -901,9 +885,6 @@ class AcrobatFormAutomator:
                 field_type = str(row.get('type', 'Textfeld'))
                 display_name = str(row.get('display_name', ''))
                 
-                # Berechne Position (intelligentes Grid-Layout)
-                x, y = self._calculate_field_position(index, start_x, start_y, spacing, field_name)
-                
                 self.log_message(f"Erstelle Feld {index+1}/{total}: {field_name} ({field_type})", "INFO")
                 self.update_progress(index, total)
                 
@@ -911,15 +892,18 @@ class AcrobatFormAutomator:
                     # Bestimme Feldgröße basierend auf Typ
                     width, height = self._get_field_size(field_type)
                     
+                    # Berechne Position (intelligentes Grid-Layout, ohne Überlappung)
+                    x, y = self._calculate_field_position(index, start_x, start_y, spacing, field_name, width, height)
+                    
                     # Erstelle Feld
                     if self.create_field_at_position(x, y, field_type, field_name, display_name, width, height):
                         successful += 1
                         
                         # Speichere Position für spätere Verwendung
-                        self.field_positions[field_name] = {
+                        self._register_field_position(field_name, {
                             'x': x, 'y': y, 'width': width, 'height': height,
                             'type': field_type, 'index': index
-                        }
+                        })
                         
                         self.log_message(f"✅ '{field_name}' erfolgreich erstellt", "SUCCESS")
                     else:
@@ -959,39 +943,69 @@ class AcrobatFormAutomator:
             self.root.after(0, lambda: self.update_status("Status: Bereit", "#E8F5E8"))
             self.root.after(0, lambda: self.update_task("Bereit"))
             
-    def _calculate_field_position(self, index, start_x, start_y, spacing, field_name):
-        """Berechnet intelligente Feldposition basierend auf Feldname und Index"""
+    def _field_category(self, field_name):
+        """Kategorie-Präfix eines Feldnamens oder None"""
+        for prefix in self.FIELD_CATEGORIES:
+            if field_name.startswith(prefix):
+                return prefix
+        return None
+        
+    def _rebuild_position_index(self):
+        """Baut Index und Kategorie-Zähler aus den gespeicherten Feldpositionen neu auf"""
+        self.category_counts = {}
+        items = []
+        
+        for field_name, pos in self.field_positions.items():
+            prefix = self._field_category(field_name)
+            if prefix:
+                self.category_counts[prefix] = self.category_counts.get(prefix, 0) + 1
+            items.append((pos['x'], pos['y'], pos['x'] + pos['width'], pos['y'] + pos['height'], field_name))
+            
+        self.position_index = SpatialIndex(items)
+        
+    def _register_field_position(self, field_name, pos):
+        """Merkt sich ein erstelltes Feld für Kategorie-Zählung und Überlappungsprüfung"""
+        if field_name not in self.field_positions:
+            prefix = self._field_category(field_name)
+            if prefix:
+                self.category_counts[prefix] = self.category_counts.get(prefix, 0) + 1
+                
+        self.field_positions[field_name] = pos
+        self.position_index.insert(pos['x'], pos['y'], pos['x'] + pos['width'], pos['y'] + pos['height'], field_name)
         
-        # Kategorien für intelligente Positionierung
-        categories = {
-            'obj_': (start_x, start_y),                    # Objektdaten oben links
-            'erfasser_': (start_x + 300, start_y),         # Erfasser oben rechts
-            'mieter1_': (start_x, start_y + 200),          # Mieter 1 links mittig
-            'mieter2_': (start_x + 300, start_y + 200),    # Mieter 2 rechts mittig
-            'zaehler': (start_x, start_y + 400),           # Zähler unten links
-            'schluessel': (start_x + 150, start_y + 500),  # Übergabegegenstände
-            'handsender': (start_x + 150, start_y + 520),
-            'chips': (start_x + 150, start_y + 540),
-            'unterschrift': (start_x, start_y + 650)       # Unterschriften ganz unten
-        }
+    def _calculate_field_position(self, index, start_x, start_y, spacing, field_name, width=0, height=0):
+        """Berechnet intelligente Feldposition basierend auf Feldname und Index"""
         
         # Suche passende Kategorie
         base_x, base_y = start_x, start_y  # Standard
         category_index = 0
         
-        for prefix, (cat_x, cat_y) in categories.items():
-            if field_name.startswith(prefix):
-                base_x, base_y = cat_x, cat_y
-                # Zähle Felder in dieser Kategorie
-                category_fields = [fn for fn in self.field_positions.keys() if fn.startswith(prefix)]
-                category_index = len(category_fields)
-                break
+        prefix = self._field_category(field_name)
+        if prefix:
+            offset_x, offset_y = self.FIELD_CATEGORIES[prefix]
+            base_x, base_y = start_x + offset_x, start_y + offset_y
+            category_index = self.category_counts.get(prefix, 0)
                 
         # Berechne finale Position
         x = base_x
         y = base_y + (category_index * spacing)
         
-        return x, y
+        if width <= 0 or height <= 0:
+            return x, y
+            
+        # Bereits belegte Stelle → nächste freie Position darunter bzw. in der nächsten Spalte
+        screen_width, screen_height = pyautogui.size()
+        spot = self.position_index.find_free_spot(x, y, x + width, y + height,
+                                                  bounds=(0, 0, screen_width, screen_height),
+                                                  gap=max(spacing - height, 2))
+        if spot is None:
+            self.log_message(f"⚠️ Kein freier Platz für '{field_name}' - Feld überlappt", "WARNING")
+            return x, y
+            
+        if (spot[0], spot[1]) != (x, y):
+            self.log_message(f"Position von '{field_name}' wegen Überlappung verschoben", "DEBUG")
+            
+        return int(spot[0]), int(spot[1])
         
     def _get_field_size(self, field_type):
         """Bestimmt Feldgröße basierend auf Typ"""
@@ -1197,7 +1211,7 @@ class AcrobatFormAutomator:
             
             self.log_message(f"Starte Umbenennung von {total} Feldern...", "INFO")
             
-            for index, row in df.iterrows():
+            for index, row in enumerate(iter_definition_records(df)):
                 if not self.is_running:
                     self.log_message("Umbenennung vom Benutzer gestoppt", "WARNING")
                     break
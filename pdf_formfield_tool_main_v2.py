@@ -13,6 +13,9 @@ import shutil
 from datetime import datetime
 import keyboard  # Für bessere Keyboard-Erkennung
 from CTkPDFViewer import *  # PDF-Viewer für CustomTkinter
+from src.utils.file_handler import read_definition_table, describe_dialect
+from src.utils.definitions import iter_definition_records
+from src.gui.components.log_view import LogBuffer
 
 # Sicherheitseinstellungen
 pyautogui.FAILSAFE = True
@@ -428,6 +431,9 @@ class AcrobatFormAutomatorPro(ctk.CTk):
         self.log_text = ctk.CTkTextbox(log_pane, height=150, font=ctk.CTkFont(family="Consolas"))
         self.log_text.pack(fill="both", expand=True, padx=10, pady=(0, 10))
         
+        # Worker loggen nur in eine Warteschlange, der Tk-Loop fügt gesammelt ein
+        self.log_buffer = LogBuffer(self.log_text)
+        
         # Log-Buttons
         log_btn_frame = ctk.CTkFrame(log_pane)
         log_btn_frame.pack(fill="x", padx=10, pady=(0, 10))
@@ -567,45 +573,9 @@ class AcrobatFormAutomatorPro(ctk.CTk):
         self.log_message("Lade Feld-Definitionen...", "INFO")
         
         try:
-            # Verschiedene Encodings probieren
-            encodings = ['utf-8', 'utf-16', 'windows-1252', 'latin1', 'iso-8859-1']
-            df = None
-            used_encoding = None
-            
-            for encoding in encodings:
-                try:
-                    if self.data_path.endswith('.json'):
-                        with open(self.data_path, 'r', encoding=encoding) as f:
-                            data = json.load(f)
-                        df = pd.DataFrame(data)
-                    elif self.data_path.endswith('.csv'):
-                        for sep in [';', ',', '\t']:
-                            try:
-                                df = pd.read_csv(self.data_path, sep=sep, encoding=encoding)
-                                if len(df.columns) > 1:
-                                    break
-                            except:
-                                continue
-                    else:  # TXT-Datei
-                        for sep in ['\t', ';', ',']:
-                            try:
-                                df = pd.read_csv(self.data_path, sep=sep, encoding=encoding)
-                                if len(df.columns) > 1:
-                                    break
-                            except:
-                                continue
-                    
-                    if df is not None and len(df) > 0:
-                        used_encoding = encoding
-                        break
-                        
-                except (UnicodeDecodeError, pd.errors.EmptyDataError):
-                    continue
-                    
-            if df is None:
-                raise Exception("Konnte Datei mit keinem Encoding/Separator lesen")
-                
-            self.log_message(f"Daten erfolgreich geladen mit {used_encoding} Encoding", "SUCCESS")
+            # Encoding und Separator einmal aus dem Dateianfang erkennen, dann genau ein Parse-Durchlauf
+            df, dialect = read_definition_table(self.data_path)
+            self.log_message(f"Daten erfolgreich geladen ({describe_dialect(dialect)})", "SUCCESS")
             
             # Validiere Spalten
             required_cols = ['original_name', 'new_name']
@@ -615,7 +585,7 @@ class AcrobatFormAutomatorPro(ctk.CTk):
                 
             # Filtere gültige Einträge
             initial_count = len(df)
-            df = df[df['new_name'].notna() & (df['new_name'].str.strip() != '')]
+            df = df[df['new_name'].notna() & (df['new_name'].astype(str).str.strip() != '')]
             valid_count = len(df)
             
             if valid_count != initial_count:
@@ -775,7 +745,7 @@ class AcrobatFormAutomatorPro(ctk.CTk):
             
             self.log_message(f"Na boom... Starten wir halt mal die Erstellung von {total} Feldern...", "INFO")
             
-            for index, row in df.iterrows():
+            for index, row in enumerate(iter_definition_records(df)):
                 if not self.is_running:
                     break
                     
@@ -944,14 +914,10 @@ class AcrobatFormAutomatorPro(ctk.CTk):
         }
         
         icon = level_icons.get(level, "ℹ️")
-        formatted_message = f"[{timestamp}] {icon} {message}\n"
-        
-        # Füge zu Log hinzu
-        self.log_text.insert("end", formatted_message)
-        self.log_text.see("end")
+        formatted_message = f"[{timestamp}] {icon} {message}"
         
-        # Aktualisiere UI
-        self.update_idletasks()
+        # Füge zu Log hinzu (threadsicher, eingefügt wird im Tk-Loop)
+        self.log_buffer.post(formatted_message)
         
     def update_status(self, message, color="#4CAF50"):
         """Aktualisiert die Statusanzeige"""
@@ -994,7 +960,7 @@ class AcrobatFormAutomatorPro(ctk.CTk):
         
     def clear_log(self):
         """Löscht das Log"""
-        self.log_text.delete("0.0", "end")
+        self.log_buffer.clear()
         self.log_message("Log gelöscht", "INFO")
         
     def save_log(self):
@@ -1075,6 +1041,7 @@ class AcrobatFormAutomatorPro(ctk.CTk):
                 
         # Speichere Einstellungen
         self.save_settings()
+        self.log_buffer.stop()
         self.destroy()
 
 # ===== HAUPTPROGRAMM =====
@@ -1,36 +1,57 @@
 import pyautogui
-import time
 import subprocess
 import os
 from ..utils.logger import Logger
+from .waiting import Waiter
 
 class AcrobatController:
-    def __init__(self):
+    # Fenstertitel, an denen Acrobat erkannt wird
+    WINDOW_TITLES = ["Adobe Acrobat", "Acrobat", "Adobe Acrobat Reader", "Adobe Reader"]
+    
+    def __init__(self, waiter=None):
         self.logger = Logger()
+        self.waiter = waiter or Waiter()
         pyautogui.FAILSAFE = True
         
+    def _acrobat_window_exists(self):
+        """Bedingung: ein Acrobat-Fenster ist vorhanden (None ohne Fensterabfrage)"""
+        if not self.waiter.enabled or not hasattr(pyautogui, "getWindowsWithTitle"):
+            return None
+        return lambda: any(pyautogui.getWindowsWithTitle(title) for title in self.WINDOW_TITLES)
+        
+    def _window_strip_changes(self, height=160):
+        """Bedingung: oberer Bereich (Menü und Werkzeugleisten) des aktiven Fensters ändert sich"""
+        get_active_window = getattr(pyautogui, "getActiveWindow", None)
+        if not self.waiter.enabled or get_active_window is None:
+            return None
+        
+        try:
+            window = get_active_window()
+            region = (max(0, window.left), max(0, window.top), window.width, min(height, window.height))
+        except Exception:
+            return None
+        return self.waiter.region_changes(region)
+        
     def focus_acrobat(self):
         """Bringt Adobe Acrobat DC in den Vordergrund"""
         self.logger.log("Fokussiere Adobe Acrobat DC...", "INFO")
         
         try:
-            window_titles = ["Adobe Acrobat", "Acrobat", "Adobe Acrobat Reader", "Adobe Reader"]
-            
             focused = False
-            for title in window_titles:
+            for title in self.WINDOW_TITLES:
                 windows = pyautogui.getWindowsWithTitle(title)
                 if windows:
                     windows[0].activate()
-                    time.sleep(1)
+                    self.waiter.until(self.waiter.window_title_contains(title), fallback=1)
                     focused = True
                     self.logger.log(f"Adobe Acrobat DC fokussiert (Titel: {title})", "SUCCESS")
                     break
-                    
+            
             if not focused:
                 self.logger.log("Adobe Acrobat DC Fenster nicht gefunden", "WARNING")
                 return False
             return True
-                
+        
         except Exception as e:
             self.logger.log(f"Fehler beim Fokussieren: {str(e)}", "ERROR")
             return False
@@ -60,14 +81,15 @@ class AcrobatController:
                         started = True
                         self.logger.log(f"Adobe Acrobat DC gestartet von: {path}", "SUCCESS")
                         break
-                        
+                
                 if not started:
                     self.logger.log("Adobe Acrobat DC nicht gefunden. Bitte manuell starten.", "WARNING")
                     return False
-                    
-            time.sleep(3)  # Warte bis Acrobat geladen ist
-            return True
             
+            # Warte bis das Acrobat-Fenster erscheint (höchstens 30 s)
+            self.waiter.until(self._acrobat_window_exists(), fallback=3, timeout=30)
+            return True
+        
         except Exception as e:
             self.logger.log(f"Fehler beim Starten von Adobe Acrobat DC: {str(e)}", "ERROR")
             return False
@@ -80,17 +102,20 @@ class AcrobatController:
             # Stelle sicher, dass Acrobat fokussiert ist
             if not self.focus_acrobat():
                 return False
-                
-            pyautogui.PAUSE = speed
+            
+            self.waiter.configure(speed)
             
             # Methode 1: Keyboard Shortcut
+            # Formular-Modus blendet die Werkzeugleiste um → oberen Fensterbereich beobachten
+            toolbar_switched = self._window_strip_changes()
             self.logger.log("Versuche Tastenkombination Shift+Ctrl+7...", "DEBUG")
             pyautogui.hotkey('shift', 'ctrl', '7')
-            time.sleep(3)
+            if not self.waiter.until(toolbar_switched, fallback=3):
+                self.logger.log("Keine Änderung der Werkzeugleiste erkannt", "WARNING")
             
             self.logger.log("Formular-Modus sollte jetzt aktiv sein", "SUCCESS")
             return True
-            
+        
         except Exception as e:
             self.logger.log(f"Fehler beim Aktivieren des Formular-Modus: {str(e)}", "ERROR")
             return False
@@ -102,17 +127,21 @@ class AcrobatController:
         try:
             if not self.focus_acrobat():
                 return False
-                
+            
+            # Ob ein "Speichern unter"-Dialog erscheint, zeigt der Wechsel des aktiven Fensters
+            dialog_opened = self.waiter.window_changes()
             pyautogui.hotkey('ctrl', 's')
-            time.sleep(2)
+            dialog_shown = self.waiter.until(dialog_opened, fallback=2, timeout=2)
             
-            # Falls "Speichern unter" Dialog erscheint
-            pyautogui.press('enter')  # Bestätigen
-            time.sleep(1)
+            # Falls "Speichern unter" Dialog erscheint (ohne prüfbare Bedingung wie bisher immer bestätigen)
+            if dialog_shown:
+                dialog_closed = self.waiter.window_changes()
+                pyautogui.press('enter')  # Bestätigen
+                self.waiter.until(dialog_closed, fallback=1)
             
             self.logger.log("PDF gespeichert", "SUCCESS")
             return True
-            
+        
         except Exception as e:
             self.logger.log(f"Fehler beim Speichern: {str(e)}", "ERROR")
             return False
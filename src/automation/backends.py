@@ -0,0 +1,128 @@
+from .pdf_field_engine import PdfFieldEngine
+
+class AutomationBackend:
+    """Gemeinsame Schnittstelle aller Automatisierungs-Backends (GUI-Skripting, PyMuPDF, Test-Doubles)"""
+
+    name = ""
+    # Speichern nach einem Lauf automatisch (bei GUI-Skripting speichert der Bediener selbst)
+    auto_save = False
+
+    def open(self, pdf_path):
+        """Bereitet das Backend für ein Dokument vor"""
+        return True
+
+    def create_field(self, definition, index=0):
+        """Erstellt ein Feld aus einer Definitionszeile (type, new_name, display_name, ...)"""
+        raise NotImplementedError
+
+    def rename_field(self, original_name, new_name):
+        """Benennt ein Feld um"""
+        raise NotImplementedError
+
+    def save(self, backup=False):
+        """Speichert das Dokument"""
+        raise NotImplementedError
+
+    def list_fields(self):
+        """Gibt die bekannten Feldnamen zurück"""
+        raise NotImplementedError
+
+    def close(self):
+        """Gibt Ressourcen des Backends frei"""
+        pass
+
+class AcrobatGuiBackend(AutomationBackend):
+    """Backend über GUI-Skripting von Adobe Acrobat DC (pyautogui)"""
+
+    name = "Acrobat (GUI)"
+    auto_save = False
+
+    def __init__(self, acrobat_controller=None, field_operations=None, speed=1.0):
+        # Import erst hier, damit headless Backends ohne Desktop/pyautogui auskommen
+        from .acrobat_controller import AcrobatController
+        from .field_operations import FieldOperations
+        
+        self.acrobat_controller = acrobat_controller or AcrobatController()
+        self.field_operations = field_operations or FieldOperations()
+        self.speed = speed
+        self.known_fields = []
+
+    def open(self, pdf_path):
+        """Setzt die Automatisierungs-Geschwindigkeit - das PDF ist bereits in Acrobat geöffnet"""
+        self.field_operations.waiter.configure(self.speed)
+        return True
+
+    def create_field(self, definition, index=0):
+        """Zeichnet das Feld in Acrobat - an den Spalten screen_x/screen_y (Bildschirmkoordinaten),
+        ohne sie im Grid nach Index"""
+        field_name = str(definition["new_name"])
+        field_type = str(definition.get("type", "Textfeld"))
+        display_name = str(definition.get("display_name", ""))
+        
+        x = definition.get("screen_x")
+        y = definition.get("screen_y")
+        if x is None or y is None:
+            # Berechne Position (einfaches Grid)
+            x = 100
+            y = 150 + (index * 40)
+        
+        success = self.field_operations.create_field_at_position(
+            x, y, field_type, field_name, display_name, 200, 25
+        )
+        if success:
+            self.known_fields.append(field_name)
+        return success
+
+    def rename_field(self, original_name, new_name):
+        """Sucht das Feld per Tab-Navigation und benennt es um"""
+        success = self.field_operations.find_and_rename_field(original_name, new_name)
+        if success:
+            self.known_fields.append(new_name)
+        return success
+
+    def save(self, backup=False):
+        """Speichert über Strg+S in Acrobat"""
+        return self.acrobat_controller.save_pdf()
+
+    def list_fields(self):
+        """Acrobat lässt sich nicht ohne Durchklicken abfragen - liefert die in dieser Sitzung bearbeiteten Felder"""
+        return list(self.known_fields)
+
+class PyMuPDFBackend(AutomationBackend):
+    """Headless Backend, das direkt im Dokument arbeitet (PyMuPDF)"""
+
+    name = "PyMuPDF (direkt)"
+    auto_save = True
+
+    def __init__(self, engine=None):
+        self.engine = engine or PdfFieldEngine()
+
+    def open(self, pdf_path):
+        return self.engine.open_pdf(pdf_path)
+
+    def create_field(self, definition, index=0):
+        return self.engine.create_field_from_row(definition)
+
+    def rename_field(self, original_name, new_name):
+        return self.engine.rename_field(original_name, new_name)
+
+    def save(self, backup=False):
+        return self.engine.save(backup=backup)
+
+    def list_fields(self):
+        return self.engine.list_fields()
+
+    def close(self):
+        self.engine.close()
+
+# Registrierte Backends (Anzeigename → Klasse)
+BACKENDS = {
+    AcrobatGuiBackend.name: AcrobatGuiBackend,
+    PyMuPDFBackend.name: PyMuPDFBackend
+}
+
+def create_backend(name, **kwargs):
+    """Erstellt ein Backend anhand seines Namens"""
+    if name not in BACKENDS:
+        raise Exception(f"Unbekanntes Backend: {name}")
+    return BACKENDS[name](**kwargs)
@@ -0,0 +1,75 @@
+from .screen_capture import grab_image
+
+# Größe des beobachteten Ausschnitts um die kalibrierte Position (Titelleiste des Dialogs)
+REGION_WIDTH = 240
+REGION_HEIGHT = 40
+
+# Auflösung des Bild-Hashes (16 × 8 = 128 Bit)
+HASH_SIZE = (16, 8)
+
+# Erlaubte abweichende Bits - kleine Unterschiede (Cursor, Kantenglättung) zählen noch als Treffer
+MAX_DISTANCE = 12
+
+def region_hash(region):
+    """Mittelwert-Hash eines kleinen Bildschirmausschnitts: Graustufen, verkleinert, je Pixel ein Bit
+    (heller/dunkler als der Durchschnitt) - unempfindlich gegen leichte Farb- und Kantenunterschiede"""
+    image = grab_image(region)
+    pixels = list(image.convert("L").resize(HASH_SIZE).getdata())
+    average = sum(pixels) / len(pixels)
+
+    bits = 0
+    for pixel in pixels:
+        bits = (bits << 1) | (pixel > average)
+    return bits
+
+class DialogDetector:
+    """Erkennt einen geöffneten Dialog am Hash eines kleinen Bildschirmausschnitts - die Vorlage wird bei der
+    Kalibrierung einmal aufgenommen und in den Einstellungen gespeichert"""
+
+    def __init__(self, max_distance=MAX_DISTANCE):
+        self.max_distance = max_distance
+        self.region = None
+        self.template = None
+
+    @property
+    def is_calibrated(self):
+        return self.region is not None and self.template is not None
+
+    def capture_template(self, x, y):
+        """Nimmt die Vorlage um die Position (x, y) auf - der Dialog muss dabei geöffnet sein"""
+        self.region = (max(0, x - REGION_WIDTH // 2), max(0, y - REGION_HEIGHT // 2), REGION_WIDTH, REGION_HEIGHT)
+        self.template = region_hash(self.region)
+        return self.to_settings()
+
+    def to_settings(self):
+        """Vorlage als JSON-taugliches Dict (für die Einstellungen)"""
+        if not self.is_calibrated:
+            return None
+        return {"region": list(self.region), "hash": f"{self.template:x}"}
+
+    def load_settings(self, settings):
+        """Übernimmt eine gespeicherte Vorlage (ungültige Einträge werden ignoriert)"""
+        try:
+            self.region = tuple(int(value) for value in settings["region"])
+            self.template = int(settings["hash"], 16)
+            return True
+        except Exception:
+            self.region = None
+            self.template = None
+            return False
+
+    def distance(self):
+        """Anzahl abweichender Bits zwischen aktuellem Ausschnitt und Vorlage"""
+        return bin(region_hash(self.region) ^ self.template).count("1")
+
+    def is_open(self):
+        """True, wenn der Ausschnitt der Vorlage entspricht"""
+        return self.distance() <= self.max_distance
+
+    def opened_condition(self):
+        """Bedingung für Waiter.until: Dialog ist sichtbar (None ohne Kalibrierung)"""
+        return self.is_open if self.is_calibrated else None
+
+    def closed_condition(self):
+        """Bedingung für Waiter.until: Dialog ist verschwunden (None ohne Kalibrierung)"""
+        return (lambda: not self.is_open()) if self.is_calibrated else None
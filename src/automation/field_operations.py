@@ -1,39 +1,58 @@
 import pyautogui
-import time
 import keyboard
 import pyperclip
 from ..utils.logger import Logger
+from ..utils.timing import step_timer
+from .waiting import Waiter, region_around
+from .dialog_detector import DialogDetector
 
 class FieldOperations:
-    def __init__(self):
+    # Versuche, den Eigenschaften-Dialog über das Kontextmenü zu öffnen
+    MENU_ATTEMPTS = 2
+    
+    def __init__(self, waiter=None, dialog_detector=None):
         self.logger = Logger()
         self.field_positions = {}
+        # Wartet auf sichtbare Reaktionen von Acrobat statt fester Pausen (sofern verfügbar)
+        self.waiter = waiter or Waiter()
+        # Erkennt den Eigenschaften-Dialog an einer bei der Kalibrierung aufgenommenen Vorlage
+        self.dialog_detector = dialog_detector or DialogDetector()
+        # Dauer je GUI-Schritt (pyautogui.PAUSE nach jeder Aktion ist in der Aktion enthalten,
+        # feste Wartezeiten laufen als eigene "wait:"-Schritte)
+        self.timer = step_timer
         
     def create_field_at_position(self, x, y, field_type, field_name, display_name="", width=200, height=25):
         """Erstellt ein Feld an der angegebenen Position"""
         self.logger.log(f"Erstelle {field_type}: {field_name} bei ({x}, {y})", "INFO")
         
         try:
-            # Wähle entsprechendes Tool
-            if not self.select_field_tool(field_type):
-                self.logger.log(f"Konnte Tool für {field_type} nicht auswählen", "WARNING")
-                return False
+            with self.timer.span("create_field"):
+                # Wähle entsprechendes Tool
+                if not self.select_field_tool(field_type):
+                    self.logger.log(f"Konnte Tool für {field_type} nicht auswählen", "WARNING")
+                    return False
                 
-            # Erstelle Feld durch Ziehen
-            self.logger.log(f"Zeichne {field_type} mit Größe {width}x{height}", "DEBUG")
-            
-            pyautogui.moveTo(x, y, duration=0.3)
-            time.sleep(0.2)
-            
-            pyautogui.mouseDown()
-            pyautogui.dragTo(x + width, y + height, duration=0.8)
-            pyautogui.mouseUp()
-            
-            time.sleep(1)
-            
-            # Konfiguriere Feld-Eigenschaften
-            return self.configure_field_properties(field_name, display_name, field_type)
-            
+                # Erstelle Feld durch Ziehen
+                self.logger.log(f"Zeichne {field_type} mit Größe {width}x{height}", "DEBUG")
+                
+                with self.timer.span("move_to_start"):
+                    pyautogui.moveTo(x, y, duration=0.3)
+                with self.timer.span("wait:before_drag"):
+                    self.waiter.sleep(0.2)
+                
+                # Feld ist gezeichnet, sobald sich der Bereich geändert hat und ruhig ist
+                field_drawn = self.waiter.region_changes(region_around(x, y, width, height))
+                with self.timer.span("drag_field"):
+                    pyautogui.mouseDown()
+                    pyautogui.dragTo(x + width, y + height, duration=0.8)
+                    pyautogui.mouseUp()
+                
+                with self.timer.span("wait:after_drag"):
+                    self.waiter.until(field_drawn, fallback=1)
+                
+                # Konfiguriere Feld-Eigenschaften
+                return self.configure_field_properties(field_name, display_name, field_type)
+        
         except Exception as e:
             self.logger.log(f"Fehler beim Erstellen von Feld {field_name}: {str(e)}", "ERROR")
             return False
@@ -59,12 +78,14 @@ class FieldOperations:
         
         try:
             # Versuche Keyboard Shortcut
-            pyautogui.press(key)
-            time.sleep(0.5)
+            with self.timer.span("select_tool"):
+                pyautogui.press(key)
+            with self.timer.span("wait:after_tool"):
+                self.waiter.sleep(0.5)  # Werkzeugwechsel ist nicht sichtbar prüfbar
             
             self.logger.log(f"Tool ausgewählt: {field_type} (Taste: {key})", "DEBUG")
             return True
-            
+        
         except Exception as e:
             self.logger.log(f"Fehler beim Auswählen des Tools: {str(e)}", "ERROR")
             return False
@@ -73,103 +94,166 @@ class FieldOperations:
         """Konfiguriert die Eigenschaften des erstellten Feldes"""
         
         try:
-            time.sleep(0.5)
+            with self.timer.span("wait:before_properties"):
+                self.waiter.sleep(0.5)
             
             # Öffne Properties-Dialog
             # Methode 1: Doppelklick (falls Feld noch selektiert)
-            pyautogui.doubleClick()
-            time.sleep(1)
+            dialog_opened = self._dialog_opened()
+            with self.timer.span("open_properties"):
+                pyautogui.doubleClick()
+            with self.timer.span("wait:properties_dialog"):
+                self.waiter.until(dialog_opened, fallback=1)
             
-            # Falls das nicht funktioniert, versuche Rechtsklick
-            if not self._is_properties_dialog_open():
-                pyautogui.rightClick()
-                time.sleep(0.5)
-                pyautogui.press('p')  # Properties
-                time.sleep(1)
+            # Falls das nicht funktioniert, versuche Rechtsklick (gezielt wiederholt statt blind zu tippen)
+            attempts = 0
+            while not self._is_properties_dialog_open():
+                if attempts == self.MENU_ATTEMPTS:
+                    raise Exception("Eigenschaften-Dialog öffnet sich nicht")
+                if attempts:
+                    pyautogui.press('esc')  # Übrig gebliebenes Kontextmenü schließen
+                attempts += 1
                 
+                with self.timer.span("open_properties_menu"):
+                    self._open_properties_menu(menu_fallback=0.5, dialog_fallback=1)
+            
             # Feldname eingeben
-            pyautogui.hotkey('ctrl', 'a')  # Alles markieren
-            time.sleep(0.1)
-            pyautogui.typewrite(field_name, interval=0.02)
+            with self.timer.span("type_name"):
+                pyautogui.hotkey('ctrl', 'a')  # Alles markieren
+                self.waiter.sleep(0.1)
+                pyautogui.typewrite(field_name, interval=0.02)
             
             # Display Name (falls vorhanden und Feld verfügbar)
             if display_name and display_name.strip():
-                pyautogui.press('tab')  # Nächstes Feld
-                time.sleep(0.1)
-                pyautogui.typewrite(display_name, interval=0.02)
-                
+                with self.timer.span("type_display_name"):
+                    pyautogui.press('tab')  # Nächstes Feld
+                    self.waiter.sleep(0.1)
+                    pyautogui.typewrite(display_name, interval=0.02)
+            
             # Speichere Properties
-            pyautogui.press('enter')  # OK Button
-            time.sleep(0.5)
+            dialog_closed = self._dialog_closed()
+            with self.timer.span("confirm_properties"):
+                pyautogui.press('enter')  # OK Button
+            with self.timer.span("wait:after_confirm"):
+                closed = self.waiter.until(dialog_closed, fallback=0.5)
+            
+            # Dialog noch sichtbar (z.B. Rückfrage zu einem doppelten Namen) → nicht als Erfolg werten
+            if not closed and self.dialog_detector.is_calibrated:
+                raise Exception("Eigenschaften-Dialog nach OK noch geöffnet")
             
             self.logger.log(f"Feld-Eigenschaften konfiguriert: {field_name}", "SUCCESS")
             return True
-            
+        
         except Exception as e:
             self.logger.log(f"Fehler beim Konfigurieren der Eigenschaften: {str(e)}", "ERROR")
             # Versuche Dialog zu schließen
             pyautogui.press('esc')
             return False
             
+    def _open_properties_menu(self, menu_fallback, dialog_fallback):
+        """Öffnet den Properties-Dialog über das Kontextmenü und wartet auf Menü und Dialog"""
+        mouse_x, mouse_y = pyautogui.position()
+        menu_shown = self.waiter.region_changes((mouse_x, mouse_y, 220, 160), stable_polls=1)
+        pyautogui.rightClick()
+        self.waiter.until(menu_shown, fallback=menu_fallback)
+        
+        dialog_opened = self._dialog_opened()
+        pyautogui.press('p')  # Properties
+        self.waiter.until(dialog_opened, fallback=dialog_fallback)
+        return self._is_properties_dialog_open()
+        
+    def _dialog_opened(self):
+        """Bedingung für das Öffnen des Dialogs: kalibrierte Vorlage, sonst Wechsel des aktiven Fensters"""
+        return self.dialog_detector.opened_condition() or self.waiter.window_changes()
+        
+    def _dialog_closed(self):
+        """Bedingung für das Schließen des Dialogs: kalibrierte Vorlage, sonst Wechsel des aktiven Fensters"""
+        return self.dialog_detector.closed_condition() or self.waiter.window_changes()
+        
     def _is_properties_dialog_open(self):
-        """Prüft ob der Properties-Dialog geöffnet ist"""
-        # Einfache Implementierung - könnte mit OCR verbessert werden
-        return True  # Für jetzt annehmen, dass es funktioniert
+        """Prüft ob der Properties-Dialog geöffnet ist (Vorlagenvergleich eines kleinen Bildausschnitts)"""
+        if not self.dialog_detector.is_calibrated:
+            return True  # Ohne Kalibrierung annehmen, dass es funktioniert
+        
+        try:
+            return self.dialog_detector.is_open()
+        except Exception as e:
+            self.logger.log(f"Dialog-Erkennung nicht möglich: {str(e)}", "DEBUG")
+            return True
         
     def find_and_rename_field(self, original_name, new_name):
         """Sucht und benennt ein spezifisches Feld um"""
         self.logger.log(f"Suche Feld: '{original_name}' → '{new_name}'", "INFO")
         
+        with self.timer.span("rename_field"):
+            return self._find_and_rename_field(original_name, new_name)
+        
+    def _find_and_rename_field(self, original_name, new_name):
         # Tab-Navigation durch alle Felder
         for i in range(100):  # Maximal 100 Felder durchsuchen
             try:
-                # Rechtsklick für Kontextmenü
-                pyautogui.rightClick()
-                time.sleep(0.3)
+                # Rechtsklick für Kontextmenü, dann Properties öffnen (einmal wiederholen)
+                with self.timer.span("open_properties_menu"):
+                    opened = self._open_properties_menu(menu_fallback=0.3, dialog_fallback=0.8)
+                    if not opened:
+                        pyautogui.press('esc')
+                        opened = self._open_properties_menu(menu_fallback=0.3, dialog_fallback=0.8)
                 
-                # Properties öffnen
-                pyautogui.press('p')
-                time.sleep(0.8)
+                if not opened:
+                    # Kein Dialog → nichts kopieren, Menü schließen und zum nächsten Feld
+                    pyautogui.press('esc')
+                    pyautogui.press('tab')
+                    self.waiter.sleep(0.2)
+                    continue
                 
                 # Prüfe Feldname
-                pyautogui.hotkey('ctrl', 'a')
-                pyautogui.hotkey('ctrl', 'c')
-                time.sleep(0.2)
+                with self.timer.span("copy_name"):
+                    copied = self.waiter.clipboard_changes()
+                    pyautogui.hotkey('ctrl', 'a')
+                    pyautogui.hotkey('ctrl', 'c')
+                    self.waiter.until(copied, fallback=0.2)
                 
                 try:
                     current_name = pyperclip.paste().strip()
                 except:
                     current_name = ""
-                    
+                
                 if current_name == original_name:
                     # Gefunden! Umbenennen
                     self.logger.log(f"Feld gefunden: '{original_name}'", "SUCCESS")
                     
                     # Neuen Namen eingeben
-                    pyautogui.hotkey('ctrl', 'a')
-                    pyautogui.typewrite(new_name, interval=0.02)
-                    time.sleep(0.3)
+                    with self.timer.span("type_name"):
+                        pyautogui.hotkey('ctrl', 'a')
+                        pyautogui.typewrite(new_name, interval=0.02)
+                        self.waiter.sleep(0.3)
                     
                     # Speichern
-                    pyautogui.press('enter')
-                    time.sleep(0.5)
+                    dialog_closed = self._dialog_closed()
+                    with self.timer.span("confirm_properties"):
+                        pyautogui.press('enter')
+                    with self.timer.span("wait:after_confirm"):
+                        self.waiter.until(dialog_closed, fallback=0.5)
                     
                     return True
                 else:
                     # Nicht gefunden, Dialog schließen und weiter
-                    pyautogui.press('esc')
-                    time.sleep(0.3)
-                    
-                # Nächstes Feld
-                pyautogui.press('tab')
-                time.sleep(0.2)
+                    with self.timer.span("close_properties"):
+                        dialog_closed = self._dialog_closed()
+                        pyautogui.press('esc')
+                        self.waiter.until(dialog_closed, fallback=0.3)
                 
+                # Nächstes Feld
+                with self.timer.span("next_field"):
+                    pyautogui.press('tab')
+                    self.waiter.sleep(0.2)
+            
             except Exception as e:
                 # Bei Fehler Dialog schließen und weiter
                 pyautogui.press('esc')
-                time.sleep(0.2)
+                self.waiter.sleep(0.2)
                 continue
-                
+        
         self.logger.log(f"Feld '{original_name}' nicht gefunden", "WARNING")
         return False
         
@@ -185,7 +269,7 @@ class FieldOperations:
             x, y = pyautogui.position()
             self.logger.log(f"Position erfasst: ({x}, {y})", "SUCCESS")
             return (x, y)
-            
+        
         except Exception as e:
             self.logger.log(f"Fehler beim Erfassen der Position: {str(e)}", "ERROR")
             return None
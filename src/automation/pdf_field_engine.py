@@ -0,0 +1,488 @@
+import os
+import re
+import shutil
+import fitz
+import pandas as pd
+from ..utils.logger import Logger
+from ..utils.spatial_index import SpatialIndex
+
+# Mapping von Feldtypen (wie in FieldOperations.select_field_tool) zu PyMuPDF-Widgettypen
+WIDGET_TYPES = {
+    'Textfeld': fitz.PDF_WIDGET_TYPE_TEXT,
+    'Text': fitz.PDF_WIDGET_TYPE_TEXT,
+    'Checkbox': fitz.PDF_WIDGET_TYPE_CHECKBOX,
+    'Kontrollkästchen': fitz.PDF_WIDGET_TYPE_CHECKBOX,
+    'Optionsfeld': fitz.PDF_WIDGET_TYPE_RADIOBUTTON,
+    'Radio Button': fitz.PDF_WIDGET_TYPE_RADIOBUTTON,
+    'Dropdown': fitz.PDF_WIDGET_TYPE_COMBOBOX,
+    'Listenfeld': fitz.PDF_WIDGET_TYPE_LISTBOX,
+    'Signatur': fitz.PDF_WIDGET_TYPE_SIGNATURE,
+    'Unterschrift': fitz.PDF_WIDGET_TYPE_SIGNATURE
+}
+
+# Standardgrößen (Breite, Höhe) in PDF-Punkten, falls die Definition keine enthält
+DEFAULT_SIZES = {
+    fitz.PDF_WIDGET_TYPE_TEXT: (200, 25),
+    fitz.PDF_WIDGET_TYPE_CHECKBOX: (15, 15),
+    fitz.PDF_WIDGET_TYPE_RADIOBUTTON: (15, 15),
+    fitz.PDF_WIDGET_TYPE_COMBOBOX: (200, 25),
+    fitz.PDF_WIDGET_TYPE_LISTBOX: (200, 60),
+    fitz.PDF_WIDGET_TYPE_SIGNATURE: (200, 50)
+}
+
+# Umgang mit neuen Feldern, die vorhandene Widgets überlappen
+OVERLAP_MODES = ('shift', 'reject', 'allow')
+
+# Indirekte Referenzen ("12 0 R") in PDF-Arrays
+XREF_PATTERN = re.compile(r"(\d+) \d+ R")
+
+# Feld-Flags einer Optionsfeld-Gruppe (genau ein Knopf aktiv, nicht abwählbar)
+RADIO_FLAGS = fitz.PDF_BTN_FIELD_IS_RADIO | fitz.PDF_BTN_FIELD_IS_NO_TOGGLE_TO_OFF
+
+class PdfFieldEngine:
+    """Headless Feld-Engine auf Basis von PyMuPDF - arbeitet direkt im Dokument ohne Acrobat"""
+
+    def __init__(self, overlap_mode='shift'):
+        if overlap_mode not in OVERLAP_MODES:
+            raise Exception(f"Unbekannter Überlappungsmodus: {overlap_mode}")
+        
+        self.logger = Logger()
+        self.doc = None
+        self.pdf_path = None
+        self.field_index = {}
+        # 'shift' = freie Stelle suchen, 'reject' = Feld überspringen, 'allow' = wie bisher stapeln
+        self.overlap_mode = overlap_mode
+        # Seite (0-basiert) → SpatialIndex der Widget-Rechtecke, erst bei Bedarf aufgebaut
+        self.page_indexes = {}
+
+    def open_pdf(self, pdf_path):
+        """Öffnet das PDF und baut den Feld-Index auf"""
+        self.logger.log(f"Öffne PDF direkt: {os.path.basename(pdf_path)}", "INFO")
+        
+        try:
+            self.close()
+            self.doc = fitz.open(pdf_path)
+            self.pdf_path = pdf_path
+            
+            if not self.doc.is_pdf:
+                raise Exception("Datei ist kein PDF-Dokument")
+            
+            self.build_field_index()
+            return True
+        
+        except Exception as e:
+            self.logger.log(f"Fehler beim Öffnen der PDF: {str(e)}", "ERROR")
+            self.close()
+            return False
+
+    def close(self):
+        """Schließt das geöffnete Dokument"""
+        if self.doc is not None:
+            self.doc.close()
+        self.doc = None
+        self.field_index = {}
+        self.page_indexes = {}
+
+    def build_field_index(self):
+        """Baut einmalig einen Index Feldname → Feld-Objekte (xrefs) auf"""
+        self.field_index = {}
+        
+        # Schneller Weg: Feldbaum des AcroForms direkt über xrefs lesen (ohne Widget-Objekte)
+        root_fields = self._xref_array(self.doc.pdf_catalog(), "AcroForm/Fields")
+        if root_fields:
+            for xref in root_fields:
+                self._index_field_tree(xref, "", set())
+        else:
+            self._index_page_widgets()
+        
+        self.logger.log(f"Feld-Index aufgebaut: {len(self.field_index)} Felder", "DEBUG")
+        return self.field_index
+
+    def _xref_array(self, xref, key):
+        """Liest ein Array indirekter Referenzen (z.B. /Fields, /Kids) als Liste von xrefs"""
+        kind, value = self.doc.xref_get_key(xref, key)
+        if kind == "xref":
+            # Array liegt selbst als indirektes Objekt vor
+            value = self.doc.xref_object(int(value.split()[0]), compressed=True)
+        elif kind != "array":
+            return []
+        return [int(number) for number in XREF_PATTERN.findall(value)]
+
+    def _index_field_tree(self, xref, parent_name, visited):
+        """Nimmt ein Feld und seine Kinder rekursiv in den Index auf (voll qualifizierte Namen)"""
+        if xref in visited:
+            return
+        visited.add(xref)
+        
+        kind, partial_name = self.doc.xref_get_key(xref, "T")
+        if kind == "null":
+            return  # Reines Widget ohne eigenen Namen
+        
+        name = f"{parent_name}.{partial_name}" if parent_name else partial_name
+        
+        # Nur Felder mit eigenen Widgets (bzw. ohne benannte Kinder) sind umbenennbar
+        named_kids = False
+        for kid in self._xref_array(xref, "Kids"):
+            if self.doc.xref_get_key(kid, "T")[0] != "null":
+                named_kids = True
+                self._index_field_tree(kid, name, visited)
+        
+        if not named_kids:
+            xrefs = self.field_index.setdefault(name, [])
+            if xref not in xrefs:
+                xrefs.append(xref)
+
+    def _index_page_widgets(self):
+        """Fallback für PDFs ohne /Fields-Array: Widgets seitenweise einlesen"""
+        for page in self.doc:
+            for widget in page.widgets():
+                name_xref = self._find_name_xref(widget.xref)
+                if name_xref is None:
+                    continue
+                
+                # Optionsfelder teilen sich ein Eltern-Objekt → nur einmal aufnehmen
+                xrefs = self.field_index.setdefault(widget.field_name, [])
+                if name_xref not in xrefs:
+                    xrefs.append(name_xref)
+
+    def _find_name_xref(self, xref):
+        """Sucht das Objekt mit dem Feldnamen (/T) - Widget selbst oder ein Eltern-Feld"""
+        visited = set()
+        
+        while xref and xref not in visited:
+            visited.add(xref)
+            
+            if self.doc.xref_get_key(xref, "T")[0] != "null":
+                return xref
+            
+            kind, value = self.doc.xref_get_key(xref, "Parent")
+            if kind != "xref":
+                return None
+            xref = int(value.split()[0])
+        
+        return None
+
+    def _inherited_key(self, xref, key):
+        """Liest einen vererbbaren Feld-Schlüssel (/FT, /Ff) vom Widget oder seinen Eltern-Feldern"""
+        visited = set()
+        
+        while xref and xref not in visited:
+            visited.add(xref)
+            
+            kind, value = self.doc.xref_get_key(xref, key)
+            if kind != "null":
+                return value
+            
+            kind, value = self.doc.xref_get_key(xref, "Parent")
+            if kind != "xref":
+                return None
+            xref = int(value.split()[0])
+        
+        return None
+
+    def _field_type_name(self, xref):
+        """Feldtyp eines Widgets in den Bezeichnungen von WIDGET_TYPES"""
+        field_type = self._inherited_key(xref, "FT")
+        flags = int(self._inherited_key(xref, "Ff") or 0)
+        
+        if field_type == "/Btn":
+            if flags & fitz.PDF_BTN_FIELD_IS_PUSHBUTTON:
+                return "Schaltfläche"
+            return "Optionsfeld" if flags & fitz.PDF_BTN_FIELD_IS_RADIO else "Checkbox"
+        if field_type == "/Ch":
+            return "Dropdown" if flags & fitz.PDF_CH_FIELD_IS_COMBO else "Listenfeld"
+        if field_type == "/Sig":
+            return "Signatur"
+        return "Textfeld"
+
+    def page_sizes(self):
+        """Seitengrößen (Breite, Höhe) in Punkten je Seite (0-basiert)"""
+        return {page.number: (page.rect.width, page.rect.height) for page in self.doc}
+
+    def _widget_rect(self, page, xref):
+        """Rechteck eines Widgets in Seitenkoordinaten (wie in der Anzeige) oder None"""
+        kind, value = self.doc.xref_get_key(xref, "Rect")
+        if kind != "array":
+            return None
+        
+        # PDF-Koordinaten (Ursprung unten links) → Seitenkoordinaten
+        rect = fitz.Rect([float(number) for number in value.strip("[]").split()])
+        return (rect * page.transformation_matrix).normalize()
+
+    def page_index(self, page):
+        """Räumlicher Index der vorhandenen Widgets einer Seite (einmal je Seite aufgebaut)"""
+        index = self.page_indexes.get(page.number)
+        if index is None:
+            items = []
+            for xref, annot_type, _ in page.annot_xrefs():
+                if annot_type != fitz.PDF_ANNOT_WIDGET:
+                    continue
+                rect = self._widget_rect(page, xref)
+                if rect is not None:
+                    items.append((*rect, xref))
+            
+            index = self.page_indexes[page.number] = SpatialIndex(items)
+        return index
+
+    def widget_layout(self):
+        """Liefert alle Widgets mit Seite (0-basiert), Rechteck in Seitenkoordinaten, Name und Typ"""
+        names = {xref: name for name, xrefs in self.field_index.items() for xref in xrefs}
+        layout = []
+        
+        for page in self.doc:
+            for xref, annot_type, _ in page.annot_xrefs():
+                if annot_type != fitz.PDF_ANNOT_WIDGET:
+                    continue
+                
+                rect = self._widget_rect(page, xref)
+                if rect is None:
+                    continue
+                
+                name_xref = xref if xref in names else self._find_name_xref(xref)
+                
+                layout.append({
+                    'page': page.number,
+                    'rect': tuple(rect),
+                    'name': names.get(name_xref, ""),
+                    'type': self._field_type_name(xref)
+                })
+        
+        return layout
+
+    def list_fields(self):
+        """Gibt alle Feldnamen des Dokuments zurück"""
+        return list(self.field_index.keys())
+
+    def _parent_name(self, xref):
+        """Voll qualifizierter Name der Eltern-Felder ('' für Felder auf oberster Ebene)"""
+        names = []
+        visited = {xref}
+        
+        kind, value = self.doc.xref_get_key(xref, "Parent")
+        while kind == "xref":
+            parent = int(value.split()[0])
+            if parent in visited:
+                break
+            visited.add(parent)
+            
+            name_kind, partial_name = self.doc.xref_get_key(parent, "T")
+            if name_kind != "null":
+                names.append(partial_name)
+            kind, value = self.doc.xref_get_key(parent, "Parent")
+        
+        return ".".join(reversed(names))
+
+    def rename_field(self, original_name, new_name):
+        """Benennt ein Feld über den Index um (ohne GUI-Suche) - new_name ist der neue Teilname
+        oder der voll qualifizierte Name unter denselben Eltern-Feldern"""
+        xrefs = self.field_index.get(original_name)
+        if not xrefs:
+            self.logger.log(f"Feld '{original_name}' nicht gefunden", "WARNING")
+            return False
+        
+        # Im Dokument steht nur der letzte Namensteil (/T), die Eltern-Felder liefern den Rest
+        parent_name = self._parent_name(xrefs[0])
+        prefix, _, partial_name = new_name.rpartition(".")
+        if prefix and prefix != parent_name:
+            raise Exception(
+                f"'{new_name}' liegt nicht unter '{parent_name or '(oberste Ebene)'}' - Verschieben wird nicht unterstützt"
+            )
+        
+        qualified_name = f"{parent_name}.{partial_name}" if parent_name else partial_name
+        if qualified_name == original_name:
+            return True
+        if qualified_name in self.field_index:
+            raise Exception(f"Feld '{qualified_name}' existiert bereits")
+        
+        for xref in xrefs:
+            self.doc.xref_set_key(xref, "T", fitz.get_pdf_str(partial_name))
+        
+        # Index aktuell halten, damit Ketten (a → b, b → c) wie in der GUI funktionieren
+        del self.field_index[original_name]
+        self.field_index[qualified_name] = xrefs
+        
+        self.logger.log(f"Feld umbenannt: '{original_name}' → '{qualified_name}'", "DEBUG")
+        return True
+
+    def field_geometry(self, row, field_type):
+        """Liest Seite (1-basiert) und Rechteck (x, y, width, height in Punkten) aus einer Definitionszeile"""
+        def value(column, default=None):
+            cell = row.get(column, default)
+            return default if cell is None or pd.isna(cell) else cell
+        
+        x = value('x')
+        y = value('y')
+        if x is None or y is None:
+            raise Exception("Spalten 'x' und 'y' für die Position fehlen")
+        
+        default_width, default_height = DEFAULT_SIZES[WIDGET_TYPES.get(field_type, fitz.PDF_WIDGET_TYPE_TEXT)]
+        width = float(value('width', default_width))
+        height = float(value('height', default_height))
+        page_number = int(value('page', 1))
+        
+        return page_number, fitz.Rect(float(x), float(y), float(x) + width, float(y) + height)
+
+    def place_field(self, page, rect, field_name):
+        """Prüft das Rechteck gegen vorhandene Widgets - liefert das (ggf. verschobene) Rechteck,
+        bricht bei 'reject' oder ohne freien Platz ab"""
+        if self.overlap_mode == 'allow':
+            return rect
+        
+        index = self.page_index(page)
+        blockers = index.query_rect(*rect)
+        if not blockers:
+            return rect
+        
+        if self.overlap_mode == 'reject':
+            raise Exception(f"Feld '{field_name}' überlappt {len(blockers)} vorhandene Felder")
+        
+        spot = index.find_free_spot(*rect, bounds=tuple(page.rect))
+        if spot is None:
+            raise Exception(f"Kein freier Platz für Feld '{field_name}' auf Seite {page.number + 1}")
+        
+        self.logger.log(f"Feld {field_name} wegen Überlappung verschoben auf ({spot[0]:.0f}, {spot[1]:.0f})", "DEBUG")
+        return fitz.Rect(spot)
+
+    def create_field(self, page_number, rect, field_type, field_name, display_name="", choices=None):
+        """Erstellt ein Formularfeld direkt im Dokument (ohne Acrobat) - ein vorhandener Name ist nur für
+        weitere Knöpfe einer Optionsfeld-Gruppe erlaubt, sonst wird wie bei rename_field abgebrochen"""
+        if not 1 <= page_number <= len(self.doc):
+            self.logger.log(f"Seite {page_number} existiert nicht ({field_name})", "ERROR")
+            return False
+        
+        widget_type = WIDGET_TYPES.get(field_type, fitz.PDF_WIDGET_TYPE_TEXT)
+        is_radio = widget_type == fitz.PDF_WIDGET_TYPE_RADIOBUTTON
+        
+        existing = self.field_index.get(field_name)
+        if existing and not (is_radio and self._is_radio_group(existing[0])):
+            raise Exception(f"Feld '{field_name}' existiert bereits")
+        
+        # Überlappung wird wie ein Namenskonflikt an den Aufrufer gemeldet (Grund landet im Journal)
+        page = self.doc[page_number - 1]
+        rect = self.place_field(page, rect, field_name)
+        
+        try:
+            widget = fitz.Widget()
+            # Optionsfelder werden als Checkbox angelegt und danach in ihre Gruppe eingehängt,
+            # da PyMuPDF neue Optionsfelder ohne Eltern-Feld nicht validieren kann
+            widget.field_type = fitz.PDF_WIDGET_TYPE_CHECKBOX if is_radio else widget_type
+            widget.field_name = field_name
+            
+            if display_name and display_name.strip():
+                widget.field_label = display_name
+            
+            if widget_type in (fitz.PDF_WIDGET_TYPE_COMBOBOX, fitz.PDF_WIDGET_TYPE_LISTBOX):
+                widget.choice_values = choices or []
+            
+            widget.rect = rect
+            
+            annot = page.add_widget(widget)
+            if self.overlap_mode != 'allow':
+                self.page_index(page).insert(*rect, annot.xref)
+            
+            if is_radio:
+                self._add_to_radio_group(annot.xref, field_name)
+            else:
+                self.field_index.setdefault(field_name, []).append(annot.xref)
+            
+            self.logger.log(f"Feld erstellt: {field_name} ({field_type}) auf Seite {page_number}", "DEBUG")
+            return True
+        
+        except Exception as e:
+            self.logger.log(f"Fehler beim Erstellen von Feld {field_name}: {str(e)}", "ERROR")
+            return False
+
+    def _is_radio_group(self, xref):
+        """True für ein Eltern-Feld mit Optionsfeld-Flags und Widgets als Kinder"""
+        flags = int(self._inherited_key(xref, "Ff") or 0)
+        return (
+            self._inherited_key(xref, "FT") == "/Btn"
+            and bool(flags & fitz.PDF_BTN_FIELD_IS_RADIO)
+            and bool(self._xref_array(xref, "Kids"))
+        )
+
+    def _add_to_radio_group(self, xref, field_name):
+        """Hängt ein neues Widget unter das gemeinsame Eltern-Feld seines Namens - nur so schließen sich
+        die Knöpfe einer Gruppe gegenseitig aus (die Gruppe wird beim ersten Knopf angelegt)"""
+        catalog = self.doc.pdf_catalog()
+        fields = [number for number in self._xref_array(catalog, "AcroForm/Fields") if number != xref]
+        
+        existing = self.field_index.get(field_name)
+        if existing:
+            parent = existing[0]
+            kids = self._xref_array(parent, "Kids")
+        else:
+            parent = self.doc.get_new_xref()
+            self.doc.update_object(
+                parent, f"<< /FT /Btn /Ff {RADIO_FLAGS} /T {fitz.get_pdf_str(field_name)} /V /Off /Kids [] >>"
+            )
+            kind, label = self.doc.xref_get_key(xref, "TU")
+            if kind != "null":
+                self.doc.xref_set_key(parent, "TU", fitz.get_pdf_str(label))
+            
+            fields.append(parent)
+            kids = []
+            self.field_index[field_name] = [parent]
+        
+        # Eigener Ein-Zustand je Knopf - bei gleichem Namen würden alle Knöpfe gemeinsam umschalten
+        state = f"/Option{len(kids) + 1}"
+        for key in ("AP/N", "AP/D"):
+            kind, appearances = self.doc.xref_get_key(xref, key)
+            if kind == "dict":
+                self.doc.xref_set_key(xref, key, appearances.replace("/Yes", state))
+        
+        # Name, Typ und Wert erbt das Widget vom Eltern-Feld
+        for key in ("T", "TU", "FT", "Ff", "V"):
+            self.doc.xref_set_key(xref, key, "null")
+        self.doc.xref_set_key(xref, "Parent", f"{parent} 0 R")
+        
+        kids.append(xref)
+        self.doc.xref_set_key(parent, "Kids", "[" + " ".join(f"{number} 0 R" for number in kids) + "]")
+        self.doc.xref_set_key(catalog, "AcroForm/Fields", "[" + " ".join(f"{number} 0 R" for number in fields) + "]")
+
+    def create_field_from_row(self, row):
+        """Erstellt ein Feld aus einer Definitionszeile (type, new_name, display_name, page, x, y, ...)"""
+        field_name = str(row['new_name'])
+        field_type = str(row.get('type', 'Textfeld'))
+        display_name = row.get('display_name', '')
+        display_name = '' if pd.isna(display_name) else str(display_name)
+        
+        choices = row.get('choices', None)
+        choices = None if choices is None or pd.isna(choices) else str(choices).split('|')
+        
+        try:
+            page_number, rect = self.field_geometry(row, field_type)
+        except Exception as e:
+            self.logger.log(f"Ungültige Position für {field_name}: {str(e)}", "ERROR")
+            return False
+        
+        return self.create_field(page_number, rect, field_type, field_name, display_name, choices)
+
+    def save(self, backup=False):
+        """Speichert alle Änderungen mit einem einzigen (inkrementellen) Speichervorgang"""
+        self.logger.log("Speichere PDF...", "INFO")
+        
+        try:
+            if backup:
+                backup_path = self.pdf_path + ".bak"
+                shutil.copy2(self.pdf_path, backup_path)
+                self.logger.log(f"Backup erstellt: {os.path.basename(backup_path)}", "INFO")
+            
+            if self.doc.can_save_incrementally():
+                self.doc.save(self.pdf_path, incremental=True, encryption=fitz.PDF_ENCRYPT_KEEP)
+            else:
+                # Fallback: vollständig in temporäre Datei schreiben und ersetzen
+                temp_path = self.pdf_path + ".tmp"
+                self.doc.save(temp_path, garbage=1, deflate=True)
+                self.doc.close()
+                os.replace(temp_path, self.pdf_path)
+                self.doc = fitz.open(self.pdf_path)
+                self.page_indexes = {}
+                self.build_field_index()
+            
+            self.logger.log("PDF gespeichert", "SUCCESS")
+            return True
+        
+        except Exception as e:
+            self.logger.log(f"Fehler beim Speichern: {str(e)}", "ERROR")
+            return False
@@ -0,0 +1,27 @@
+import threading
+import mss
+from PIL import Image
+
+# Ein mss-Objekt je Thread (ältere mss-Versionen dürfen nur im erzeugenden Thread greifen)
+_local = threading.local()
+
+def _screen():
+    screen = getattr(_local, "screen", None)
+    if screen is None:
+        screen = _local.screen = mss.mss()
+    return screen
+
+def grab_region(region):
+    """Liest nur den Ausschnitt (left, top, width, height) vom Bildschirm - anders als
+    pyautogui.screenshot(region=...), das unter Windows den ganzen virtuellen Bildschirm aufnimmt und zuschneidet"""
+    left, top, width, height = (int(value) for value in region)
+    return _screen().grab({"left": left, "top": top, "width": width, "height": height})
+
+def grab_bytes(region):
+    """Rohe Pixel des Ausschnitts (BGRA) - zum Vergleichen zweier Aufnahmen"""
+    return grab_region(region).bgra
+
+def grab_image(region):
+    """Ausschnitt als PIL-Bild (RGB)"""
+    shot = grab_region(region)
+    return Image.frombytes("RGB", shot.size, shot.rgb)
@@ -0,0 +1,127 @@
+import pyautogui
+import pyperclip
+import time
+from .screen_capture import grab_bytes
+
+# Pause nach jeder pyautogui-Aktion, wenn auf Bedingungen gewartet wird (× Geschwindigkeit)
+ACTION_PAUSE = 0.1
+
+# Abfrageintervall der Bedingungen in Sekunden
+POLL_INTERVAL = 0.05
+
+# Zeitlimit einer Bedingung als Vielfaches der festen Wartezeit (langsame Rechner brauchen Reserve)
+TIMEOUT_FACTOR = 4
+
+def _active_window_title():
+    get_active_window = getattr(pyautogui, "getActiveWindow", None)
+    if get_active_window is None:
+        raise Exception("Aktives Fenster nicht abfragbar")
+
+    window = get_active_window()
+    return window.title if window is not None else ""
+
+class Waiter:
+    """Wartet auf eine beobachtbare Bedingung (Fenstertitel, Bildschirmausschnitt, Zwischenablage) statt einer
+    festen Zeit - die feste Wartezeit bleibt als Rückfallebene, wenn keine Bedingung verfügbar ist"""
+
+    def __init__(self, enabled=True, poll_interval=POLL_INTERVAL):
+        self.enabled = enabled
+        self.poll_interval = poll_interval
+
+    def configure(self, speed):
+        """Übernimmt die Geschwindigkeits-Einstellung als globale pyautogui-Pause (beim Warten auf Bedingungen
+        nur noch ein kurzer Abstand je Aktion) - feste Wartezeiten bleiben wie bisher absolut"""
+        pyautogui.PAUSE = ACTION_PAUSE * speed if self.enabled else speed
+
+    def sleep(self, seconds):
+        """Feste Wartezeit in Sekunden (unabhängig von der Geschwindigkeit)"""
+        time.sleep(seconds)
+
+    def until(self, condition, fallback, timeout=None):
+        """Wartet bis condition() wahr ist - höchstens timeout Sekunden (Standard: TIMEOUT_FACTOR × fallback).
+        Ohne Bedingung oder wenn sie nicht prüfbar ist, wird fallback Sekunden gewartet.
+        Gibt False nur zurück, wenn die Bedingung bis zum Zeitlimit nicht eingetreten ist"""
+        if not self.enabled or condition is None:
+            self.sleep(fallback)
+            return True
+        
+        start = time.monotonic()
+        deadline = start + (timeout if timeout is not None else fallback * TIMEOUT_FACTOR)
+        
+        while True:
+            try:
+                if condition():
+                    return True
+            except Exception:
+                # Bedingung nicht (mehr) prüfbar → restliche feste Wartezeit abwarten
+                time.sleep(max(0.0, fallback - (time.monotonic() - start)))
+                return True
+            
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(self.poll_interval)
+
+    # ===== BEDINGUNGEN =====
+    # Jede Fabrik hält den Ausgangszustand fest (also VOR der auslösenden Aktion aufrufen)
+    # und liefert None, wenn die Bedingung auf diesem System nicht verfügbar ist
+
+    def window_title_contains(self, *titles):
+        """Aktives Fenster trägt einen der Titel (z.B. nach dem Fokussieren)"""
+        if not self.enabled or getattr(pyautogui, "getActiveWindow", None) is None:
+            return None
+        
+        return lambda: any(title in _active_window_title() for title in titles)
+
+    def window_changes(self):
+        """Aktives Fenster wechselt (Dialog öffnet oder schließt sich)"""
+        if not self.enabled:
+            return None
+        
+        try:
+            before = _active_window_title()
+        except Exception:
+            return None
+        
+        return lambda: _active_window_title() != before
+
+    def region_changes(self, region, stable_polls=2):
+        """Bildschirmausschnitt ändert sich und bleibt danach stable_polls Abfragen lang unverändert
+        (Zeichnen bzw. Umschalten ist abgeschlossen)"""
+        if not self.enabled:
+            return None
+        
+        try:
+            baseline = grab_bytes(region)
+        except Exception:
+            return None
+        
+        state = {"last": baseline, "stable": 0}
+        
+        def changed_and_settled():
+            current = grab_bytes(region)
+            
+            if current == baseline:
+                state["stable"] = 0
+                return False
+            
+            state["stable"] = state["stable"] + 1 if current == state["last"] else 0
+            state["last"] = current
+            return state["stable"] >= stable_polls
+        
+        return changed_and_settled
+
+    def clipboard_changes(self, marker="<glxy-wait>"):
+        """Zwischenablage wird überschrieben (z.B. durch Strg+C) - setzt vorher eine Markierung"""
+        if not self.enabled:
+            return None
+        
+        try:
+            pyperclip.copy(marker)
+        except Exception:
+            return None
+        
+        return lambda: pyperclip.paste() != marker
+
+def region_around(x, y, width, height, margin=10):
+    """Ausschnitt um ein Rechteck mit Rand (für region_changes)"""
+    return (max(0, x - margin), max(0, y - margin), width + 2 * margin, height + 2 * margin)
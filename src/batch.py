@@ -0,0 +1,378 @@
+"""
+Headless Batch-Verarbeitung für viele PDFs (ohne GUI, ohne Acrobat)
+
+Beispiel:
+    python -m src.batch vorlagen/ -d felder.csv --operation rename --output-dir ausgabe/ --workers 0
+"""
+
+import argparse
+import csv
+import glob
+import itertools
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .automation.backends import PyMuPDFBackend
+from .automation.pdf_field_engine import PdfFieldEngine, OVERLAP_MODES, WIDGET_TYPES
+from .utils.definitions import validate_definitions, summarize_issues, iter_definition_records
+from .utils.file_handler import FileHandler
+from .utils.run_journal import RunJournal
+
+# Spalten der Ergebnis-Zusammenfassung
+SUMMARY_COLUMNS = ['file', 'output', 'status', 'successful', 'failed', 'duration', 'error']
+
+# Auftragsdaten je Worker-Prozess (einmal per Initializer übertragen statt pro Datei)
+_worker_job = {}
+
+
+def collect_pdfs(inputs, recursive=False):
+    """Sammelt PDF-Dateien aus Verzeichnissen, Glob-Mustern und Einzeldateien"""
+    pdf_files = []
+
+    for entry in inputs:
+        if os.path.isdir(entry):
+            pattern = os.path.join(entry, '**', '*.pdf') if recursive else os.path.join(entry, '*.pdf')
+            matches = glob.glob(pattern, recursive=recursive)
+        else:
+            matches = glob.glob(entry, recursive=recursive)
+
+        pdf_files.extend(path for path in matches if path.lower().endswith('.pdf'))
+
+    # Reihenfolge stabil halten und Duplikate entfernen
+    return sorted(set(os.path.abspath(path) for path in pdf_files))
+
+
+def output_paths(pdf_files, output_dir):
+    """Zielpfade im Ausgabeverzeichnis - relativ zum gemeinsamen Eingangsverzeichnis, damit gleichnamige
+    PDFs aus verschiedenen Unterordnern (-r) sich nicht gegenseitig überschreiben"""
+    try:
+        root = os.path.commonpath([os.path.dirname(path) for path in pdf_files])
+    except ValueError:
+        # Verschiedene Laufwerke: kein gemeinsames Verzeichnis, nur Dateinamen verwenden
+        root = None
+
+    targets = {}
+    for path in pdf_files:
+        relative = os.path.relpath(path, root) if root else os.path.basename(path)
+        targets[path] = os.path.join(output_dir, relative)
+
+    duplicates = len(targets) - len(set(os.path.normcase(target) for target in targets.values()))
+    if duplicates:
+        raise Exception(f"{duplicates} PDFs hätten denselben Zielpfad im Ausgabeverzeichnis")
+    return targets
+
+
+def existing_fields(pdf_path):
+    """Feldnamen eines PDFs (None, wenn es sich nicht öffnen lässt)"""
+    engine = PdfFieldEngine()
+    try:
+        return engine.list_fields() if engine.open_pdf(pdf_path) else None
+    finally:
+        engine.close()
+
+
+def check_definitions(df, operation, known_fields=None):
+    """Meldet Probleme der Definitionen und lässt die betroffenen Zeilen weg (ohne GUI keine Rückfrage) -
+    mit known_fields werden beim Erstellen auch schon vorhandene Feldnamen gemeldet"""
+    known_types = WIDGET_TYPES.keys() if operation == 'create' else None
+    known_fields = known_fields if operation == 'create' else None
+    issues = validate_definitions(df, operation, known_types=known_types, known_fields=known_fields)
+    if issues.empty:
+        return df
+
+    print(f"⚠️ {len(issues)} Probleme in den Feld-Definitionen - betroffene Zeilen werden übersprungen:")
+    for line in summarize_issues(issues):
+        print(line)
+    # Zeilennummer der Problemliste = Index + 2 (Kopfzeile)
+    return df.drop(index=issues['row'].unique() - 2, errors='ignore')
+
+
+def checked_chunks(chunks, operation, known_fields=None):
+    """Prüft gestreamte Definitionen blockweise wie die komplett geladenen
+    (doppelte Zielnamen werden dabei nur innerhalb eines Blocks erkannt)"""
+    for chunk in chunks:
+        chunk = check_definitions(chunk, operation, known_fields)
+        if len(chunk) > 0:
+            yield chunk
+
+
+def apply_definitions(backend, definitions, operation, journal=None, pdf=None):
+    """Wendet alle Definitionen auf das geöffnete Dokument an - als DataFrame oder als Folge von Blöcken"""
+    successful = 0
+    failed = 0
+    index = 0
+
+    chunks = [definitions] if hasattr(definitions, 'columns') else definitions
+    for df in chunks:
+        if operation == 'create':
+            for row in iter_definition_records(df):
+                start = time.perf_counter()
+                error = ''
+                try:
+                    ok = backend.create_field(row, index)
+                    if not ok:
+                        error = 'Erstellung fehlgeschlagen'
+                except Exception as e:
+                    # z.B. Feldname schon vergeben - nur dieses Feld schlägt fehl, nicht das Dokument
+                    ok = False
+                    error = str(e)
+                if journal:
+                    journal.record(row.new_name, 'ok' if ok else 'failed', time.perf_counter() - start,
+                                   error, field_type=row.get('type', 'Textfeld'), pdf=pdf)
+                if ok:
+                    successful += 1
+                else:
+                    failed += 1
+                index += 1
+        else:
+            for original_name, new_name in zip(df['original_name'], df['new_name']):
+                start = time.perf_counter()
+                error = ''
+                try:
+                    ok = backend.rename_field(str(original_name), str(new_name))
+                    if not ok:
+                        error = 'Feld nicht gefunden'
+                except Exception as e:
+                    # z.B. Zielname schon vergeben - nur dieses Feld schlägt fehl, nicht das Dokument
+                    ok = False
+                    error = str(e)
+                if journal:
+                    journal.record(str(original_name), 'ok' if ok else 'failed', time.perf_counter() - start,
+                                   error, new_name=str(new_name), pdf=pdf)
+                if ok:
+                    successful += 1
+                else:
+                    failed += 1
+
+    return successful, failed
+
+
+def process_document(pdf_path, df, operation, output_path=None, backup=False, overlap='shift', journal=None):
+    """Verarbeitet ein einzelnes PDF (bei output_path auf einer Kopie) und liefert das Ergebnis als Dictionary"""
+    start = time.perf_counter()
+    result = {
+        'file': pdf_path,
+        'output': pdf_path,
+        'status': 'ERROR',
+        'successful': 0,
+        'failed': 0,
+        'duration': 0.0,
+        'error': ''
+    }
+
+    backend = PyMuPDFBackend(PdfFieldEngine(overlap_mode=overlap))
+
+    try:
+        target_path = pdf_path
+        if output_path:
+            target_path = output_path
+            os.makedirs(os.path.dirname(target_path) or '.', exist_ok=True)
+            shutil.copy2(pdf_path, target_path)
+            backup = False  # Original bleibt ohnehin unverändert
+        result['output'] = target_path
+
+        if not backend.open(target_path):
+            raise Exception("PDF konnte nicht geöffnet werden")
+
+        successful, failed = apply_definitions(backend, df, operation, journal, os.path.basename(pdf_path))
+        result['successful'] = successful
+        result['failed'] = failed
+
+        if successful > 0 and not backend.save(backup=backup):
+            raise Exception("PDF konnte nicht gespeichert werden")
+
+        result['status'] = 'OK' if failed == 0 else 'PARTIAL'
+
+    except Exception as e:
+        result['error'] = str(e)
+
+    finally:
+        backend.close()
+        result['duration'] = round(time.perf_counter() - start, 4)
+
+    return result
+
+
+def _init_worker(df, operation, outputs, backup, overlap, journal):
+    """Initialisiert einen Worker-Prozess mit den gemeinsamen Auftragsdaten"""
+    _worker_job.update(df=df, operation=operation, outputs=outputs, backup=backup, overlap=overlap,
+                       journal=journal)
+
+
+def _process_in_worker(pdf_path):
+    """Verarbeitet ein PDF im Worker-Prozess - jeder Worker öffnet sein eigenes fitz-Dokument"""
+    return process_document(
+        pdf_path,
+        _worker_job['df'],
+        _worker_job['operation'],
+        _worker_job['outputs'].get(pdf_path),
+        _worker_job['backup'],
+        _worker_job['overlap'],
+        _worker_job['journal']
+    )
+
+
+def run_batch(pdf_files, df, operation, output_dir=None, backup=False, workers=1, on_result=None, overlap='shift',
+              journal=None):
+    """Verarbeitet alle PDFs - sequentiell oder verteilt auf einen Prozess-Pool"""
+    results = []
+    # Zielpfade vorab festlegen - eindeutig, auch wenn mehrere Worker gleichzeitig schreiben
+    outputs = output_paths(pdf_files, output_dir) if output_dir else {}
+
+    if workers <= 1 or len(pdf_files) <= 1:
+        for pdf_path in pdf_files:
+            result = process_document(pdf_path, df, operation, outputs.get(pdf_path), backup, overlap, journal)
+            results.append(result)
+            if on_result:
+                on_result(result)
+        return results
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(df, operation, outputs, backup, overlap, journal)
+    ) as executor:
+        futures = {executor.submit(_process_in_worker, pdf_path): pdf_path for pdf_path in pdf_files}
+
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                # Absturz des Worker-Prozesses selbst (nicht des Dokuments)
+                result = {column: '' for column in SUMMARY_COLUMNS}
+                result.update(file=futures[future], status='ERROR', successful=0, failed=0,
+                              duration=0.0, error=f"Worker-Fehler: {str(e)}")
+            results.append(result)
+            if on_result:
+                on_result(result)
+
+    # Gleiche Reihenfolge wie bei sequentieller Verarbeitung
+    order = {pdf_path: index for index, pdf_path in enumerate(pdf_files)}
+    results.sort(key=lambda r: order[r['file']])
+    return results
+
+
+def write_summary(results, summary_path):
+    """Schreibt die Ergebnisse pro Datei als CSV"""
+    with open(summary_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_COLUMNS, delimiter=';')
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def print_report(results, duration):
+    """Gibt die Zusammenfassung des Laufs aus"""
+    ok = sum(1 for r in results if r['status'] == 'OK')
+    partial = sum(1 for r in results if r['status'] == 'PARTIAL')
+    errors = sum(1 for r in results if r['status'] == 'ERROR')
+    fields_ok = sum(r['successful'] for r in results)
+    fields_failed = sum(r['failed'] for r in results)
+
+    print(f"🏁 Batch abgeschlossen in {duration:.2f} s ({len(results) / max(duration, 1e-9):.1f} PDFs/s)")
+    print(f"📄 Dateien: {len(results)} | ✅ OK: {ok} | ⚠️ Teilweise: {partial} | ❌ Fehler: {errors}")
+    print(f"✅ Felder erfolgreich: {fields_ok} | ❌ Felder fehlgeschlagen: {fields_failed}")
+
+
+def build_parser():
+    """Erstellt den Argument-Parser"""
+    parser = argparse.ArgumentParser(
+        prog='python -m src.batch',
+        description='Erstellt oder benennt Formularfelder in vielen PDFs ohne GUI (PyMuPDF).'
+    )
+    parser.add_argument('inputs', nargs='+', help='PDF-Dateien, Verzeichnisse oder Glob-Muster')
+    parser.add_argument('-d', '--definitions', required=True, help='Feld-Definitionen (.csv, .txt, .json)')
+    parser.add_argument('--operation', choices=['create', 'rename'], default='rename',
+                        help='Felder erstellen oder umbenennen (Standard: rename)')
+    parser.add_argument('--output-dir', help='Zielverzeichnis; ohne Angabe werden die PDFs direkt geändert')
+    parser.add_argument('--summary', help='Pfad der CSV-Zusammenfassung (Standard: batch_summary.csv im Zielverzeichnis)')
+    parser.add_argument('--backup', action='store_true', help='Bei direkter Änderung .bak-Kopien anlegen')
+    parser.add_argument('--overlap', choices=list(OVERLAP_MODES), default='shift',
+                        help='Neue Felder, die vorhandene überlappen: verschieben, überspringen oder zulassen (Standard: shift)')
+    parser.add_argument('--chunk-size', type=int, default=50000,
+                        help='Zeilen je Block beim Streamen der Definitionen für ein einzelnes PDF (0 = komplett laden)')
+    parser.add_argument('-r', '--recursive', action='store_true', help='Verzeichnisse rekursiv durchsuchen')
+    parser.add_argument('-w', '--workers', type=int, default=1,
+                        help='Anzahl paralleler Worker-Prozesse (0 = alle CPU-Kerne, Standard: 1)')
+    return parser
+
+
+def main(argv=None):
+    """Einstiegspunkt der Batch-Verarbeitung"""
+    args = build_parser().parse_args(argv)
+
+    pdf_files = collect_pdfs(args.inputs, args.recursive)
+    if not pdf_files:
+        print("❌ Keine PDF-Dateien gefunden")
+        return 2
+
+    file_handler = FileHandler()
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+
+    # Ein Dokument: vorhandene Feldnamen vorab bekannt (bei mehreren meldet die Engine sie je Dokument)
+    known_fields = existing_fields(pdf_files[0]) if len(pdf_files) == 1 else None
+
+    if len(pdf_files) == 1 and args.chunk_size > 0:
+        # Ein Dokument: Definitionen blockweise anwenden, während die Datei noch gelesen wird
+        chunks = file_handler.iter_field_definitions(args.definitions, args.chunk_size)
+        try:
+            # Ersten Block vorab lesen - fehlende oder unlesbare Dateien scheitern vor dem ersten Dokument
+            first = next(chunks, None)
+        except Exception:
+            print(f"❌ Feld-Definitionen konnten nicht geladen werden: {args.definitions}")
+            return 2
+
+        chunks = itertools.chain([first] if first is not None else [], chunks)
+        df = checked_chunks(chunks, args.operation, known_fields)
+        definitions_info = "gestreamte"
+    else:
+        df = file_handler.load_field_definitions(args.definitions)
+        if df is None:
+            print(f"❌ Feld-Definitionen konnten nicht geladen werden: {args.definitions}")
+            return 2
+
+        # Probleme vor dem Lauf melden statt mitten in der Verarbeitung
+        df = check_definitions(df, args.operation, known_fields)
+        definitions_info = len(df)
+
+    if args.output_dir:
+        try:
+            output_paths(pdf_files, args.output_dir)
+        except Exception as e:
+            print(f"❌ {str(e)}")
+            return 2
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    print(f"🚀 {len(pdf_files)} PDFs, {definitions_info} Definitionen, Operation: {args.operation}, Worker: {workers}")
+
+    done = []
+
+    def report(result):
+        done.append(result)
+        icon = {'OK': '✅', 'PARTIAL': '⚠️'}.get(result['status'], '❌')
+        print(f"[{len(done)}/{len(pdf_files)}] {icon} {os.path.basename(result['file'])} "
+              f"({result['successful']} ok, {result['failed']} fehlgeschlagen) {result['error']}".rstrip())
+
+    # Ein Journal für den ganzen Lauf - Worker-Prozesse schreiben mit derselben run_id
+    journal = RunJournal(args.operation, PyMuPDFBackend.name)
+    journal.start(len(pdf_files), workers=workers, definitions=args.definitions)
+
+    start = time.perf_counter()
+    results = run_batch(pdf_files, df, args.operation, args.output_dir, args.backup, workers, report, args.overlap,
+                        journal)
+    journal.finish(sum(r['successful'] for r in results), sum(r['failed'] for r in results),
+                   files=len(results), errors=sum(1 for r in results if r['status'] == 'ERROR'))
+
+    summary_path = args.summary or os.path.join(args.output_dir or '.', 'batch_summary.csv')
+    write_summary(results, summary_path)
+
+    print_report(results, time.perf_counter() - start)
+    print(f"📋 Zusammenfassung: {summary_path}")
+
+    return 0 if all(r['status'] == 'OK' for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+from src.utils.spatial_index import SpatialIndex
+
+class FieldOverlay:
+    """Feld-Overlay für den PDF-Viewer: Widget-Rechtecke je Seite mit räumlichem Index für Hover/Klick"""
+
+    def __init__(self, layout, page_sizes):
+        # layout: Einträge aus PdfFieldEngine.widget_layout(), page_sizes: Seite → (Breite, Höhe) in Punkten
+        self.page_sizes = page_sizes
+        self.fields = {}
+        self.indexes = {}
+
+        for field in layout:
+            self.fields.setdefault(field['page'], []).append(field)
+
+        # Ein Index pro Seite, einmal pro Dokument aufgebaut
+        for page_number, fields in self.fields.items():
+            self.indexes[page_number] = SpatialIndex(
+                (*field['rect'], field) for field in fields
+            )
+
+    def __len__(self):
+        return sum(len(fields) for fields in self.fields.values())
+
+    def items(self, page_number):
+        """Rechtecke der Seite normiert auf 0..1 mit Beschriftung (für das Zeichnen im Viewer)"""
+        width, height = self.page_sizes.get(page_number, (1, 1))
+        return [
+            (x0 / width, y0 / height, x1 / width, y1 / height, field['name'])
+            for field in self.fields.get(page_number, [])
+            for x0, y0, x1, y1 in [field['rect']]
+        ]
+
+    def hit(self, page_number, u, v):
+        """Feld unter einem normierten Punkt (innerstes zuerst) oder None"""
+        index = self.indexes.get(page_number)
+        if index is None:
+            return None
+
+        width, height = self.page_sizes.get(page_number, (1, 1))
+        hits = index.query_point(u * width, v * height)
+        if not hits:
+            return None
+
+        field = hits[0][4]
+        x0, y0, x1, y1 = field['rect']
+        return (x0 / width, y0 / height, x1 / width, y1 / height, field['name'], field)
+
+    def to_page_point(self, page_number, u, v):
+        """Normierter Punkt → Seitenkoordinaten in Punkten"""
+        width, height = self.page_sizes.get(page_number, (1, 1))
+        return u * width, v * height
@@ -0,0 +1,61 @@
+import collections
+import tkinter as tk
+
+class LogBuffer:
+    """Thread-sichere Warteschlange vor einem Log-Textfeld: Worker reihen nur ein, der Tk-Loop fügt die
+    gesammelten Zeilen in festen Abständen mit einem einzigen insert ein und behält nur die letzten max_lines
+    (die vollständige Historie steht in der Log-Datei)"""
+
+    def __init__(self, textbox, max_lines=2000, interval_ms=50):
+        self.textbox = textbox
+        self.max_lines = max_lines
+        self.interval_ms = interval_ms
+        # deque.append/popleft sind threadsicher - Worker-Threads berühren Tk nie direkt
+        self.pending = collections.deque()
+        self.line_count = 0
+        self.after_id = None
+        self.schedule()
+
+    def post(self, message):
+        """Reiht eine Nachricht ein - von jedem Thread aus aufrufbar"""
+        self.pending.append(message)
+
+    def schedule(self):
+        self.after_id = self.textbox.after(self.interval_ms, self.drain)
+
+    def drain(self):
+        """Fügt alle wartenden Nachrichten auf einmal ein und kürzt den Anfang (läuft im Tk-Loop)"""
+        self.after_id = None
+        try:
+            count = len(self.pending)
+            if count:
+                messages = [self.pending.popleft() for _ in range(count)]
+                # Mehr als der Puffer fasst → nur das Ende einfügen
+                text = "\n".join(messages[-self.max_lines:]) + "\n"
+                
+                self.textbox.insert("end", text)
+                self.line_count += text.count("\n")
+                
+                excess = self.line_count - self.max_lines
+                if excess > 0:
+                    self.textbox.delete("1.0", f"{excess + 1}.0")
+                    self.line_count -= excess
+                
+                self.textbox.see("end")
+        
+        except tk.TclError:
+            return  # Textfeld wurde zerstört
+        
+        self.schedule()
+
+    def clear(self):
+        """Leert Textfeld und Warteschlange (im Tk-Loop aufrufen)"""
+        self.pending.clear()
+        self.textbox.delete("0.0", "end")
+        self.line_count = 0
+
+    def stop(self):
+        """Beendet das periodische Leeren (vor dem Schließen des Fensters)"""
+        if self.after_id is not None:
+            self.textbox.after_cancel(self.after_id)
+            self.after_id = None
@@ -8,6 +8,7 @@ import os
 import pyperclip
 import json
 import threading
+import queue
 import subprocess
 import shutil
 from datetime import datetime
@@ -23,10 +24,18 @@ except ImportError:
 # Absolute Imports (korrigiert!)
 from src.gui.components.collapsible_frame import CollapsibleFrame
 from src.gui.components.resizable_pane import ResizablePane
+from src.gui.components.field_overlay import FieldOverlay
+from src.gui.components.log_view import LogBuffer
 from src.automation.acrobat_controller import AcrobatController
 from src.automation.field_operations import FieldOperations
+from src.automation.waiting import Waiter
+from src.automation.backends import BACKENDS, AcrobatGuiBackend, PyMuPDFBackend, create_backend
+from src.automation.pdf_field_engine import PdfFieldEngine, WIDGET_TYPES
 from src.utils.logger import Logger
 from src.utils.file_handler import SettingsManager, FileHandler
+from src.utils.definitions import validate_definitions, summarize_issues, iter_definition_records
+from src.utils.run_journal import RunJournal
+from src.utils.timing import step_timer
 
 # Sicherheitseinstellungen
 pyautogui.FAILSAFE = True
@@ -48,9 +57,20 @@ class AcrobatFormAutomatorPro(ctk.CTk):
         # Initialisiere Komponenten
         self.logger = Logger()
         self.settings_manager = SettingsManager()
-        self.file_handler = FileHandler()
-        self.acrobat_controller = AcrobatController()
-        self.field_operations = FieldOperations()
+        self.file_handler = FileHandler(
+            cache_dir=os.path.join(self.settings_manager.settings_dir, "definitions_cache")
+        )
+        # Gemeinsamer Waiter: Geschwindigkeit und Warte-Modus gelten für Controller und Feld-Operationen
+        self.waiter = Waiter()
+        self.acrobat_controller = AcrobatController(waiter=self.waiter)
+        self.field_operations = FieldOperations(waiter=self.waiter)
+        
+        # Persistenter Render-Cache der PDF-Seiten (Vorlagen werden beim nächsten Start sofort angezeigt)
+        self.render_cache = None
+        if PDF_VIEWER_AVAILABLE:
+            self.render_cache = DiskPageCache(
+                os.path.join(self.settings_manager.settings_dir, "render_cache")
+            )
         
         # Variablen
         self.pdf_path = None
@@ -61,6 +81,7 @@ class AcrobatFormAutomatorPro(ctk.CTk):
         self.created_fields = []
         self.current_task = ""
         self.captured_position = None
+        self.field_overlay = None
         
         # Tool-Koordinaten für Kalibrierung
         self.tool_coordinates = {
@@ -307,10 +328,34 @@ class AcrobatFormAutomatorPro(ctk.CTk):
         
         speed_slider.configure(command=self.update_speed_label)
         
+        # Backend-Auswahl
+        backend_label = ctk.CTkLabel(
+            content, text="Automatisierungs-Backend:", font=ctk.CTkFont(weight="bold")
+        )
+        backend_label.pack(anchor="w", padx=10, pady=(10, 5))
+        
+        self.backend_var = ctk.StringVar(value=AcrobatGuiBackend.name)
+        backend_menu = ctk.CTkOptionMenu(
+            content,
+            variable=self.backend_var,
+            values=list(BACKENDS.keys()),
+        )
+        backend_menu.pack(fill="x", padx=10, pady=5)
+        
         # Sicherheitsoptionen
         safety_frame = ctk.CTkFrame(content)
         safety_frame.pack(fill="x", padx=10, pady=10)
         
+        # Auf Reaktionen von Acrobat warten statt fester Pausen (schneller auf flotten Rechnern)
+        self.wait_conditions_var = ctk.BooleanVar(value=True)
+        wait_check = ctk.CTkCheckBox(
+            safety_frame,
+            text="Auf Acrobat warten statt fester Pausen",
+            variable=self.wait_conditions_var,
+            command=self.update_wait_conditions,
+        )
+        wait_check.pack(anchor="w", padx=10, pady=5)
+        
         self.safety_var = ctk.BooleanVar(value=True)
         safety_check = ctk.CTkCheckBox(
             safety_frame, text="Sicherheitsmodus", variable=self.safety_var
@@ -385,6 +430,23 @@ class AcrobatFormAutomatorPro(ctk.CTk):
             )
             status_label.pack(side="right", padx=5, pady=5)
             self.calibration_labels[tool_name] = status_label
+        
+        # Vorlage des Eigenschaften-Dialogs (Erkennung statt blindem Warten)
+        dialog_frame = ctk.CTkFrame(content)
+        dialog_frame.pack(fill="x", padx=10, pady=5)
+        
+        dialog_btn = ctk.CTkButton(
+            dialog_frame,
+            text="🪟 Eigenschaften-Dialog",
+            width=200,
+            command=self.calibrate_properties_dialog,
+        )
+        dialog_btn.pack(side="left", padx=5, pady=5)
+        
+        self.dialog_calibration_label = ctk.CTkLabel(
+            dialog_frame, text="Nicht kalibriert", text_color="#ff6b6b"
+        )
+        self.dialog_calibration_label.pack(side="right", padx=5, pady=5)
 
 
     def create_status_section(self):
@@ -417,6 +479,13 @@ class AcrobatFormAutomatorPro(ctk.CTk):
         self.progress.pack(fill="x", padx=10, pady=5)
         self.progress.set(0)
         
+        # Schrittzeiten der GUI-Automatisierung (p50/p95 der zeitintensivsten Schritte)
+        self.timing_label = ctk.CTkLabel(
+            content, text="⏱️ Schrittzeiten: noch keine Messung", justify="left", anchor="w"
+        )
+        self.timing_label.pack(fill="x", padx=10, pady=5)
+        self.timing_after_id = self.after(1000, self.refresh_step_timing)
+        
         # Log-Bereich (Resizable)
         log_pane = ResizablePane(content, min_height=150)
         log_pane.pack(fill="both", expand=True, padx=10, pady=10)
@@ -432,6 +501,9 @@ class AcrobatFormAutomatorPro(ctk.CTk):
         )
         self.log_text.pack(fill="both", expand=True, padx=10, pady=(0, 10))
         
+        # Worker loggen nur in eine Warteschlange, der Tk-Loop fügt gesammelt ein
+        self.log_buffer = LogBuffer(self.log_text)
+        
         # Log-Buttons
         log_btn_frame = ctk.CTkFrame(log_pane)
         log_btn_frame.pack(fill="x", padx=10, pady=(0, 10))
@@ -480,6 +552,16 @@ class AcrobatFormAutomatorPro(ctk.CTk):
         )
         reload_btn.pack(side="left", padx=5)
         
+        zoom_out_btn = ctk.CTkButton(
+            pdf_controls, text="➖", width=40, command=lambda: self.zoom_pdf(1 / 1.25)
+        )
+        zoom_out_btn.pack(side="left", padx=5)
+        
+        zoom_in_btn = ctk.CTkButton(
+            pdf_controls, text="➕", width=40, command=lambda: self.zoom_pdf(1.25)
+        )
+        zoom_in_btn.pack(side="left", padx=5)
+        
         # PDF-Viewer Bereich
         self.pdf_viewer_frame = ctk.CTkFrame(self.right_panel, fg_color="white")
         self.pdf_viewer_frame.grid(
@@ -525,15 +607,27 @@ class AcrobatFormAutomatorPro(ctk.CTk):
             if hasattr(self, "placeholder_frame"):
                 self.placeholder_frame.destroy()
             
-            if PDF_VIEWER_AVAILABLE:
+            if PDF_VIEWER_AVAILABLE and getattr(self, "pdf_viewer", None) is not None and self.pdf_viewer.winfo_exists():
+                # Vorhandenen Viewer umschalten - laufendes Rendern der alten Datei wird abgebrochen
+                self.pdf_viewer.configure(file=self.pdf_path)
+                self.load_field_overlay()
+                
+                self.log_message(
+                    f"PDF geöffnet: {os.path.basename(self.pdf_path)}", "SUCCESS"
+                )
+            elif PDF_VIEWER_AVAILABLE:
                 # Erstelle PDF-Viewer
                 self.pdf_viewer = CTkPDFViewer(
                     self.pdf_viewer_frame,
                     file=self.pdf_path,
                     page_width=800,
                     page_height=600,
+                    virtualized=True,
+                    fit_width=True,
+                    disk_cache=self.render_cache,
                 )
                 self.pdf_viewer.pack(fill="both", expand=True, padx=10, pady=10)
+                self.load_field_overlay()
                 
                 self.log_message(
                     f"PDF geöffnet: {os.path.basename(self.pdf_path)}", "SUCCESS"
@@ -561,6 +655,89 @@ class AcrobatFormAutomatorPro(ctk.CTk):
             messagebox.showerror("PDF-Fehler", f"Konnte PDF nicht öffnen:\n{str(e)}")
 
 
+    def load_field_overlay(self):
+        """Liest die Widgets der PDF und legt das Feld-Overlay über den Viewer"""
+        pdf_path = self.pdf_path
+        results = queue.Queue()
+        
+        # PyMuPDF ist nicht threadsicher → im Render-Worker des Viewers statt in einem eigenen Thread
+        shared_render_pool.submit(RenderTicket(), results, "overlay", self._build_field_overlay, pdf_path)
+        self.after(50, lambda: self._apply_field_overlay(results, pdf_path))
+
+
+    @staticmethod
+    def _build_field_overlay(pdf_path):
+        """Baut den Widget-Index einmal pro Dokument auf (läuft im Render-Worker)"""
+        engine = PdfFieldEngine()
+        if not engine.open_pdf(pdf_path):
+            return None
+        
+        try:
+            return FieldOverlay(engine.widget_layout(), engine.page_sizes())
+        finally:
+            engine.close()
+
+
+    def _apply_field_overlay(self, results, pdf_path):
+        """Übergibt das fertige Overlay an den Viewer (im Tk-Thread)"""
+        try:
+            _, _, overlay, error = results.get_nowait()
+        except queue.Empty:
+            self.after(50, lambda: self._apply_field_overlay(results, pdf_path))
+            return
+        
+        if error is not None or overlay is None:
+            self.log_message(f"Feld-Overlay nicht verfügbar: {error or 'PDF konnte nicht gelesen werden'}", "WARNING")
+            return
+        
+        # Inzwischen andere PDF geöffnet oder Viewer geschlossen
+        if pdf_path != self.pdf_path or getattr(self, "pdf_viewer", None) is None or not self.pdf_viewer.winfo_exists():
+            return
+        
+        self.field_overlay = overlay
+        self.pdf_viewer.set_field_overlay(overlay, on_click=self.on_viewer_click)
+        self.log_message(f"🗺️ Feld-Overlay: {len(overlay)} Felder", "INFO")
+
+
+    def on_viewer_click(self, page_number, u, v, hit):
+        """Klick im PDF-Viewer: Position (und ggf. das angeklickte Feld) für die Einzelfeld-Erstellung übernehmen"""
+        if self.backend_var.get() != PyMuPDFBackend.name:
+            # Viewer-Koordinaten lassen sich nicht auf das Acrobat-Fenster übertragen
+            self.log_message(
+                f"Klick im Viewer ignoriert - Positionen aus dem Viewer gelten nur für '{PyMuPDFBackend.name}'",
+                "WARNING",
+            )
+            return
+        
+        x, y = self.field_overlay.to_page_point(page_number, u, v)
+        self.captured_position = {"page": page_number + 1, "x": round(x, 1), "y": round(y, 1)}
+        
+        if hit is not None:
+            field = hit[5]
+            x0, y0, x1, y1 = field["rect"]
+            self.captured_position.update(
+                x=round(x0, 1), y=round(y0, 1), width=round(x1 - x0, 1), height=round(y1 - y0, 1)
+            )
+            
+            self.field_name_entry.delete(0, "end")
+            self.field_name_entry.insert(0, field["name"])
+            if field["type"] in ("Textfeld", "Checkbox", "Optionsfeld", "Dropdown", "Signatur"):
+                self.field_type_var.set(field["type"])
+            
+            self.log_message(f"📍 Feld '{field['name']}' übernommen (Seite {page_number + 1})", "INFO")
+        else:
+            self.log_message(
+                f"📍 Position erfasst: Seite {page_number + 1} ({self.captured_position['x']}, {self.captured_position['y']})",
+                "SUCCESS",
+            )
+
+
+    def zoom_pdf(self, factor):
+        """Zoomt den PDF-Viewer (auch per Strg + Mausrad)"""
+        if getattr(self, "pdf_viewer", None) is not None and self.pdf_viewer.winfo_exists():
+            self.pdf_viewer.set_zoom(self.pdf_viewer.zoom * factor)
+
+
     def reload_pdf(self):
         """Lädt die PDF neu"""
         if hasattr(self, "pdf_viewer"):
@@ -686,16 +863,27 @@ class AcrobatFormAutomatorPro(ctk.CTk):
             return
         
         df = self.file_handler.load_field_definitions(self.data_path)
-        if df is None:
+        if df is None or not self.check_definitions(df, "create"):
             return
         
+        if self.backend_var.get() == PyMuPDFBackend.name:
+            prerequisites = (
+                "ℹ️ Direkt-Modus (PyMuPDF):\n"
+                "• Felder werden ohne Acrobat ins PDF geschrieben\n"
+                "• Position aus den Spalten page, x, y, width, height"
+            )
+        else:
+            prerequisites = (
+                "⚠️ Voraussetzungen:\n"
+                "• Adobe Acrobat DC ist geöffnet\n"
+                "• PDF ist geladen\n"
+                "• Formular-Modus ist aktiv"
+            )
+        
         result = messagebox.askyesno(
             "Alle Felder erstellen",
             f"🤖 Sollen {len(df)} Felder automatisch erstellt werden?\n\n"
-            "⚠️ Voraussetzungen:\n"
-            "• Adobe Acrobat DC ist geöffnet\n"
-            "• PDF ist geladen\n"
-            "• Formular-Modus ist aktiv",
+            + prerequisites,
         )
         if not result:
             return
@@ -709,11 +897,72 @@ class AcrobatFormAutomatorPro(ctk.CTk):
         thread.start()
 
 
+    def check_definitions(self, df, operation):
+        """Prüft die Definitionen vor dem Lauf - bei Problemen entscheidet der Benutzer"""
+        known_fields = None
+        if self.backend_var.get() == PyMuPDFBackend.name and self.pdf_path:
+            # Vorhandene Feldnamen direkt aus dem PDF (ohne Acrobat nicht ermittelbar)
+            engine = PdfFieldEngine()
+            if engine.open_pdf(self.pdf_path):
+                known_fields = engine.list_fields()
+            engine.close()
+        
+        issues = validate_definitions(
+            df,
+            operation,
+            known_types=WIDGET_TYPES.keys() if operation == "create" else None,
+            known_fields=known_fields,
+        )
+        if issues.empty:
+            return True
+        
+        lines = summarize_issues(issues)
+        self.log_message(f"⚠️ {len(issues)} Probleme in den Feld-Definitionen", "WARNING")
+        for line in lines:
+            self.log_message(line, "WARNING")
+        
+        return messagebox.askyesno(
+            "Probleme in den Feld-Definitionen",
+            f"⚠️ {len(issues)} Probleme gefunden:\n\n" + "\n".join(lines) + "\n\nTrotzdem fortfahren?",
+        )
+
+
+    def get_backend(self):
+        """Erstellt das in den Einstellungen gewählte Automatisierungs-Backend"""
+        backend_name = self.backend_var.get()
+        
+        if backend_name == AcrobatGuiBackend.name:
+            return AcrobatGuiBackend(
+                self.acrobat_controller, self.field_operations, speed=self.speed_var.get()
+            )
+        return create_backend(backend_name)
+
+
+    def _open_backend(self):
+        """Erstellt und öffnet das Backend für das aktuelle PDF"""
+        backend = self.get_backend()
+        self.log_message(f"Backend: {backend.name}", "INFO")
+        
+        if not backend.open(self.pdf_path):
+            raise Exception("PDF konnte nicht geöffnet werden")
+        return backend
+
+
+    def _finish_backend(self, backend, successful):
+        """Speichert (falls vom Backend vorgesehen) und schließt das Backend"""
+        try:
+            if backend.auto_save and successful > 0:
+                if not backend.save(backup=self.backup_var.get()):
+                    raise Exception("PDF konnte nicht gespeichert werden")
+        finally:
+            backend.close()
+
+
     def _create_fields_worker(self, df):
         """Worker-Thread für Feld-Erstellung"""
         try:
             self.update_task("Felder erstellen")
-            pyautogui.PAUSE = self.speed_var.get()
+            backend = self._open_backend()
             
             successful = 0
             failed = 0
@@ -721,44 +970,54 @@ class AcrobatFormAutomatorPro(ctk.CTk):
             
             self.log_message(f"Starte Erstellung von {total} Feldern...", "INFO")
             
-            for index, row in df.iterrows():
-                if not self.is_running:
-                    break
-                
-                while self.pause_automation:
-                    time.sleep(0.5)
-                
-                field_name = str(row["new_name"])
-                field_type = str(row.get("type", "Textfeld"))
-                display_name = str(row.get("display_name", ""))
-                
-                self.log_message(
-                    f"Erstelle Feld {index+1}/{total}: {field_name}", "INFO"
-                )
-                self.update_progress(index / total)
-                
-                try:
-                    # Berechne Position (einfaches Grid)
-                    x = 100
-                    y = 150 + (index * 40)
+            journal = RunJournal("create", backend.name, pdf=os.path.basename(self.pdf_path))
+            journal.start(total)
+            step_timer.reset()
+            
+            try:
+                for index, row in enumerate(iter_definition_records(df)):
+                    if not self.is_running:
+                        break
+                    
+                    while self.pause_automation:
+                        time.sleep(0.5)
                     
-                    # Erstelle Feld
-                    success = self.field_operations.create_field_at_position(
-                        x, y, field_type, field_name, display_name, 200, 25
+                    field_name = str(row["new_name"])
+                    
+                    self.log_message(
+                        f"Erstelle Feld {index+1}/{total}: {field_name}", "INFO"
                     )
+                    self.update_progress(index / total)
                     
-                    if success:
-                        successful += 1
-                        self.log_message(
-                            f"✅ '{field_name}' erfolgreich erstellt", "SUCCESS"
-                        )
-                    else:
+                    field_start = time.perf_counter()
+                    error = ""
+                    try:
+                        if backend.create_field(row, index):
+                            successful += 1
+                            self.log_message(
+                                f"✅ '{field_name}' erfolgreich erstellt", "SUCCESS"
+                            )
+                        else:
+                            failed += 1
+                            error = "Erstellung fehlgeschlagen"
+                            self.log_message(f"❌ Fehler bei '{field_name}'", "ERROR")
+                    
+                    except Exception as e:
                         failed += 1
-                        self.log_message(f"❌ Fehler bei '{field_name}'", "ERROR")
-                
-                except Exception as e:
-                    failed += 1
-                    self.log_message(f"❌ Fehler bei '{field_name}': {str(e)}", "ERROR")
+                        error = str(e)
+                        self.log_message(f"❌ Fehler bei '{field_name}': {str(e)}", "ERROR")
+                    
+                    journal.record(
+                        field_name,
+                        "failed" if error else "ok",
+                        time.perf_counter() - field_start,
+                        error,
+                        field_type=row.get("type", "Textfeld"),
+                    )
+            
+            finally:
+                self._finish_backend(backend, successful)
+                self._finish_journal(journal, successful, failed)
             
             # Zusammenfassung
             self.update_progress(1.0)
@@ -795,8 +1054,14 @@ class AcrobatFormAutomatorPro(ctk.CTk):
             )
             return
         
+        if self.backend_var.get() == PyMuPDFBackend.name and not self.pdf_path:
+            messagebox.showwarning(
+                "Keine PDF", "Bitte wählen Sie zuerst eine PDF-Datei aus."
+            )
+            return
+        
         df = self.file_handler.load_field_definitions(self.data_path)
-        if df is None:
+        if df is None or not self.check_definitions(df, "rename"):
             return
         
         result = messagebox.askyesno(
@@ -818,7 +1083,7 @@ class AcrobatFormAutomatorPro(ctk.CTk):
         """Worker-Thread für Feld-Umbenennung"""
         try:
             self.update_task("Felder umbenennen")
-            pyautogui.PAUSE = self.speed_var.get()
+            backend = self._open_backend()
             
             successful = 0
             failed = 0
@@ -826,41 +1091,62 @@ class AcrobatFormAutomatorPro(ctk.CTk):
             
             self.log_message(f"Starte Umbenennung von {total} Feldern...", "INFO")
             
-            for index, row in df.iterrows():
-                if not self.is_running:
-                    break
-                
-                while self.pause_automation:
-                    time.sleep(0.5)
-                
-                original_name = str(row["original_name"])
-                new_name = str(row["new_name"])
-                
-                self.log_message(
-                    f"Suche Feld {index+1}/{total}: '{original_name}'", "INFO"
-                )
-                self.update_progress(index / total)
-                
-                try:
-                    if self.field_operations.find_and_rename_field(
-                        original_name, new_name
-                    ):
-                        successful += 1
-                        self.log_message(
-                            f"✅ '{original_name}' → '{new_name}'", "SUCCESS"
-                        )
-                    else:
+            journal = RunJournal("rename", backend.name, pdf=os.path.basename(self.pdf_path or ""))
+            journal.start(total)
+            step_timer.reset()
+            
+            try:
+                for index, (original_name, new_name) in enumerate(
+                    zip(df["original_name"], df["new_name"])
+                ):
+                    if not self.is_running:
+                        break
+                    
+                    while self.pause_automation:
+                        time.sleep(0.5)
+                    
+                    original_name = str(original_name)
+                    new_name = str(new_name)
+                    
+                    self.log_message(
+                        f"Suche Feld {index+1}/{total}: '{original_name}'", "INFO"
+                    )
+                    self.update_progress(index / total)
+                    
+                    field_start = time.perf_counter()
+                    error = ""
+                    try:
+                        if backend.rename_field(original_name, new_name):
+                            successful += 1
+                            self.log_message(
+                                f"✅ '{original_name}' → '{new_name}'", "SUCCESS"
+                            )
+                        else:
+                            failed += 1
+                            error = "Feld nicht gefunden"
+                            self.log_message(
+                                f"❌ Feld '{original_name}' nicht gefunden", "WARNING"
+                            )
+                    
+                    except Exception as e:
                         failed += 1
+                        error = str(e)
                         self.log_message(
-                            f"❌ Feld '{original_name}' nicht gefunden", "WARNING"
+                            f"❌ Fehler bei '{original_name}': {str(e)}", "ERROR"
                         )
-                
-                except Exception as e:
-                    failed += 1
-                    self.log_message(
-                        f"❌ Fehler bei '{original_name}': {str(e)}", "ERROR"
+                    
+                    journal.record(
+                        original_name,
+                        "failed" if error else "ok",
+                        time.perf_counter() - field_start,
+                        error,
+                        new_name=new_name,
                     )
             
+            finally:
+                self._finish_backend(backend, successful)
+                self._finish_journal(journal, successful, failed)
+            
             # Zusammenfassung
             self.update_progress(1.0)
             self.log_message(f"🏁 Umbenennung abgeschlossen!", "SUCCESS")
@@ -915,6 +1201,14 @@ class AcrobatFormAutomatorPro(ctk.CTk):
 
     def capture_position(self):
         """Erfasst die aktuelle Mausposition mit verbesserter Keyboard-Erkennung"""
+        if self.field_overlay is not None and self.backend_var.get() == PyMuPDFBackend.name:
+            # Mit Viewer und direktem Backend genügt ein Klick in die PDF-Vorschau
+            messagebox.showinfo(
+                "Position erfassen",
+                "Klicken Sie im PDF-Viewer auf die gewünschte Stelle oder auf ein vorhandenes Feld.",
+            )
+            return
+        
         messagebox.showinfo(
             "Position erfassen",
             "Bewegen Sie die Maus zur gewünschten Position und drücken Sie LEERTASTE.",
@@ -963,16 +1257,36 @@ class AcrobatFormAutomatorPro(ctk.CTk):
         
         self.log_message(f"📝 Erstelle {field_type}: {field_name}", "INFO")
         
+        direct = self.backend_var.get() == PyMuPDFBackend.name
+        if isinstance(self.captured_position, dict):
+            # Position aus dem Viewer (PDF-Koordinaten) - Acrobat braucht Bildschirmkoordinaten
+            if not direct:
+                messagebox.showwarning(
+                    "Position nicht verwendbar",
+                    "Die im Viewer erfasste Position gilt nur für das Backend "
+                    f"'{PyMuPDFBackend.name}'.\nBitte die Position in Acrobat per Leertaste erfassen.",
+                )
+                return
+            definition = dict(self.captured_position)
+        else:
+            if direct:
+                messagebox.showwarning(
+                    "Position nicht verwendbar",
+                    "Bildschirmpositionen gelten nur für Acrobat.\n"
+                    "Bitte die Position per Klick in den PDF-Viewer erfassen.",
+                )
+                return
+            definition = {"screen_x": self.captured_position[0], "screen_y": self.captured_position[1]}
+        
+        definition.update(new_name=field_name, type=field_type, display_name=display_name)
+        
         try:
-            success = self.field_operations.create_field_at_position(
-                self.captured_position[0],
-                self.captured_position[1],
-                field_type,
-                field_name,
-                display_name,
-                200,
-                25,
-            )
+            backend = self._open_backend()
+            success = False
+            try:
+                success = backend.create_field(definition)
+            finally:
+                self._finish_backend(backend, 1 if success else 0)
             
             if success:
                 self.log_message(f"✅ '{field_name}' erfolgreich erstellt", "SUCCESS")
@@ -987,6 +1301,10 @@ class AcrobatFormAutomatorPro(ctk.CTk):
         except Exception as e:
             self.log_message(f"❌ Fehler: {str(e)}", "ERROR")
             messagebox.showerror("Fehler", f"Fehler beim Erstellen:\n{str(e)}")
+            return
+        
+        if direct:
+            self.reload_pdf()
 
 
     def calibrate_tool(self, tool_name):
@@ -1049,18 +1367,59 @@ class AcrobatFormAutomatorPro(ctk.CTk):
         thread.start()
 
 
+    def calibrate_properties_dialog(self):
+        """Nimmt die Vorlage des Eigenschaften-Dialogs für die Dialog-Erkennung auf"""
+        result = messagebox.askquestion(
+            "Kalibrierung",
+            "🪟 Kalibrierung des Eigenschaften-Dialogs\n\n"
+            "1. Öffnen Sie in Adobe Acrobat DC die Eigenschaften eines Feldes\n"
+            "2. Bewegen Sie die Maus auf die Titelleiste des Dialogs\n"
+            "3. Drücken Sie LEERTASTE\n\n"
+            "Bereit?",
+        )
+        
+        if result != "yes":
+            return
+        
+        def wait_for_calibration():
+            try:
+                self.log_message("Warte auf Leertaste für Eigenschaften-Dialog...", "INFO")
+                keyboard.wait("space")
+                
+                x, y = pyautogui.position()
+                self.field_operations.dialog_detector.capture_template(x, y)
+                
+                self.log_message(
+                    f"✅ Eigenschaften-Dialog kalibriert: ({x}, {y})", "SUCCESS"
+                )
+                self.after(0, self.update_dialog_calibration_label)
+            
+            except Exception as e:
+                self.log_message(f"Fehler bei Kalibrierung: {str(e)}", "ERROR")
+        
+        thread = threading.Thread(target=wait_for_calibration)
+        thread.daemon = True
+        thread.start()
+
+
+    def update_dialog_calibration_label(self):
+        """Zeigt den Kalibrierungsstatus der Dialog-Erkennung"""
+        detector = self.field_operations.dialog_detector
+        if detector.is_calibrated:
+            x, y, width, height = detector.region
+            self.dialog_calibration_label.configure(
+                text=f"Kalibriert: ({x + width // 2}, {y + height // 2})", text_color="#4CAF50"
+            )
+
+
     # ===== HILFSFUNKTIONEN =====
 
     def log_message(self, message, level="INFO"):
         """Erweiterte Log-Funktion mit Leveln und Farben"""
         formatted_message = self.logger.log(message, level)
         
-        # Füge zu GUI-Log hinzu
-        self.log_text.insert("end", formatted_message + "\n")
-        self.log_text.see("end")
-        
-        # Aktualisiere UI
-        self.update_idletasks()
+        # Füge zu GUI-Log hinzu (threadsicher, eingefügt wird im Tk-Loop)
+        self.log_buffer.post(formatted_message)
 
 
     def update_status(self, message, color="#4CAF50"):
@@ -1074,6 +1433,23 @@ class AcrobatFormAutomatorPro(ctk.CTk):
         self.task_label.configure(text=f"Aktuelle Aufgabe: {task}")
 
 
+    def refresh_step_timing(self):
+        """Zeigt p50/p95 der zeitintensivsten Automatisierungsschritte (läuft periodisch im Tk-Loop)"""
+        lines = step_timer.summary_lines(limit=4)
+        if lines:
+            self.timing_label.configure(text="⏱️ Schrittzeiten:\n" + "\n".join(lines))
+        self.timing_after_id = self.after(1000, self.refresh_step_timing)
+
+
+    def _finish_journal(self, journal, successful, failed):
+        """Schließt das Journal mit den Schrittzeiten des Laufs ab und protokolliert die langsamsten Schritte"""
+        journal.finish(successful, failed, steps=step_timer.snapshot(), pause=pyautogui.PAUSE)
+        
+        lines = step_timer.summary_lines(limit=5)
+        if lines:
+            self.log_message("⏱️ Zeitintensivste Schritte: " + " | ".join(lines), "DEBUG")
+
+
     def update_progress(self, value):
         """Aktualisiert die Progress Bar"""
         self.progress.set(value)
@@ -1084,6 +1460,11 @@ class AcrobatFormAutomatorPro(ctk.CTk):
         self.speed_label.configure(text=f"{float(value):.1f} Sekunden")
 
 
+    def update_wait_conditions(self):
+        """Schaltet das Warten auf Bedingungen (Fenster, Bildschirmausschnitt, Zwischenablage) um"""
+        self.waiter.enabled = self.wait_conditions_var.get()
+
+
     def toggle_pause(self):
         """Pausiert/Startet die Automatisierung"""
         self.pause_automation = not self.pause_automation
@@ -1110,7 +1491,7 @@ class AcrobatFormAutomatorPro(ctk.CTk):
 
     def clear_log(self):
         """Löscht das Log"""
-        self.log_text.delete("0.0", "end")
+        self.log_buffer.clear()
         self.log_message("Log gelöscht", "INFO")
 
 
@@ -1139,13 +1520,27 @@ class AcrobatFormAutomatorPro(ctk.CTk):
     def save_settings(self):
         """Speichert die aktuellen Einstellungen"""
         try:
-            settings = {
+            # Auf den gespeicherten Stand aufsetzen, damit nur in der Datei gepflegte Werte erhalten bleiben
+            settings = self.settings_manager.load_settings()
+            settings.pop("engine", None)  # durch "backend" ersetzt
+            settings.update({
                 "speed": self.speed_var.get(),
+                "backend": self.backend_var.get(),
+                "wait_conditions": self.wait_conditions_var.get(),
                 "safety_mode": self.safety_var.get(),
                 "auto_backup": self.backup_var.get(),
                 "tool_coordinates": self.tool_coordinates,
+                "properties_dialog_template": self.field_operations.dialog_detector.to_settings(),
                 "window_geometry": self.geometry(),
-            }
+                "log_max_lines": self.log_buffer.max_lines,
+            })
+            
+            if PDF_VIEWER_AVAILABLE:
+                settings["page_cache_mb"] = shared_page_cache.max_bytes // (1024 * 1024)
+                # 0 = Render-Cache auf der Festplatte abgeschaltet
+                settings["render_cache_mb"] = (
+                    self.render_cache.max_bytes // (1024 * 1024) if self.render_cache is not None else 0
+                )
             
             self.settings_manager.save_settings(settings)
         
@@ -1161,14 +1556,36 @@ class AcrobatFormAutomatorPro(ctk.CTk):
             # Lade Einstellungen
             if "speed" in settings:
                 self.speed_var.set(settings["speed"])
+            # "engine" = Schlüssel älterer Versionen (gleiche Werte wie die Backend-Namen)
+            backend_name = settings.get("backend", settings.get("engine"))
+            if backend_name in BACKENDS:
+                self.backend_var.set(backend_name)
+            if "wait_conditions" in settings:
+                self.wait_conditions_var.set(settings["wait_conditions"])
+                self.update_wait_conditions()
             if "safety_mode" in settings:
                 self.safety_var.set(settings["safety_mode"])
             if "auto_backup" in settings:
                 self.backup_var.set(settings["auto_backup"])
             if "tool_coordinates" in settings:
                 self.tool_coordinates = settings["tool_coordinates"]
+            if settings.get("properties_dialog_template"):
+                self.field_operations.dialog_detector.load_settings(settings["properties_dialog_template"])
+                self.update_dialog_calibration_label()
             if "window_geometry" in settings:
                 self.geometry(settings["window_geometry"])
+            if "page_cache_mb" in settings and PDF_VIEWER_AVAILABLE:
+                # Speicherobergrenze des gemeinsamen Seiten-Caches der PDF-Viewer
+                shared_page_cache.configure(int(settings["page_cache_mb"]) * 1024 * 1024)
+            if "log_max_lines" in settings:
+                # Sichtbare Zeilen im Aktivitätsprotokoll (vollständig in logs/)
+                self.log_buffer.max_lines = int(settings["log_max_lines"])
+            if "render_cache_mb" in settings and self.render_cache is not None:
+                # 0 schaltet den Render-Cache auf der Festplatte ab
+                if int(settings["render_cache_mb"]) > 0:
+                    self.render_cache.configure(int(settings["render_cache_mb"]) * 1024 * 1024)
+                else:
+                    self.render_cache = None
         
         except Exception as e:
             self.log_message("Hinweis: Keine gespeicherten Einstellungen gefunden", "DEBUG")
@@ -1186,6 +1603,8 @@ class AcrobatFormAutomatorPro(ctk.CTk):
         
         # Speichere Einstellungen
         self.save_settings()
+        self.log_buffer.stop()
+        self.after_cancel(self.timing_after_id)
         self.destroy()
 
 
@@ -0,0 +1,150 @@
+from collections import namedtuple
+import pandas as pd
+
+# Steuerzeichen sowie leere Namensteile ("a..b", ".a", "a.") sind in PDF-Feldnamen ungültig
+INVALID_NAME_PATTERN = r"[\x00-\x1f\x7f]|^\.|\.$|\.\."
+
+# Textspalten, die getrimmt und vereinheitlicht werden
+TEXT_COLUMNS = ['original_name', 'new_name', 'type', 'display_name', 'choices']
+
+# Positionsspalten mit kompaktem Zieltyp (screen_x/screen_y: Bildschirmkoordinaten für Acrobat)
+NUMERIC_COLUMNS = {
+    'page': 'Int16',
+    'x': 'float32',
+    'y': 'float32',
+    'width': 'float32',
+    'height': 'float32',
+    'screen_x': 'Int32',
+    'screen_y': 'Int32'
+}
+
+# Spalten eines Definitions-Datensatzes (fehlende Spalten/Werte sind None)
+DEFINITION_FIELDS = ('original_name', 'new_name', 'type', 'display_name', 'choices',
+                     'page', 'x', 'y', 'width', 'height', 'screen_x', 'screen_y')
+
+# Spalten der Problemliste aus validate_definitions
+ISSUE_COLUMNS = ['row', 'column', 'value', 'problem']
+
+# Feldtypen, deren Zeilen mit gleichem Namen eine Optionsfeld-Gruppe bilden
+RADIO_TYPES = ('Optionsfeld', 'Radio Button')
+
+def normalize_definitions(df):
+    """Vereinheitlicht Definitionen spaltenweise: Text getrimmt und NFC-normalisiert, Typ als Kategorie,
+    Positionen als kompakte Zahlentypen (nicht lesbare Werte werden NaN und von validate_definitions gemeldet)"""
+    df = df.copy()
+
+    for column in TEXT_COLUMNS:
+        if column in df.columns:
+            text = df[column].astype(str).str.strip().str.normalize('NFC')
+            df[column] = text.where(df[column].notna())
+
+    if 'type' in df.columns:
+        df['type'] = df['type'].fillna('Textfeld').astype('category')
+
+    # Zeilen mit nicht lesbaren Zahlen je Spalte (für validate_definitions)
+    unreadable = {}
+    for column, dtype in NUMERIC_COLUMNS.items():
+        if column not in df.columns:
+            continue
+        
+        numbers = pd.to_numeric(df[column], errors='coerce')
+        bad = numbers.isna() & df[column].notna()
+        if bad.any():
+            unreadable[column] = df.loc[bad, column].astype(str)
+        
+        df[column] = numbers.round().astype(dtype) if dtype.startswith('Int') else numbers.astype(dtype)
+
+    df.attrs['unreadable'] = unreadable
+    return df
+
+def _issues(values, column, problem):
+    """Problemwerte als Tabelle (Zeilennummer wie in der Datei: Kopfzeile = Zeile 1)"""
+    return pd.DataFrame({
+        'row': values.index + 2,
+        'column': column,
+        'value': values.astype(object).fillna('').astype(str).values,
+        'problem': problem
+    })
+
+def validate_definitions(df, operation='rename', known_types=None, known_fields=None):
+    """Prüft normalisierte Definitionen ohne Zeilenschleife auf doppelte Zielnamen, ungültige Zeichen,
+    unbekannte Feldtypen, fehlende bzw. (beim Erstellen) schon vorhandene Felder und nicht lesbare
+    Positionen - liefert die Problemliste"""
+    issues = []
+    new_names = df['new_name']
+
+    duplicated = new_names.notna() & new_names.duplicated(keep=False)
+    radio = df['type'].isin(RADIO_TYPES) if 'type' in df.columns else pd.Series(False, index=df.index)
+    if operation == 'create':
+        # Knöpfe einer Optionsfeld-Gruppe teilen sich den Namen (nur wenn alle Zeilen des Namens Optionsfelder sind)
+        radio_names = set(new_names[radio].dropna()) - set(new_names[~radio].dropna())
+        duplicated &= ~new_names.isin(radio_names)
+    issues.append(_issues(new_names[duplicated], 'new_name', "Neuer Name mehrfach vergeben"))
+
+    invalid = new_names.fillna('').str.contains(INVALID_NAME_PATTERN, regex=True)
+    issues.append(_issues(new_names[invalid], 'new_name', "Ungültige Zeichen im Feldnamen"))
+
+    if known_types is not None and 'type' in df.columns:
+        types = df['type'].astype(str)
+        issues.append(_issues(types[~types.isin(list(known_types))], 'type', "Unbekannter Feldtyp"))
+
+    if operation == 'rename':
+        originals = df['original_name']
+        missing = originals.isna() | (originals == '')
+        if known_fields is not None:
+            # Ketten (a → b, b → c): Zielnamen früherer Zeilen gelten ebenfalls als vorhanden
+            available = set(known_fields) | set(new_names.dropna())
+            missing |= ~originals.isin(available)
+        issues.append(_issues(originals[missing], 'original_name', "Originalfeld nicht vorhanden"))
+    elif known_fields is not None:
+        # Vorhandene Optionsfeld-Gruppen dürfen weitere Knöpfe bekommen (Typ prüft die Engine beim Erstellen)
+        exists = new_names.isin(set(known_fields)) & ~radio
+        issues.append(_issues(new_names[exists], 'new_name', "Feld existiert bereits"))
+
+    for column, values in df.attrs.get('unreadable', {}).items():
+        # Nach dem Filtern nur noch Zeilen melden, die in den Definitionen enthalten sind
+        values = values[values.index.isin(df.index)]
+        issues.append(_issues(values, column, "Keine gültige Zahl"))
+
+    issues = [frame for frame in issues if not frame.empty]
+    if not issues:
+        return pd.DataFrame(columns=ISSUE_COLUMNS)
+    return pd.concat(issues, ignore_index=True).sort_values('row', kind='stable').reset_index(drop=True)
+
+def summarize_issues(issues, limit=10):
+    """Kurzfassung der Problemliste für Log und Rückfrage"""
+    lines = [f"{problem}: {count}" for problem, count in issues['problem'].value_counts().items()]
+    for issue in issues.head(limit).itertuples(index=False):
+        lines.append(f"  Zeile {issue.row}, {issue.column} = '{issue.value}': {issue.problem}")
+    if len(issues) > limit:
+        lines.append(f"  ... und {len(issues) - limit} weitere")
+    return lines
+
+class FieldDefinition(namedtuple('FieldDefinition', DEFINITION_FIELDS)):
+    """Eine Definitionszeile als schlankes Tupel - ersetzt die pandas-Series aus iterrows(),
+    bietet aber denselben Zugriff über row['spalte'] und row.get('spalte', standard)"""
+    __slots__ = ()
+    
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            if key not in self._fields:
+                raise KeyError(key)
+            return getattr(self, key)
+        return super().__getitem__(key)
+    
+    def get(self, column, default=None):
+        value = getattr(self, column, None) if column in self._fields else None
+        return default if value is None else value
+
+def iter_definition_records(df):
+    """Datensätze einer Definitionstabelle - Spalten werden einmal in Python-Listen umgewandelt
+    (NaN → None) und dann nur noch zeilenweise zusammengesetzt"""
+    columns = []
+    for column in DEFINITION_FIELDS:
+        if column in df.columns:
+            values = df[column].astype(object)
+            columns.append(values.where(values.notna(), None).tolist())
+        else:
+            columns.append([None] * len(df))
+    
+    return map(FieldDefinition._make, zip(*columns))
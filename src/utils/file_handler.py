@@ -1,7 +1,110 @@
+import hashlib
 import json
 import os
+import pickle
 import pandas as pd
 from .logger import Logger
+from .definitions import normalize_definitions
+
+# Encodings für Definitionsdateien ohne BOM in Prüfreihenfolge
+DEFINITION_ENCODINGS = ['utf-8', 'windows-1252', 'latin1']
+
+# Erforderliche Spalten jeder Definitionsdatei
+REQUIRED_DEFINITION_COLUMNS = ['original_name', 'new_name']
+
+# Umfang der Probe vom Dateianfang für die Erkennung von Encoding und Separator
+SNIFF_BYTES = 64 * 1024
+
+# Byte Order Marks → Encoding (Python entfernt das BOM mit diesen Encodings beim Lesen)
+BOM_ENCODINGS = [
+    (b'\xef\xbb\xbf', 'utf-8-sig'),
+    (b'\xff\xfe', 'utf-16'),
+    (b'\xfe\xff', 'utf-16')
+]
+
+def _sniff_encoding(sample, truncated):
+    """Encoding einer Probe: BOM, UTF-16 ohne BOM (Nullbytes), sonst erstes fehlerfrei dekodierendes Encoding"""
+    for bom, encoding in BOM_ENCODINGS:
+        if sample.startswith(bom):
+            return encoding, True, sample.decode(encoding, errors='ignore')
+    
+    # UTF-16 ohne BOM: ASCII-Zeichen haben jedes zweite Byte 0
+    pairs = len(sample) // 2
+    if pairs and sample.count(0) > pairs // 2:
+        encoding = 'utf-16-le' if sample[1::2].count(0) > sample[0::2].count(0) else 'utf-16-be'
+        return encoding, False, sample[:pairs * 2].decode(encoding, errors='ignore')
+    
+    for encoding in DEFINITION_ENCODINGS:
+        try:
+            return encoding, False, sample.decode(encoding)
+        except UnicodeDecodeError as e:
+            # Am Probenende abgeschnittenes Mehrbyte-Zeichen ist kein Encoding-Fehler
+            if truncated and e.start >= len(sample) - 4:
+                return encoding, False, sample[:e.start].decode(encoding)
+    
+    raise Exception("Encoding der Datei nicht erkannt")
+
+def _sniff_separator(text, candidates):
+    """Separator: Trennzeichen mit gleicher Anzahl in Kopf- und Folgezeilen, sonst das häufigste der Kopfzeile"""
+    lines = [line for line in text.splitlines()[:20] if line.strip()]
+    if not lines:
+        raise Exception("Datei ist leer")
+    
+    # Letzte Zeile der Probe kann abgeschnitten sein
+    body = lines[1:-1] if len(lines) > 2 else lines[1:]
+    
+    def score(separator):
+        columns = lines[0].count(separator)
+        consistent = sum(1 for line in body if line.count(separator) == columns)
+        return (columns > 0, consistent, columns)
+    
+    separator = max(candidates, key=score)
+    if lines[0].count(separator) == 0:
+        raise Exception("Kein Separator in der Kopfzeile gefunden")
+    return separator
+
+def sniff_definition_dialect(file_path, sample_bytes=SNIFF_BYTES):
+    """Erkennt BOM/Encoding und Separator einer Definitionsdatei aus dem Dateianfang (ohne Parsen)"""
+    with open(file_path, 'rb') as f:
+        sample = f.read(sample_bytes)
+    if not sample:
+        raise Exception("Datei ist leer")
+    
+    encoding, bom, text = _sniff_encoding(sample, truncated=len(sample) == sample_bytes)
+    dialect = {'encoding': encoding, 'bom': bom, 'separator': None}
+    
+    if not file_path.endswith('.json'):
+        candidates = [';', ',', '\t'] if file_path.endswith('.csv') else ['\t', ';', ',']
+        dialect['separator'] = _sniff_separator(text, candidates)
+    return dialect
+
+def describe_dialect(dialect):
+    """Lesbare Beschreibung eines erkannten Dialekts für das Log"""
+    description = f"{dialect['encoding']} Encoding"
+    if dialect['bom']:
+        description += " mit BOM"
+    if dialect['separator'] is not None:
+        description += f", Separator {dialect['separator']!r}"
+    return description
+
+def read_definition_table(file_path, **read_options):
+    """Liest eine Definitionsdatei mit genau einem Parse-Durchlauf - liefert (DataFrame, Dialekt)"""
+    dialect = sniff_definition_dialect(file_path)
+    
+    if file_path.endswith('.json'):
+        with open(file_path, 'r', encoding=dialect['encoding']) as f:
+            return pd.DataFrame(json.load(f)), dialect
+    
+    read_options.setdefault('dtype', {col: str for col in REQUIRED_DEFINITION_COLUMNS})
+    try:
+        df = pd.read_csv(file_path, sep=dialect['separator'], encoding=dialect['encoding'], **read_options)
+    except UnicodeDecodeError:
+        # Nur die Probe war reines UTF-8 - ein zweiter (letzter) Versuch mit Windows-Encoding
+        if dialect['encoding'] != 'utf-8':
+            raise
+        dialect['encoding'] = 'windows-1252'
+        df = pd.read_csv(file_path, sep=dialect['separator'], encoding='windows-1252', **read_options)
+    return df, dialect
 
 class SettingsManager:
     def __init__(self):
@@ -37,74 +140,175 @@ class SettingsManager:
             return {}
 
 class FileHandler:
-    def __init__(self):
+    # Anzahl Definitionsdateien, die geparst im Speicher gehalten werden
+    MAX_CACHED_DEFINITIONS = 4
+    # Version des Cache-Formats - bei Änderungen an der Aufbereitung erhöhen
+    DEFINITIONS_CACHE_VERSION = 2
+    
+    def __init__(self, cache_dir=None):
         self.logger = Logger()
+        # Optionaler Ordner für geparste Definitionen (Pickle), überlebt Neustarts
+        self.cache_dir = cache_dir
+        # Dateipfad → ((mtime, Größe), DataFrame) der zuletzt geladenen Definitionen
+        self.definitions_cache = {}
+        
+    @staticmethod
+    def _definitions_key(file_path):
+        """Änderungsmerkmal einer Datei - geparste Definitionen gelten nur für diesen Stand"""
+        stat = os.stat(file_path)
+        return (stat.st_mtime_ns, stat.st_size, FileHandler.DEFINITIONS_CACHE_VERSION)
+        
+    def _cache_file(self, file_path):
+        name = hashlib.sha1(os.path.abspath(file_path).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{name}.pkl")
+        
+    def _cached_definitions(self, file_path, key):
+        """Geparste Definitionen aus Speicher oder Festplatte, falls die Datei unverändert ist"""
+        entry = self.definitions_cache.get(os.path.abspath(file_path))
+        if entry is not None and entry[0] == key:
+            return entry[1]
+        
+        if not self.cache_dir:
+            return None
+        
+        try:
+            with open(self._cache_file(file_path), 'rb') as f:
+                cached = pickle.load(f)
+            if cached['key'] != key:
+                return None
+        except Exception:
+            return None  # Kein oder veralteter Cache → neu parsen
+        
+        self._remember_definitions(file_path, key, cached['df'])
+        return cached['df']
+        
+    def _remember_definitions(self, file_path, key, df):
+        self.definitions_cache.pop(os.path.abspath(file_path), None)
+        self.definitions_cache[os.path.abspath(file_path)] = (key, df)
+        
+        # Älteste Einträge zuerst verwerfen
+        while len(self.definitions_cache) > self.MAX_CACHED_DEFINITIONS:
+            del self.definitions_cache[next(iter(self.definitions_cache))]
+            
+    def _store_definitions(self, file_path, key, df):
+        """Merkt sich geparste Definitionen im Speicher und (falls konfiguriert) auf der Festplatte"""
+        self._remember_definitions(file_path, key, df)
+        if not self.cache_dir:
+            return
+        
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            cache_file = self._cache_file(file_path)
+            with open(cache_file + ".tmp", 'wb') as f:
+                pickle.dump({'key': key, 'df': df}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(cache_file + ".tmp", cache_file)
+        except Exception as e:
+            self.logger.log(f"Definitions-Cache konnte nicht geschrieben werden: {e}", "WARNING")
+        
+    def _validate_definitions(self, df):
+        """Prüft die Pflichtspalten, normalisiert die Spalten und entfernt Einträge ohne neuen Namen -
+        liefert (DataFrame, entfernt)"""
+        missing_cols = [col for col in REQUIRED_DEFINITION_COLUMNS if col not in df.columns]
+        if missing_cols:
+            raise Exception(f"Fehlende erforderliche Spalten: {missing_cols}")
+        
+        initial_count = len(df)
+        df = normalize_definitions(df)
+        df = df[df['new_name'].notna() & (df['new_name'] != '')]
+        return df, initial_count - len(df)
+        
+    def iter_field_definitions(self, file_path, chunk_size=50000):
+        """Liest Feld-Definitionen blockweise - Encoding/Separator werden nur einmal erkannt,
+        die Blöcke sind validiert und können sofort verarbeitet werden"""
+        if not file_path:
+            raise Exception("Keine Daten-Datei ausgewählt")
+        
+        self.logger.log(f"Lese Feld-Definitionen blockweise ({chunk_size} Zeilen)...", "INFO")
+        
+        try:
+            if file_path.endswith('.json'):
+                # JSON lässt sich nicht zeilenweise lesen → einmal laden, blockweise ausgeben
+                data, _ = read_definition_table(file_path)
+                chunks = (data.iloc[start:start + chunk_size] for start in range(0, len(data), chunk_size))
+            else:
+                dialect = sniff_definition_dialect(file_path)
+                self.logger.log(f"Erkannt: {describe_dialect(dialect)}", "INFO")
+                chunks = self._read_csv_chunks(file_path, dialect, chunk_size)
+            
+            total = 0
+            removed = 0
+            for chunk in chunks:
+                chunk, chunk_removed = self._validate_definitions(chunk)
+                total += len(chunk)
+                removed += chunk_removed
+                if len(chunk) > 0:
+                    yield chunk
+            
+            if removed:
+                self.logger.log(f"Gefiltert: {removed} leere Einträge entfernt", "WARNING")
+            self.logger.log(f"Gelesen: {total} gültige Feld-Definitionen", "SUCCESS")
+        
+        except Exception as e:
+            self.logger.log(f"Fehler beim Lesen der Feld-Definitionen: {str(e)}", "ERROR")
+            raise
+        
+    def _read_csv_chunks(self, file_path, dialect, chunk_size):
+        """CSV-Blöcke - ist die Datei nur in der Probe reines UTF-8, wird ab der ersten noch nicht
+        gelieferten Zeile mit Windows-Encoding weitergelesen (wie in read_definition_table)"""
+        consumed = 0
+        
+        while True:
+            restart_at = consumed
+            try:
+                reader = pd.read_csv(
+                    file_path,
+                    sep=dialect['separator'],
+                    encoding=dialect['encoding'],
+                    chunksize=chunk_size,
+                    skiprows=range(1, restart_at + 1) if restart_at else None,
+                    dtype={col: str for col in REQUIRED_DEFINITION_COLUMNS}
+                )
+                for chunk in reader:
+                    # Zeilennummern wie beim ununterbrochenen Lesen (für die Problemliste)
+                    chunk.index += restart_at
+                    consumed += len(chunk)
+                    yield chunk
+                return
+            
+            except UnicodeDecodeError:
+                if dialect['encoding'] != 'utf-8':
+                    raise
+                dialect['encoding'] = 'windows-1252'
+                self.logger.log(
+                    f"Kein UTF-8 ab Zeile {consumed + 2} - lese weiter als {describe_dialect(dialect)}", "WARNING"
+                )
         
     def load_field_definitions(self, file_path):
         """Lädt Feld-Definitionen mit robuster Encoding-Erkennung"""
         if not file_path:
             self.logger.log("Keine Daten-Datei ausgewählt", "ERROR")
             return None
-            
+        
         self.logger.log("Lade Feld-Definitionen...", "INFO")
         
         try:
-            encodings = ['utf-8', 'utf-16', 'windows-1252', 'latin1', 'iso-8859-1']
-            df = None
-            used_encoding = None
+            key = self._definitions_key(file_path)
+            df = self._cached_definitions(file_path, key)
+            if df is not None:
+                self.logger.log(f"Gefunden: {len(df)} gültige Feld-Definitionen (aus Cache)", "SUCCESS")
+                return df.copy()  # Aufrufer dürfen ändern, ohne den Cache zu verfälschen
             
-            for encoding in encodings:
-                try:
-                    if file_path.endswith('.json'):
-                        with open(file_path, 'r', encoding=encoding) as f:
-                            data = json.load(f)
-                        df = pd.DataFrame(data)
-                    elif file_path.endswith('.csv'):
-                        for sep in [';', ',', '\t']:
-                            try:
-                                df = pd.read_csv(file_path, sep=sep, encoding=encoding)
-                                if len(df.columns) > 1:
-                                    break
-                            except:
-                                continue
-                    else:  # TXT-Datei
-                        for sep in ['\t', ';', ',']:
-                            try:
-                                df = pd.read_csv(file_path, sep=sep, encoding=encoding)
-                                if len(df.columns) > 1:
-                                    break
-                            except:
-                                continue
-                    
-                    if df is not None and len(df) > 0:
-                        used_encoding = encoding
-                        break
-                        
-                except (UnicodeDecodeError, pd.errors.EmptyDataError):
-                    continue
-                    
-            if df is None:
-                raise Exception("Konnte Datei mit keinem Encoding/Separator lesen")
-                
-            self.logger.log(f"Daten erfolgreich geladen mit {used_encoding} Encoding", "SUCCESS")
+            df, dialect = read_definition_table(file_path)
+            self.logger.log(f"Daten erfolgreich geladen ({describe_dialect(dialect)})", "SUCCESS")
             
-            # Validiere Spalten
-            required_cols = ['original_name', 'new_name']
-            missing_cols = [col for col in required_cols if col not in df.columns]
-            if missing_cols:
-                raise Exception(f"Fehlende erforderliche Spalten: {missing_cols}")
-                
-            # Filtere gültige Einträge
-            initial_count = len(df)
-            df = df[df['new_name'].notna() & (df['new_name'].str.strip() != '')]
-            valid_count = len(df)
-            
-            if valid_count != initial_count:
-                self.logger.log(f"Gefiltert: {initial_count - valid_count} leere Einträge entfernt", "WARNING")
-                
-            self.logger.log(f"Gefunden: {valid_count} gültige Feld-Definitionen", "SUCCESS")
-            return df
+            df, removed = self._validate_definitions(df)
+            if removed:
+                self.logger.log(f"Gefiltert: {removed} leere Einträge entfernt", "WARNING")
             
+            self.logger.log(f"Gefunden: {len(df)} gültige Feld-Definitionen", "SUCCESS")
+            self._store_definitions(file_path, key, df)
+            return df.copy()
+        
         except Exception as e:
             self.logger.log(f"Fehler beim Laden der Feld-Definitionen: {str(e)}", "ERROR")
             return None
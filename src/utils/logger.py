@@ -1,10 +1,159 @@
 from datetime import datetime
+import atexit
+import multiprocessing.util
 import os
+import queue
+import threading
+import time
+
+class LogSink:
+    """Gemeinsamer Schreiber für eine Log-Datei: Nachrichten landen in einer Queue, ein Hintergrund-Thread
+    schreibt sie gebündelt (ein Schreibvorgang je Intervall statt open/close pro Nachricht)"""
+    
+    def __init__(self, log_dir, file_pattern="app_log_{day}.txt", flush_interval=0.5, max_batch=5000):
+        self.log_dir = log_dir
+        self.file_pattern = file_pattern
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.lock = threading.Lock()
+        self.pid = None
+        self.queue = None
+        self.thread = None
+        self.file = None
+        self.file_day = None
+        self.closed = False
+        
+        # Sperre könnte beim fork() gerade gehalten werden → im Kindprozess frisch anlegen
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset_after_fork)
+    
+    def _reset_after_fork(self):
+        self.lock = threading.Lock()
+        self.pid = None
+        self.closed = False
+    
+    def _ensure_started(self):
+        """Startet den Schreib-Thread - nach einem fork() im Kindprozess neu (Threads werden nicht vererbt)"""
+        if self.pid == os.getpid():
+            return
+        
+        with self.lock:
+            if self.pid == os.getpid():
+                return
+            
+            self.queue = queue.Queue()
+            self.file = None
+            self.file_day = None
+            self.thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+            self.thread.start()
+            self.pid = os.getpid()
+            
+            # Beim Beenden restliche Nachrichten schreiben - auch in Worker-Prozessen,
+            # die multiprocessing ohne atexit beendet
+            atexit.register(self.close)
+            multiprocessing.util.Finalize(None, self.close, exitpriority=100)
+    
+    def write(self, message):
+        """Reiht eine fertig formatierte Zeile ein (kehrt sofort zurück)"""
+        item = (datetime.now().strftime('%Y-%m-%d'), message)
+        
+        if self._is_closed():
+            # Schreib-Thread beendet (z.B. Log aus einem späteren atexit-Handler) → direkt schreiben,
+            # sobald er seine letzten Nachrichten geschrieben hat
+            self.thread.join(timeout=5)
+            with self.lock:
+                self._write_batch([item])
+                self._close_file()
+            return
+        
+        self._ensure_started()
+        self.queue.put(item)
+    
+    def flush(self):
+        """Wartet, bis alle eingereihten Nachrichten geschrieben sind (nach close() nichts zu tun)"""
+        if self.pid == os.getpid() and not self._is_closed():
+            self.queue.join()
+    
+    def close(self):
+        """Schreibt alle ausstehenden Nachrichten und beendet den Schreib-Thread"""
+        if self.pid != os.getpid() or self._is_closed():
+            return
+        
+        self.closed = True
+        self.queue.put(None)
+        self.thread.join(timeout=5)
+    
+    def _is_closed(self):
+        """Geschlossen oder Schreib-Thread nicht mehr aktiv (im aktuellen Prozess)"""
+        return self.pid == os.getpid() and (self.closed or not self.thread.is_alive())
+    
+    def _close_file(self):
+        if self.file is not None:
+            self.file.close()
+        self.file = None
+        self.file_day = None
+    
+    def _run(self):
+        stopping = False
+        
+        while not stopping:
+            batch = [self.queue.get()]
+            
+            # Weitere Nachrichten bis zum Ende des Intervalls sammeln
+            deadline = time.monotonic() + self.flush_interval
+            while batch[-1] is not None and len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    batch.append(self.queue.get(timeout=remaining) if remaining > 0 else self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            stopping = batch[-1] is None
+            self._write_batch([item for item in batch if item is not None])
+            
+            for _ in batch:
+                self.queue.task_done()
+        
+        self._close_file()
+    
+    def _write_batch(self, batch):
+        # Ein Schreibvorgang je Tag (um Mitternacht wechselt die Datei)
+        lines_by_day = {}
+        for day, message in batch:
+            lines_by_day.setdefault(day, []).append(f"{message}\n")
+        
+        for day, lines in lines_by_day.items():
+            try:
+                if self.file_day != day:
+                    if self.file is not None:
+                        self.file.close()
+                    os.makedirs(self.log_dir, exist_ok=True)
+                    self.file = open(os.path.join(self.log_dir, self.file_pattern.format(day=day)), "a", encoding="utf-8")
+                    self.file_day = day
+                
+                self.file.write("".join(lines))
+                self.file.flush()
+            except Exception:
+                self.file = None
+                self.file_day = None  # Ignoriere Log-Fehler, nächster Stapel öffnet die Datei neu
+
+# Ein Schreiber je Log-Datei, gemeinsam für alle Logger-Instanzen
+_sinks = {}
+_sinks_lock = threading.Lock()
+
+def get_log_sink(log_dir, file_pattern="app_log_{day}.txt"):
+    """Gemeinsamer LogSink für ein Verzeichnis und Dateimuster"""
+    with _sinks_lock:
+        sink = _sinks.get((log_dir, file_pattern))
+        if sink is None:
+            sink = _sinks[(log_dir, file_pattern)] = LogSink(log_dir, file_pattern)
+        return sink
 
 class Logger:
     def __init__(self):
         self.log_dir = "logs"
         self.ensure_log_dir()
+        self.sink = get_log_sink(self.log_dir)
     
     def ensure_log_dir(self):
         """Erstellt das Log-Verzeichnis falls es nicht existiert"""
@@ -33,10 +182,5 @@ class Logger:
         return formatted_message
     
     def write_to_file(self, message):
-        """Schreibt Logs in Datei"""
-        try:
-            log_file = os.path.join(self.log_dir, f"app_log_{datetime.now().strftime('%Y-%m-%d')}.txt")
-            with open(log_file, "a", encoding="utf-8") as f:
-                f.write(f"{message}\n")
-        except Exception:
-            pass  # Ignoriere Log- Fehler
+        """Reiht die Nachricht beim gemeinsamen Schreiber ein (geschrieben wird gebündelt im Hintergrund)"""
+        self.sink.write(message)
@@ -0,0 +1,182 @@
+"""
+Maschinenlesbares Journal aller Automatisierungsläufe (eine JSON-Zeile pro Ereignis)
+
+Auswertung über mehrere Tage:
+    python -m src.utils.run_journal --group-by field_type --since 2024-01-01
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime
+
+import pandas as pd
+
+from .logger import get_log_sink
+
+# Ablage der Journale (eine Datei pro Tag)
+JOURNAL_DIR = os.path.join("logs", "journal")
+JOURNAL_PATTERN = "journal_{day}.jsonl"
+
+# Spalten, nach denen die Auswertung gruppieren kann
+GROUP_COLUMNS = ['operation', 'backend', 'field_type', 'outcome', 'run_id', 'pdf', 'day']
+
+
+class RunJournal:
+    """Journal eines Laufs - Einträge gehen über den gemeinsamen, gepufferten Log-Schreiber auf die Platte.
+    Enthält nur einfache Attribute und kann daher an Worker-Prozesse übergeben werden"""
+
+    def __init__(self, operation, backend, pdf=None, run_id=None, journal_dir=JOURNAL_DIR):
+        self.operation = operation
+        self.backend = backend
+        self.pdf = pdf
+        self.run_id = run_id or f"{datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:6]}"
+        self.journal_dir = journal_dir
+        self.started = None
+
+    def _write(self, event, **values):
+        entry = {
+            'ts': datetime.now().isoformat(timespec='milliseconds'),
+            'event': event,
+            'run_id': self.run_id,
+            'operation': self.operation,
+            'backend': self.backend,
+            'pdf': self.pdf
+        }
+        entry.update(values)
+        get_log_sink(self.journal_dir, JOURNAL_PATTERN).write(json.dumps(entry, ensure_ascii=False, default=str))
+
+    def start(self, total=None, **values):
+        """Beginn des Laufs"""
+        self.started = time.perf_counter()
+        self._write('run_start', total=total, **values)
+
+    def record(self, field, outcome, duration, error='', field_type=None, **values):
+        """Ergebnis eines Feldes: outcome 'ok' oder 'failed', duration in Sekunden"""
+        self._write('field', field=field, field_type=field_type, outcome=outcome,
+                    duration=round(duration, 6), error=error, **values)
+
+    def finish(self, successful, failed, **values):
+        """Ende des Laufs mit Gesamtergebnis"""
+        duration = time.perf_counter() - self.started if self.started is not None else None
+        self._write('run_end', successful=successful, failed=failed,
+                    duration=round(duration, 6) if duration is not None else None, **values)
+
+
+def load_journal(journal_dir=JOURNAL_DIR, since=None, until=None, event='field'):
+    """Liest die Journale (optional nur die Tage since..until, Format JJJJ-MM-TT) als DataFrame"""
+    frames = []
+    for path in sorted(glob.glob(os.path.join(journal_dir, JOURNAL_PATTERN.format(day='*')))):
+        day = os.path.basename(path)[len('journal_'):-len('.jsonl')]
+        if (since and day < since) or (until and day > until):
+            continue
+
+        frame = pd.read_json(path, lines=True, dtype=False)
+        if not frame.empty:
+            frames.append(frame.assign(day=day))
+
+    if not frames:
+        return pd.DataFrame()
+
+    df = pd.concat(frames, ignore_index=True)
+    if event:
+        df = df[df['event'] == event]
+    if 'duration' in df.columns:
+        df['duration'] = pd.to_numeric(df['duration'], errors='coerce')
+    return df.reset_index(drop=True)
+
+
+def summarize_journal(df, group_by):
+    """Anzahl, Erfolgsquote, Dauer und Durchsatz je Gruppe"""
+    df = df.assign(ok=(df['outcome'] == 'ok').astype(int))
+    summary = df.groupby(list(group_by), dropna=False).agg(
+        fields=('outcome', 'size'),
+        ok=('ok', 'sum'),
+        total_s=('duration', 'sum'),
+        mean_s=('duration', 'mean'),
+        max_s=('duration', 'max')
+    )
+    summary['failed'] = summary['fields'] - summary['ok']
+    summary['fields_per_s'] = summary['fields'] / summary['total_s'].where(summary['total_s'] > 0)
+    return summary[['fields', 'ok', 'failed', 'total_s', 'mean_s', 'max_s', 'fields_per_s']].sort_values(
+        'total_s', ascending=False
+    )
+
+
+def summarize_steps(runs):
+    """Schrittzeiten (steps aus run_end) über mehrere Läufe: Summen exakt, p50 als Median und p95 als
+    Maximum der Läufe (Perzentile einzelner Läufe lassen sich nicht exakt zusammenführen)"""
+    rows = [
+        dict(values, run_id=run_id, step=step)
+        for run_id, steps in zip(runs['run_id'], runs.get('steps', pd.Series(dtype=object)))
+        if isinstance(steps, dict)
+        for step, values in steps.items()
+    ]
+    if not rows:
+        return pd.DataFrame()
+
+    summary = pd.DataFrame(rows).groupby('step').agg(
+        runs=('run_id', 'nunique'),
+        count=('count', 'sum'),
+        total_s=('total', 'sum'),
+        p50_s=('p50', 'median'),
+        p95_s=('p95', 'max')
+    )
+    summary['mean_s'] = summary['total_s'] / summary['count']
+    return summary[['runs', 'count', 'total_s', 'mean_s', 'p50_s', 'p95_s']].sort_values('total_s', ascending=False)
+
+
+def build_parser():
+    """Erstellt den Argument-Parser"""
+    parser = argparse.ArgumentParser(
+        prog='python -m src.utils.run_journal',
+        description='Wertet die Lauf-Journale (JSONL) über mehrere Tage aus.'
+    )
+    parser.add_argument('--dir', default=JOURNAL_DIR, help=f'Journal-Verzeichnis (Standard: {JOURNAL_DIR})')
+    parser.add_argument('--since', help='Erster Tag (JJJJ-MM-TT)')
+    parser.add_argument('--until', help='Letzter Tag (JJJJ-MM-TT)')
+    parser.add_argument('--run', help='Nur diesen Lauf auswerten (run_id)')
+    parser.add_argument('-g', '--group-by', nargs='+', choices=GROUP_COLUMNS, default=['operation', 'field_type'],
+                        help='Gruppierung (Standard: operation field_type)')
+    parser.add_argument('--slowest', type=int, default=0, help='Zusätzlich die N langsamsten Felder ausgeben')
+    parser.add_argument('--steps', action='store_true',
+                        help='Zusätzlich die Schrittzeiten der GUI-Automatisierung (p50/p95 je Schritt) ausgeben')
+    return parser
+
+
+def main(argv=None):
+    """Einstiegspunkt der Journal-Auswertung"""
+    args = build_parser().parse_args(argv)
+
+    df = load_journal(args.dir, args.since, args.until)
+    if args.run and not df.empty:
+        df = df[df['run_id'] == args.run]
+    if df.empty:
+        print("❌ Keine Journal-Einträge gefunden")
+        return 1
+
+    print(f"📋 {len(df)} Felder aus {df['run_id'].nunique()} Läufen ({df['day'].min()} bis {df['day'].max()})")
+    with pd.option_context('display.width', 200, 'display.max_rows', 200, 'display.float_format', '{:.3f}'.format):
+        print(summarize_journal(df, args.group_by).to_string())
+
+        if args.slowest > 0:
+            columns = ['day', 'run_id', 'field', 'field_type', 'outcome', 'duration', 'error']
+            print(f"\n🐢 Langsamste {args.slowest} Felder:")
+            print(df.nlargest(args.slowest, 'duration')[columns].to_string(index=False))
+
+        if args.steps:
+            runs = load_journal(args.dir, args.since, args.until, event='run_end')
+            runs = runs[runs['run_id'].isin(df['run_id'])] if not runs.empty else runs
+            steps = summarize_steps(runs) if not runs.empty else pd.DataFrame()
+            print("\n⏱️ Schrittzeiten:")
+            print(steps.to_string() if not steps.empty else "Keine Schrittzeiten erfasst")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
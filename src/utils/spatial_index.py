@@ -0,0 +1,122 @@
+import math
+
+class SpatialIndex:
+    """R-Baum (Sort-Tile-Recursive gepackt) für achsenparallele Rechtecke - Punkt- und Bereichsabfragen in O(log n)"""
+
+    def __init__(self, items=(), node_capacity=16):
+        # items: Iterable aus (x0, y0, x1, y1, payload)
+        self.node_capacity = node_capacity
+        self.items = [self._normalize(item) for item in items]
+        # Nach build() eingefügte Einträge - werden linear geprüft, bis der Baum neu gepackt wird
+        self.pending = []
+        self.root = None
+        self.build()
+
+    @staticmethod
+    def _normalize(item):
+        x0, y0, x1, y1, payload = item
+        return (min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1), payload)
+
+    def __len__(self):
+        return len(self.items)
+
+    def build(self):
+        """Baut den Baum aus allen Einträgen neu auf (Blätter und Knoten nach STR gruppiert)"""
+        self.pending = []
+        if not self.items:
+            self.root = None
+            return
+        
+        # Knoten: (x0, y0, x1, y1, Kinder, ist_blatt)
+        level = self._pack(self.items, leaf=True)
+        while len(level) > 1:
+            level = self._pack(level, leaf=False)
+        self.root = level[0]
+
+    def insert(self, x0, y0, x1, y1, payload=None):
+        """Fügt ein Rechteck hinzu - der Baum wird gebündelt neu gepackt, sobald genug Einträge anstehen"""
+        entry = self._normalize((x0, y0, x1, y1, payload))
+        self.items.append(entry)
+        self.pending.append(entry)
+        
+        if len(self.pending) > max(self.node_capacity * 4, math.isqrt(len(self.items))):
+            self.build()
+
+    def _pack(self, entries, leaf):
+        """Gruppiert Einträge einer Ebene zu Knoten: Streifen nach x-Mitte, darin Gruppen nach y-Mitte"""
+        capacity = self.node_capacity
+        node_count = math.ceil(len(entries) / capacity)
+        slice_count = math.ceil(math.sqrt(node_count))
+        slice_size = slice_count * capacity
+        
+        by_x = sorted(entries, key=lambda e: e[0] + e[2])
+        nodes = []
+        for start in range(0, len(by_x), slice_size):
+            vertical_slice = sorted(by_x[start:start + slice_size], key=lambda e: e[1] + e[3])
+            for group_start in range(0, len(vertical_slice), capacity):
+                children = vertical_slice[group_start:group_start + capacity]
+                nodes.append((
+                    min(c[0] for c in children),
+                    min(c[1] for c in children),
+                    max(c[2] for c in children),
+                    max(c[3] for c in children),
+                    children,
+                    leaf
+                ))
+        return nodes
+
+    def query_rect(self, x0, y0, x1, y1, touching=False):
+        """Liefert alle Einträge, die das Rechteck überlappen (berührende Kanten nur mit touching=True)"""
+        x0, x1 = min(x0, x1), max(x0, x1)
+        y0, y1 = min(y0, y1), max(y0, y1)
+        
+        if touching:
+            def hit(e):
+                return e[0] <= x1 and x0 <= e[2] and e[1] <= y1 and y0 <= e[3]
+        else:
+            def hit(e):
+                return e[0] < x1 and x0 < e[2] and e[1] < y1 and y0 < e[3]
+        
+        results = [entry for entry in self.pending if hit(entry)]
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node = stack.pop()
+            if not hit(node):
+                continue
+            if node[5]:
+                results.extend(entry for entry in node[4] if hit(entry))
+            else:
+                stack.extend(node[4])
+        return results
+
+    def query_point(self, x, y):
+        """Liefert alle Einträge, die den Punkt enthalten - das kleinste (innerste) Rechteck zuerst"""
+        results = self.query_rect(x, y, x, y, touching=True)
+        results.sort(key=lambda e: (e[2] - e[0]) * (e[3] - e[1]))
+        return results
+
+    def find_free_spot(self, x0, y0, x1, y1, bounds=None, gap=2.0, max_steps=1000):
+        """Sucht ab (x0, y0) die nächste überlappungsfreie Position gleicher Größe: nach unten an den
+        Hindernissen vorbei, am unteren Rand von bounds (x0, y0, x1, y1) weiter in der nächsten Spalte"""
+        width = x1 - x0
+        height = y1 - y0
+        start_y = y0
+        
+        for _ in range(max_steps):
+            if bounds is not None and x1 > bounds[2]:
+                return None
+            
+            if bounds is not None and y1 > bounds[3]:
+                x0, x1 = x0 + width + gap, x1 + width + gap
+                y0, y1 = start_y, start_y + height
+                continue
+            
+            blockers = self.query_rect(x0, y0, x1, y1)
+            if not blockers:
+                return x0, y0, x1, y1
+            
+            # Direkt unter das tiefste Hindernis springen statt in festen Schritten zu suchen
+            y0 = max(blocker[3] for blocker in blockers) + gap
+            y1 = y0 + height
+        
+        return None
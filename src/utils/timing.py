@@ -0,0 +1,88 @@
+from contextlib import contextmanager
+import math
+import threading
+import time
+
+class DurationHistogram:
+    """Histogramm mit logarithmischen Klassen (je ~5 % breit) - konstanter Speicher, Perzentile auf ~5 % genau"""
+
+    MIN_SECONDS = 0.0005
+    RATIO = 1.05
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        index = 0 if seconds <= self.MIN_SECONDS else int(math.log(seconds / self.MIN_SECONDS, self.RATIO)) + 1
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, fraction):
+        """Obergrenze der Klasse, in die das Perzentil fällt (nie größer als das gemessene Maximum)"""
+        if not self.count:
+            return 0.0
+
+        rank = fraction * self.count
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(self.MIN_SECONDS * self.RATIO ** index, self.max)
+        return self.max
+
+class StepTimer:
+    """Sammelt Dauern benannter Schritte (Spans) threadsicher in Histogrammen"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {}
+
+    @contextmanager
+    def span(self, step):
+        """Misst die Dauer des umschlossenen Blocks - auch wenn er mit einer Exception endet"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(step, time.perf_counter() - start)
+
+    def record(self, step, seconds):
+        with self.lock:
+            histogram = self.histograms.get(step)
+            if histogram is None:
+                histogram = self.histograms[step] = DurationHistogram()
+            histogram.add(seconds)
+
+    def reset(self):
+        with self.lock:
+            self.histograms = {}
+
+    def snapshot(self):
+        """Kennzahlen je Schritt: Anzahl, Summe, p50, p95 und Maximum in Sekunden"""
+        with self.lock:
+            return {
+                step: {
+                    'count': histogram.count,
+                    'total': round(histogram.total, 4),
+                    'p50': round(histogram.percentile(0.5), 4),
+                    'p95': round(histogram.percentile(0.95), 4),
+                    'max': round(histogram.max, 4)
+                }
+                for step, histogram in self.histograms.items()
+            }
+
+    def summary_lines(self, limit=None):
+        """Schritte nach Gesamtzeit sortiert als Text (für Statusanzeige und Log)"""
+        stats = sorted(self.snapshot().items(), key=lambda item: item[1]['total'], reverse=True)
+        return [
+            f"{step}: p50 {values['p50']:.2f} s · p95 {values['p95']:.2f} s (n={values['count']})"
+            for step, values in stats[:limit]
+        ]
+
+# Gemeinsame Messung der GUI-Automatisierung (FieldOperations, Statusanzeige, Journal)
+step_timer = StepTimer()
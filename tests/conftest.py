@@ -0,0 +1,17 @@
+import os
+
+import pytest
+
+from src.utils import logger
+
+
+@pytest.fixture(autouse=True, scope="session")
+def work_dir(tmp_path_factory):
+    """Logs, Journale und Einstellungen landen relativ zum Arbeitsverzeichnis - Tests laufen in einem
+    temporären Verzeichnis, damit der Checkout sauber bleibt (auch für den Hintergrund-Schreiber)"""
+    previous = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("work"))
+    yield
+    for sink in list(logger._sinks.values()):
+        sink.flush()
+    os.chdir(previous)
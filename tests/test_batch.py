@@ -0,0 +1,155 @@
+import os
+
+import fitz
+import pytest
+
+from src import batch
+
+
+def make_form(path, names=("vorname", "nachname")):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    doc = fitz.open()
+    page = doc.new_page()
+    for index, name in enumerate(names):
+        widget = fitz.Widget()
+        widget.field_type = fitz.PDF_WIDGET_TYPE_TEXT
+        widget.field_name = name
+        widget.rect = fitz.Rect(72, 72 + index * 40, 272, 97 + index * 40)
+        page.add_widget(widget)
+    doc.save(path)
+    doc.close()
+
+
+def field_names(path):
+    with fitz.open(path) as doc:
+        return sorted(widget.field_name for page in doc for widget in page.widgets())
+
+
+@pytest.fixture
+def rename_csv(tmp_path):
+    path = tmp_path / "felder.csv"
+    path.write_text("original_name;new_name\nvorname;first_name\nnachname;last_name\n", encoding="utf-8")
+    return str(path)
+
+
+def test_collect_pdfs_recursive(tmp_path):
+    make_form(str(tmp_path / "in" / "a.pdf"))
+    make_form(str(tmp_path / "in" / "sub" / "b.pdf"))
+    (tmp_path / "in" / "notes.txt").write_text("x")
+
+    assert [os.path.basename(p) for p in batch.collect_pdfs([str(tmp_path / "in")])] == ["a.pdf"]
+    assert len(batch.collect_pdfs([str(tmp_path / "in")], recursive=True)) == 2
+
+
+def test_output_paths_keep_subdirectories(tmp_path):
+    files = [str(tmp_path / "in" / "a.pdf"), str(tmp_path / "in" / "sub" / "a.pdf")]
+    targets = batch.output_paths(files, "out")
+
+    assert targets[files[0]] == os.path.join("out", "a.pdf")
+    assert targets[files[1]] == os.path.join("out", "sub", "a.pdf")
+
+
+@pytest.mark.parametrize("workers", ["1", "2"])
+def test_same_file_names_in_subdirectories_do_not_overwrite(tmp_path, rename_csv, workers):
+    make_form(str(tmp_path / "in" / "a.pdf"))
+    make_form(str(tmp_path / "in" / "sub" / "a.pdf"), names=("vorname", "ort"))
+    out = tmp_path / "out"
+
+    code = batch.main([str(tmp_path / "in"), "-r", "-d", rename_csv, "--output-dir", str(out), "-w", workers])
+
+    assert code == 1  # zweite Datei hat kein Feld "nachname"
+    assert field_names(out / "a.pdf") == ["first_name", "last_name"]
+    assert field_names(out / "sub" / "a.pdf") == ["first_name", "ort"]
+    # Originale unverändert
+    assert field_names(tmp_path / "in" / "a.pdf") == ["nachname", "vorname"]
+
+
+def test_rename_in_place_writes_summary(tmp_path, rename_csv):
+    make_form(str(tmp_path / "a.pdf"))
+
+    summary_path = tmp_path / "summary.csv"
+    code = batch.main([str(tmp_path / "a.pdf"), "-d", rename_csv, "--chunk-size", "0", "--summary", str(summary_path)])
+
+    assert code == 0
+    assert field_names(tmp_path / "a.pdf") == ["first_name", "last_name"]
+    summary = summary_path.read_text(encoding="utf-8").splitlines()
+    assert summary[0] == ";".join(batch.SUMMARY_COLUMNS)
+    assert ";OK;2;0;" in summary[1]
+
+
+def test_missing_inputs_return_error(tmp_path, rename_csv):
+    assert batch.main([str(tmp_path / "leer"), "-d", rename_csv]) == 2
+
+
+@pytest.mark.parametrize("chunk_size", ["0", "2"])
+def test_invalid_rows_are_skipped_when_streaming_and_loading(tmp_path, chunk_size):
+    make_form(str(tmp_path / "a.pdf"), names=())
+    definitions = tmp_path / "neu.csv"
+    definitions.write_text(
+        "original_name;new_name;type;page;x;y\n"
+        ";feld_1;Textfeld;1;72;300\n"
+        ";feld_2;Zauberfeld;1;72;340\n"
+        ";feld_3;Textfeld;1;abc;380\n"
+        ";feld..4;Textfeld;1;72;420\n"
+        ";feld_5;Checkbox;1;72;460\n",
+        encoding="utf-8"
+    )
+
+    code = batch.main([str(tmp_path / "a.pdf"), "-d", str(definitions), "--operation", "create",
+                       "--chunk-size", chunk_size, "--summary", str(tmp_path / "summary.csv")])
+
+    assert code == 0
+    assert field_names(tmp_path / "a.pdf") == ["feld_1", "feld_5"]
+
+
+@pytest.fixture
+def create_csv(tmp_path):
+    path = tmp_path / "neu.csv"
+    path.write_text(
+        "original_name;new_name;type;page;x;y\n"
+        ";vorname;Textfeld;1;300;72\n"
+        ";neu;Textfeld;1;300;112\n",
+        encoding="utf-8"
+    )
+    return str(path)
+
+
+@pytest.mark.parametrize("chunk_size", ["0", "50"])
+def test_existing_names_are_skipped_for_single_pdf(tmp_path, create_csv, chunk_size):
+    make_form(str(tmp_path / "a.pdf"))
+
+    code = batch.main([str(tmp_path / "a.pdf"), "-d", create_csv, "--operation", "create",
+                       "--chunk-size", chunk_size, "--summary", str(tmp_path / "summary.csv")])
+
+    assert code == 0
+    assert field_names(tmp_path / "a.pdf") == ["nachname", "neu", "vorname"]
+
+
+def test_existing_names_fail_per_document(tmp_path, create_csv):
+    make_form(str(tmp_path / "in" / "a.pdf"))
+    make_form(str(tmp_path / "in" / "b.pdf"), names=("x",))
+
+    code = batch.main([str(tmp_path / "in"), "-d", create_csv, "--operation", "create",
+                       "--summary", str(tmp_path / "summary.csv")])
+
+    assert code == 1
+    assert field_names(tmp_path / "in" / "a.pdf") == ["nachname", "neu", "vorname"]
+    assert field_names(tmp_path / "in" / "b.pdf") == ["neu", "vorname", "x"]
+    summary = (tmp_path / "summary.csv").read_text(encoding="utf-8")
+    assert summary.count("PARTIAL") == 1
+
+
+@pytest.mark.parametrize("chunk_size", ["0", "50"])
+@pytest.mark.parametrize("content", [None, b"name;neu\na;b\n"])
+def test_unreadable_definitions_fail_before_any_document(tmp_path, chunk_size, content):
+    make_form(str(tmp_path / "a.pdf"))
+    definitions = tmp_path / "felder.csv"
+    if content is not None:
+        definitions.write_bytes(content)
+
+    code = batch.main([str(tmp_path / "a.pdf"), "-d", str(definitions), "--output-dir", str(tmp_path / "out"),
+                       "--chunk-size", chunk_size, "--summary", str(tmp_path / "summary.csv")])
+
+    assert code == 2
+    assert not (tmp_path / "out").exists()
+    assert not (tmp_path / "summary.csv").exists()
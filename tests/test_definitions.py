@@ -0,0 +1,137 @@
+import pandas as pd
+import pytest
+
+from src.utils.definitions import (
+    FieldDefinition,
+    iter_definition_records,
+    normalize_definitions,
+    summarize_issues,
+    validate_definitions,
+)
+
+
+def definitions(**columns):
+    return normalize_definitions(pd.DataFrame(columns))
+
+
+def problems(issues):
+    return list(zip(issues["row"], issues["column"], issues["problem"]))
+
+
+def test_normalize_text_and_types():
+    df = definitions(
+        original_name=[" a ", None],
+        new_name=["Café", "b"],
+        type=["Checkbox", None],
+        page=["2", "1.0"],
+        x=["10.5", 3]
+    )
+
+    assert df["original_name"].tolist()[0] == "a"
+    assert pd.isna(df["original_name"].tolist()[1])
+    assert df["new_name"].tolist() == ["Café", "b"]
+    assert df["type"].dtype == "category"
+    assert df["type"].tolist() == ["Checkbox", "Textfeld"]
+    assert str(df["page"].dtype) == "Int16"
+    assert df["page"].tolist() == [2, 1]
+    assert df["x"].dtype == "float32"
+
+
+def test_normalize_does_not_modify_input():
+    raw = pd.DataFrame({"original_name": [" a "], "new_name": ["b"]})
+    normalize_definitions(raw)
+    assert raw["original_name"].tolist() == [" a "]
+
+
+def test_validate_reports_problems_with_file_rows():
+    df = definitions(
+        original_name=["a", "b", "c", "", "e"],
+        new_name=["x", "x", "bad..name", "y", "z"],
+        type=["Textfeld", "Textfeld", "Textfeld", "Textfeld", "Unsinn"],
+        x=["1", "2", "drei", "4", "5"]
+    )
+
+    issues = validate_definitions(df, known_types=["Textfeld"])
+    assert problems(issues) == [
+        (2, "new_name", "Neuer Name mehrfach vergeben"),
+        (3, "new_name", "Neuer Name mehrfach vergeben"),
+        (4, "new_name", "Ungültige Zeichen im Feldnamen"),
+        (4, "x", "Keine gültige Zahl"),
+        (5, "original_name", "Originalfeld nicht vorhanden"),
+        (6, "type", "Unbekannter Feldtyp"),
+    ]
+    assert issues.loc[issues["column"] == "x", "value"].tolist() == ["drei"]
+
+
+def test_validate_known_fields_allows_chains():
+    df = definitions(original_name=["a", "b", "fehlt"], new_name=["b", "c", "d"])
+
+    issues = validate_definitions(df, known_fields=["a"])
+    assert problems(issues) == [(4, "original_name", "Originalfeld nicht vorhanden")]
+
+
+def test_validate_create_ignores_original_names():
+    df = definitions(original_name=[None], new_name=["neu"])
+    assert validate_definitions(df, operation="create").empty
+
+
+def test_validate_skips_filtered_rows():
+    df = definitions(original_name=["a", "b"], new_name=["x", "y"], x=["eins", "2"])
+    assert validate_definitions(df.iloc[1:]).empty
+
+
+def test_summarize_issues():
+    df = definitions(original_name=["a", "b", "c"], new_name=["x", "x", "x"])
+    lines = summarize_issues(validate_definitions(df), limit=2)
+
+    assert lines[0] == "Neuer Name mehrfach vergeben: 3"
+    assert lines[1] == "  Zeile 2, new_name = 'x': Neuer Name mehrfach vergeben"
+    assert lines[-1] == "  ... und 1 weitere"
+
+
+def test_iter_definition_records():
+    df = definitions(new_name=["a", "b"], page=["2", None], x=["1.5", None])
+    records = list(iter_definition_records(df))
+
+    assert [record.new_name for record in records] == ["a", "b"]
+    assert records[0]["page"] == 2
+    assert records[0].get("x") == 1.5
+    assert records[1]["page"] is None
+    assert records[1].get("x", 7) == 7
+    assert records[1].get("original_name", "") == ""
+
+
+def test_field_definition_access():
+    record = FieldDefinition._make(["a", "b"] + [None] * (len(FieldDefinition._fields) - 2))
+
+    assert record["original_name"] == "a"
+    assert record[1] == "b"
+    assert record.get("unbekannt", "x") == "x"
+    with pytest.raises(KeyError):
+        record["unbekannt"]
+    assert not hasattr(record, "__dict__")
+
+
+def test_validate_create_reports_existing_fields():
+    df = definitions(new_name=["neu", "name", "gruppe"], type=["Textfeld", "Textfeld", "Optionsfeld"])
+
+    issues = validate_definitions(df, operation="create", known_fields=["name", "gruppe"])
+    assert problems(issues) == [(3, "new_name", "Feld existiert bereits")]
+
+
+def test_validate_create_allows_radio_groups():
+    df = definitions(new_name=["wahl", "wahl", "mix", "mix"],
+                     type=["Optionsfeld", "Radio Button", "Optionsfeld", "Textfeld"])
+
+    issues = validate_definitions(df, operation="create")
+    assert problems(issues) == [(4, "new_name", "Neuer Name mehrfach vergeben"),
+                                (5, "new_name", "Neuer Name mehrfach vergeben")]
+
+
+def test_records_carry_screen_positions():
+    df = definitions(new_name=["a", "b"], screen_x=["640", None], screen_y=["480.4", None])
+    assert str(df["screen_x"].dtype) == "Int32"
+
+    records = list(iter_definition_records(df))
+    assert (records[0].get("screen_x"), records[0].get("screen_y")) == (640, 480)
+    assert records[1].get("screen_x") is None
@@ -0,0 +1,134 @@
+import os
+
+import pandas as pd
+import pytest
+
+from src.utils import file_handler
+from src.utils.file_handler import FileHandler, read_definition_table, sniff_definition_dialect
+
+
+def write(path, text, encoding="utf-8"):
+    path.write_bytes(text.encode(encoding))
+    return str(path)
+
+
+def late_cp1252_file(tmp_path, ascii_rows=20000):
+    # Probe (64 KB) ist reines ASCII, der Umlaut steht erst am Ende
+    lines = ["original_name;new_name"] + [f"alt_{i};neu_{i}" for i in range(ascii_rows)] + ["alt_ä;neu_ö"]
+    return write(tmp_path / "spaet.csv", "\n".join(lines) + "\n", "cp1252")
+
+
+@pytest.mark.parametrize("separator", [";", ",", "\t"])
+def test_sniff_separator(tmp_path, separator):
+    path = write(tmp_path / "d.csv", f"original_name{separator}new_name\na{separator}b\n")
+    assert sniff_definition_dialect(path)["separator"] == separator
+
+
+@pytest.mark.parametrize("encoding, expected", [
+    ("utf-8", "utf-8"),
+    ("utf-8-sig", "utf-8-sig"),
+    ("cp1252", "windows-1252"),
+    ("utf-16", "utf-16"),
+])
+def test_sniff_encoding(tmp_path, encoding, expected):
+    path = write(tmp_path / "d.csv", "original_name;new_name\nstraße;straße_neu\n", encoding)
+    dialect = sniff_definition_dialect(path)
+    assert dialect["encoding"] == expected
+
+    df, _ = read_definition_table(path)
+    assert df.loc[0, "original_name"] == "straße"
+
+
+def test_read_definition_table_falls_back_after_sample(tmp_path):
+    df, dialect = read_definition_table(late_cp1252_file(tmp_path))
+    assert dialect["encoding"] == "windows-1252"
+    assert df.iloc[-1].tolist() == ["alt_ä", "neu_ö"]
+
+
+@pytest.mark.parametrize("chunk_size", [1000, 50000])
+def test_stream_switches_to_cp1252_after_sample(tmp_path, chunk_size):
+    path = late_cp1252_file(tmp_path)
+
+    chunks = list(FileHandler().iter_field_definitions(path, chunk_size))
+    streamed = pd.concat(chunks)
+
+    loaded = FileHandler().load_field_definitions(path)
+    assert len(streamed) == len(loaded) == 20001
+    assert streamed["new_name"].tolist() == loaded["new_name"].tolist()
+    assert streamed.index.tolist() == list(range(20001))
+
+
+def test_stream_matches_load_in_chunks(tmp_path):
+    lines = ["original_name;new_name"] + [f"a{i};{'' if i % 10 == 0 else f'b{i}'}" for i in range(95)]
+    path = write(tmp_path / "d.csv", "\n".join(lines) + "\n")
+
+    chunks = list(FileHandler().iter_field_definitions(path, chunk_size=20))
+    assert [len(chunk) for chunk in chunks] == [18, 18, 18, 18, 13]
+    assert pd.concat(chunks)["new_name"].tolist() == FileHandler().load_field_definitions(path)["new_name"].tolist()
+
+
+def test_missing_required_column(tmp_path):
+    path = write(tmp_path / "d.csv", "name;new_name\na;b\n")
+    assert FileHandler().load_field_definitions(path) is None
+    with pytest.raises(Exception):
+        list(FileHandler().iter_field_definitions(path))
+
+
+@pytest.mark.parametrize("use_disk", [False, True])
+def test_cached_definitions_are_copies(tmp_path, use_disk):
+    path = write(tmp_path / "d.csv", "original_name;new_name\na;b\nc;d\n")
+    handler = FileHandler(cache_dir=str(tmp_path / "cache"))
+
+    first = handler.load_field_definitions(path)
+    first.loc[first.index[0], "new_name"] = "geändert"
+    first.drop(first.index[1], inplace=True)
+
+    if use_disk:
+        handler = FileHandler(cache_dir=str(tmp_path / "cache"))
+    second = handler.load_field_definitions(path)
+    second.loc[second.index[0], "new_name"] = "auch geändert"
+
+    assert handler.load_field_definitions(path)["new_name"].tolist() == ["b", "d"]
+
+
+def test_cache_is_invalidated_when_file_changes(tmp_path):
+    path = write(tmp_path / "d.csv", "original_name;new_name\na;b\n")
+    handler = FileHandler()
+    assert handler.load_field_definitions(path)["new_name"].tolist() == ["b"]
+
+    write(tmp_path / "d.csv", "original_name;new_name\na;neu\nc;d\n")
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10**9))
+    assert handler.load_field_definitions(path)["new_name"].tolist() == ["neu", "d"]
+
+
+def test_disk_cache_skips_parsing(tmp_path, monkeypatch):
+    path = write(tmp_path / "d.csv", "original_name;new_name\na;b\n")
+    FileHandler(cache_dir=str(tmp_path / "cache")).load_field_definitions(path)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Datei wurde erneut geparst")
+
+    monkeypatch.setattr(file_handler, "read_definition_table", fail)
+    df = FileHandler(cache_dir=str(tmp_path / "cache")).load_field_definitions(path)
+    assert df["new_name"].tolist() == ["b"]
+
+
+def test_disk_cache_of_other_version_is_ignored(tmp_path, monkeypatch):
+    path = write(tmp_path / "d.csv", "original_name;new_name\na;b\n")
+    FileHandler(cache_dir=str(tmp_path / "cache")).load_field_definitions(path)
+
+    monkeypatch.setattr(FileHandler, "DEFINITIONS_CACHE_VERSION", FileHandler.DEFINITIONS_CACHE_VERSION + 1)
+    handler = FileHandler(cache_dir=str(tmp_path / "cache"))
+    assert handler._cached_definitions(path, handler._definitions_key(path)) is None
+
+
+def test_memory_cache_is_bounded(tmp_path):
+    handler = FileHandler()
+    paths = [write(tmp_path / f"d{i}.csv", f"original_name;new_name\na;b{i}\n")
+             for i in range(FileHandler.MAX_CACHED_DEFINITIONS + 2)]
+    for path in paths:
+        handler.load_field_definitions(path)
+
+    assert len(handler.definitions_cache) == FileHandler.MAX_CACHED_DEFINITIONS
+    assert os.path.abspath(paths[0]) not in handler.definitions_cache
+    assert os.path.abspath(paths[-1]) in handler.definitions_cache
@@ -0,0 +1,60 @@
+import os
+import threading
+
+from src.utils.logger import LogSink
+
+
+def read_log(log_dir):
+    text = ""
+    for name in sorted(os.listdir(log_dir)):
+        with open(os.path.join(log_dir, name), encoding="utf-8") as handle:
+            text += handle.read()
+    return text
+
+
+def test_write_and_flush(tmp_path):
+    sink = LogSink(str(tmp_path), flush_interval=0.01)
+    for index in range(100):
+        sink.write(f"line {index}")
+    sink.flush()
+
+    assert read_log(tmp_path).splitlines() == [f"line {index}" for index in range(100)]
+    sink.close()
+
+
+def test_close_writes_pending_messages(tmp_path):
+    sink = LogSink(str(tmp_path), flush_interval=5)
+    sink.write("pending")
+    sink.close()
+
+    assert read_log(tmp_path) == "pending\n"
+
+
+def test_write_after_close_goes_to_file(tmp_path):
+    sink = LogSink(str(tmp_path), flush_interval=0.01)
+    sink.write("before")
+    sink.close()
+    sink.write("after")
+
+    assert read_log(tmp_path).splitlines() == ["before", "after"]
+
+
+def test_flush_after_close_returns(tmp_path):
+    sink = LogSink(str(tmp_path), flush_interval=0.01)
+    sink.write("before")
+    sink.close()
+    sink.write("after")
+
+    flusher = threading.Thread(target=sink.flush, daemon=True)
+    flusher.start()
+    flusher.join(timeout=2)
+    assert not flusher.is_alive()
+
+
+def test_close_twice(tmp_path):
+    sink = LogSink(str(tmp_path), flush_interval=0.01)
+    sink.write("once")
+    sink.close()
+    sink.close()
+
+    assert read_log(tmp_path) == "once\n"
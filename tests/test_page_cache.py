@@ -0,0 +1,79 @@
+import os
+
+import fitz
+from PIL import Image
+
+from CTkPDFViewer.page_cache import PageCache
+
+
+def make_pdf(path, pages=3):
+    doc = fitz.open()
+    for number in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Seite {number + 1}")
+    doc.save(path)
+    doc.close()
+
+
+class CountingRenderer:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, page, size):
+        self.calls += 1
+        return Image.new("RGB", (100, 140))
+
+
+def render_all(cache, path, renderer, size=1.0):
+    mtime = PageCache.file_mtime(path)
+    with fitz.open(path) as doc:
+        for page in doc:
+            cache.get_page_image(path, mtime, page, size, renderer)
+
+
+def test_unchanged_pages_are_reused_after_repeated_edits(tmp_path):
+    path = str(tmp_path / "doc.pdf")
+    make_pdf(path)
+    cache = PageCache()
+    renderer = CountingRenderer()
+
+    render_all(cache, path, renderer)
+    assert renderer.calls == 3
+
+    for bump in range(1, 4):
+        stat = os.stat(path)
+        os.utime(path, (stat.st_atime, stat.st_mtime + bump))
+        render_all(cache, path, renderer)
+        assert renderer.calls == 3
+
+    # fingerprints stay keyed by render size, not by byte count
+    assert {key[2] for key in cache.fingerprints} == {1.0}
+    assert len(cache.fingerprints) == 3
+
+
+def test_changed_page_is_rendered_again(tmp_path):
+    path = str(tmp_path / "doc.pdf")
+    make_pdf(path)
+    cache = PageCache()
+    renderer = CountingRenderer()
+    render_all(cache, path, renderer)
+
+    with fitz.open(path) as doc:
+        doc[1].insert_text((72, 200), "geändert")
+        doc.saveIncr()
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 1))
+
+    render_all(cache, path, renderer)
+    assert renderer.calls == 4
+
+
+def test_eviction_keeps_memory_below_cap():
+    cache = PageCache(max_bytes=100 * 140 * 3 * 2)
+    for number in range(5):
+        cache.put(("a.pdf", 0.0, number, 1.0), Image.new("RGB", (100, 140)))
+
+    assert cache.current_bytes <= cache.max_bytes
+    assert len(cache.entries) == 2
+    assert cache.get(("a.pdf", 0.0, 0, 1.0)) is None
+    assert cache.get(("a.pdf", 0.0, 4, 1.0)) is not None
@@ -0,0 +1,221 @@
+import fitz
+import pytest
+
+from src.automation.pdf_field_engine import PdfFieldEngine
+
+
+def add_text_widget(page, name, top):
+    widget = fitz.Widget()
+    widget.field_type = fitz.PDF_WIDGET_TYPE_TEXT
+    widget.field_name = name
+    widget.rect = fitz.Rect(72, top, 272, top + 25)
+    return page.add_widget(widget).xref
+
+
+def make_hierarchical_form(path):
+    """Formular mit Eltern-Feld 'addr' (Kinder street, city) und einem Feld 'name' auf oberster Ebene"""
+    doc = fitz.open()
+    page = doc.new_page()
+    street = add_text_widget(page, "street", 72)
+    city = add_text_widget(page, "city", 112)
+    name = add_text_widget(page, "name", 152)
+
+    parent = doc.get_new_xref()
+    doc.update_object(parent, f"<< /T (addr) /Kids [{street} 0 R {city} 0 R] >>")
+    for kid in (street, city):
+        doc.xref_set_key(kid, "Parent", f"{parent} 0 R")
+    doc.xref_set_key(doc.pdf_catalog(), "AcroForm/Fields", f"[{parent} 0 R {name} 0 R]")
+    doc.save(path)
+    doc.close()
+
+
+@pytest.fixture
+def engine(tmp_path):
+    path = str(tmp_path / "form.pdf")
+    make_hierarchical_form(path)
+    engine = PdfFieldEngine()
+    assert engine.open_pdf(path)
+    yield engine
+    engine.close()
+
+
+def saved_names(engine):
+    assert engine.save()
+    with fitz.open(engine.pdf_path) as doc:
+        return sorted(widget.field_name for page in doc for widget in page.widgets())
+
+
+def test_index_uses_qualified_names(engine):
+    assert sorted(engine.list_fields()) == ["addr.city", "addr.street", "name"]
+
+
+@pytest.mark.parametrize("new_name", ["strasse", "addr.strasse"])
+def test_rename_child_keeps_parent(engine, new_name):
+    assert engine.rename_field("addr.street", new_name)
+
+    assert sorted(engine.list_fields()) == ["addr.city", "addr.strasse", "name"]
+    assert saved_names(engine) == ["addr.city", "addr.strasse", "name"]
+
+
+def test_rename_chain_uses_qualified_names(engine):
+    assert engine.rename_field("addr.street", "strasse")
+    assert engine.rename_field("addr.strasse", "weg")
+    assert saved_names(engine) == ["addr.city", "addr.weg", "name"]
+
+
+def test_rename_to_other_parent_is_rejected(engine):
+    with pytest.raises(Exception):
+        engine.rename_field("addr.street", "other.street")
+    assert "addr.street" in engine.list_fields()
+
+
+def test_rename_to_existing_name_is_rejected(engine):
+    with pytest.raises(Exception):
+        engine.rename_field("addr.street", "city")
+    with pytest.raises(Exception):
+        engine.rename_field("name", "addr.city")
+
+    assert sorted(engine.list_fields()) == ["addr.city", "addr.street", "name"]
+    assert len(engine.field_index["addr.city"]) == 1
+
+
+def test_rename_missing_field(engine):
+    assert not engine.rename_field("gibt_es_nicht", "x")
+
+
+@pytest.fixture
+def blank_engine(tmp_path):
+    path = str(tmp_path / "blank.pdf")
+    doc = fitz.open()
+    doc.new_page()
+    doc.save(path)
+    doc.close()
+
+    engine = PdfFieldEngine()
+    assert engine.open_pdf(path)
+    yield engine
+    engine.close()
+
+
+def add_radio(engine, name, top, label=""):
+    return engine.create_field(1, fitz.Rect(72, top, 87, top + 15), "Optionsfeld", name, label)
+
+
+def test_radio_buttons_share_one_group(blank_engine):
+    assert add_radio(blank_engine, "choice", 72, "Auswahl")
+    assert add_radio(blank_engine, "choice", 112)
+    assert blank_engine.list_fields() == ["choice"]
+    assert blank_engine.save()
+
+    with fitz.open(blank_engine.pdf_path) as doc:
+        page = doc[0]
+        widgets = list(page.widgets())
+        assert [widget.field_type for widget in widgets] == [fitz.PDF_WIDGET_TYPE_RADIOBUTTON] * 2
+        assert [widget.field_name for widget in widgets] == ["choice", "choice"]
+        assert widgets[0].on_state() != widgets[1].on_state()
+
+        parents = {doc.xref_get_key(widget.xref, "Parent")[1] for widget in widgets}
+        assert len(parents) == 1
+        parent = int(parents.pop().split()[0])
+        assert doc.xref_get_key(parent, "TU") == ("string", "Auswahl")
+        assert doc.xref_get_key(doc.pdf_catalog(), "AcroForm/Fields")[1] == f"[{parent} 0 R]"
+
+        # Auswahl eines Knopfes schaltet die anderen der Gruppe aus
+        widgets[1].field_value = widgets[1].on_state()
+        widgets[1].update()
+        assert [doc.xref_get_key(widget.xref, "AS")[1] for widget in page.widgets()] == ["/Off", "/Option2"]
+
+
+def test_radio_group_can_be_renamed(blank_engine):
+    assert add_radio(blank_engine, "choice", 72)
+    assert add_radio(blank_engine, "choice", 112)
+    assert blank_engine.rename_field("choice", "answer")
+
+    assert saved_names(blank_engine) == ["answer", "answer"]
+
+
+def test_radio_name_of_other_field_is_rejected(blank_engine):
+    assert blank_engine.create_field(1, fitz.Rect(72, 72, 272, 97), "Textfeld", "name")
+    with pytest.raises(Exception):
+        add_radio(blank_engine, "name", 112)
+    assert len(blank_engine.field_index["name"]) == 1
+
+
+@pytest.mark.parametrize("field_type", ["Textfeld", "Checkbox", "Dropdown"])
+def test_existing_name_is_rejected(engine, field_type):
+    with pytest.raises(Exception):
+        engine.create_field(1, fitz.Rect(300, 300, 400, 320), field_type, "name")
+    with pytest.raises(Exception):
+        engine.create_field(1, fitz.Rect(300, 300, 400, 320), field_type, "addr.city")
+
+    assert engine.field_index["name"] == engine.build_field_index()["name"]
+    assert saved_names(engine) == ["addr.city", "addr.street", "name"]
+
+
+def overlap_engine(tmp_path, mode, blocker=(72, 72, 272, 97)):
+    path = str(tmp_path / f"{mode}.pdf")
+    doc = fitz.open()
+    page = doc.new_page()
+    widget = fitz.Widget()
+    widget.field_type = fitz.PDF_WIDGET_TYPE_TEXT
+    widget.field_name = "vorhanden"
+    widget.rect = fitz.Rect(blocker)
+    page.add_widget(widget)
+    doc.save(path)
+    doc.close()
+
+    engine = PdfFieldEngine(overlap_mode=mode)
+    assert engine.open_pdf(path)
+    return engine
+
+
+def saved_rects(engine):
+    assert engine.save()
+    with fitz.open(engine.pdf_path) as doc:
+        return {widget.field_name: tuple(round(value) for value in widget.rect) for widget in doc[0].widgets()}
+
+
+def test_shift_moves_overlapping_fields_below(tmp_path):
+    engine = overlap_engine(tmp_path, "shift")
+    assert engine.create_field(1, fitz.Rect(100, 80, 200, 100), "Textfeld", "a")
+    assert engine.create_field(1, fitz.Rect(100, 80, 200, 100), "Textfeld", "b")
+    assert engine.create_field(1, fitz.Rect(300, 80, 400, 100), "Textfeld", "frei")
+
+    assert saved_rects(engine) == {
+        "vorhanden": (72, 72, 272, 97),
+        "a": (100, 99, 200, 119),
+        "b": (100, 121, 200, 141),
+        "frei": (300, 80, 400, 100),
+    }
+    engine.close()
+
+
+def test_shift_without_free_spot_raises(tmp_path):
+    engine = overlap_engine(tmp_path, "shift", blocker=(0, 0, 595, 842))
+    with pytest.raises(Exception):
+        engine.create_field(1, fitz.Rect(100, 80, 200, 100), "Textfeld", "a")
+    assert engine.list_fields() == ["vorhanden"]
+    engine.close()
+
+
+def test_reject_raises_and_adds_nothing(tmp_path):
+    engine = overlap_engine(tmp_path, "reject")
+    with pytest.raises(Exception):
+        engine.create_field(1, fitz.Rect(100, 80, 200, 100), "Textfeld", "a")
+    assert engine.create_field(1, fitz.Rect(100, 200, 200, 220), "Textfeld", "b")
+
+    assert saved_rects(engine) == {"vorhanden": (72, 72, 272, 97), "b": (100, 200, 200, 220)}
+    engine.close()
+
+
+def test_allow_keeps_overlapping_rect(tmp_path):
+    engine = overlap_engine(tmp_path, "allow")
+    assert engine.create_field(1, fitz.Rect(100, 80, 200, 100), "Textfeld", "a")
+
+    assert saved_rects(engine) == {"vorhanden": (72, 72, 272, 97), "a": (100, 80, 200, 100)}
+    engine.close()
+
+
+def test_unknown_overlap_mode():
+    with pytest.raises(Exception):
+        PdfFieldEngine(overlap_mode="egal")
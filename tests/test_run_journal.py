@@ -0,0 +1,89 @@
+import json
+
+import pytest
+
+from src.utils.logger import get_log_sink
+from src.utils.run_journal import (
+    JOURNAL_PATTERN,
+    RunJournal,
+    load_journal,
+    main,
+    summarize_journal,
+    summarize_steps,
+)
+
+
+def write_run(journal_dir, run_id, outcomes, steps=None):
+    journal = RunJournal('create', 'PyMuPDF (direkt)', pdf='a.pdf', run_id=run_id, journal_dir=journal_dir)
+    journal.start(total=len(outcomes))
+    for index, (field_type, outcome, duration) in enumerate(outcomes):
+        journal.record(f"feld_{index}", outcome, duration, error='' if outcome == 'ok' else 'kaputt',
+                       field_type=field_type)
+    journal.finish(sum(outcome == 'ok' for _, outcome, _ in outcomes),
+                   sum(outcome != 'ok' for _, outcome, _ in outcomes), steps=steps)
+    get_log_sink(journal_dir, JOURNAL_PATTERN).flush()
+
+
+@pytest.fixture
+def journal_dir(tmp_path):
+    journal_dir = str(tmp_path / "journal")
+    write_run(journal_dir, "r1", [("Textfeld", "ok", 0.5), ("Textfeld", "failed", 1.5), ("Checkbox", "ok", 1.0)],
+              steps={"drag_field": {"count": 2, "total": 1.0, "p50": 0.4, "p95": 0.6, "max": 0.6}})
+    write_run(journal_dir, "r2", [("Textfeld", "ok", 2.0)],
+              steps={"drag_field": {"count": 2, "total": 3.0, "p50": 1.4, "p95": 1.6, "max": 1.6}})
+    return journal_dir
+
+
+def test_load_journal_reads_field_events(journal_dir):
+    df = load_journal(journal_dir)
+
+    assert df['field'].tolist() == ["feld_0", "feld_1", "feld_2", "feld_0"]
+    assert df['run_id'].tolist() == ["r1", "r1", "r1", "r2"]
+    assert df['duration'].sum() == pytest.approx(5.0)
+
+
+def test_load_journal_filters_days(tmp_path):
+    journal_dir = tmp_path / "journal"
+    journal_dir.mkdir()
+    for day in ("2024-01-01", "2024-01-02", "2024-01-03"):
+        entry = {'event': 'field', 'run_id': day, 'outcome': 'ok', 'duration': 1}
+        (journal_dir / JOURNAL_PATTERN.format(day=day)).write_text(json.dumps(entry) + "\n", encoding="utf-8")
+
+    df = load_journal(str(journal_dir), since="2024-01-02", until="2024-01-02")
+    assert df['day'].tolist() == ["2024-01-02"]
+    assert load_journal(str(tmp_path / "fehlt")).empty
+
+
+def test_summarize_journal(journal_dir):
+    summary = summarize_journal(load_journal(journal_dir), ['field_type'])
+
+    textfeld = summary.loc["Textfeld"]
+    assert (textfeld['fields'], textfeld['ok'], textfeld['failed']) == (3, 2, 1)
+    assert textfeld['total_s'] == pytest.approx(4.0)
+    assert textfeld['max_s'] == pytest.approx(2.0)
+    assert summary.index.tolist() == ["Textfeld", "Checkbox"]
+
+
+def test_summarize_steps(journal_dir):
+    steps = summarize_steps(load_journal(journal_dir, event='run_end'))
+
+    drag = steps.loc["drag_field"]
+    assert (drag['runs'], drag['count']) == (2, 4)
+    assert drag['total_s'] == pytest.approx(4.0)
+    assert drag['mean_s'] == pytest.approx(1.0)
+    assert drag['p50_s'] == pytest.approx(0.9)
+    assert drag['p95_s'] == pytest.approx(1.6)
+
+
+def test_cli(journal_dir, capsys):
+    assert main(['--dir', journal_dir, '--run', 'r1', '-g', 'outcome', '--slowest', '1', '--steps']) == 0
+
+    output = capsys.readouterr().out
+    assert "3 Felder aus 1 Läufen" in output
+    assert "drag_field" in output
+    assert "feld_1" in output
+
+
+def test_cli_without_entries(tmp_path, capsys):
+    assert main(['--dir', str(tmp_path)]) == 1
+    assert "Keine Journal-Einträge" in capsys.readouterr().out
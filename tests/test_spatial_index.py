@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from src.utils.spatial_index import SpatialIndex
+
+
+def brute_force(items, x0, y0, x1, y1):
+    return sorted(item[4] for item in items if item[0] < x1 and x0 < item[2] and item[1] < y1 and y0 < item[3])
+
+
+def random_items(count, seed=1):
+    rng = random.Random(seed)
+    items = []
+    for payload in range(count):
+        x, y = rng.uniform(0, 1000), rng.uniform(0, 1000)
+        items.append((x, y, x + rng.uniform(1, 50), y + rng.uniform(1, 50), payload))
+    return items
+
+
+@pytest.mark.parametrize("count", [0, 1, 15, 500])
+def test_query_rect_matches_brute_force(count):
+    items = random_items(count)
+    index = SpatialIndex(items, node_capacity=4)
+    rng = random.Random(2)
+
+    for _ in range(50):
+        x, y = rng.uniform(0, 1000), rng.uniform(0, 1000)
+        query = (x, y, x + rng.uniform(0, 200), y + rng.uniform(0, 200))
+        assert sorted(entry[4] for entry in index.query_rect(*query)) == brute_force(items, *query)
+
+
+def test_insert_is_visible_before_and_after_rebuild():
+    index = SpatialIndex(node_capacity=2)
+    for payload in range(40):
+        index.insert(payload * 10, 0, payload * 10 + 5, 5, payload)
+        assert [entry[4] for entry in index.query_point(payload * 10 + 1, 1)] == [payload]
+
+    assert len(index) == 40
+    assert sorted(entry[4] for entry in index.query_rect(0, 0, 400, 5)) == list(range(40))
+
+
+def test_rectangles_are_normalized():
+    index = SpatialIndex([(10, 10, 0, 0, "a")])
+    assert index.query_rect(5, 5, 6, 6)[0][:4] == (0, 0, 10, 10)
+
+
+def test_touching_edges():
+    index = SpatialIndex([(0, 0, 10, 10, "a")])
+    assert index.query_rect(10, 0, 20, 10) == []
+    assert len(index.query_rect(10, 0, 20, 10, touching=True)) == 1
+
+
+def test_query_point_returns_innermost_first():
+    index = SpatialIndex([(0, 0, 100, 100, "outer"), (10, 10, 20, 20, "inner")])
+    assert [entry[4] for entry in index.query_point(15, 15)] == ["inner", "outer"]
+    assert [entry[4] for entry in index.query_point(50, 50)] == ["outer"]
+
+
+def test_find_free_spot_moves_below_blockers():
+    index = SpatialIndex([(0, 0, 100, 20, "a"), (0, 20, 100, 40, "b")])
+    assert index.find_free_spot(10, 5, 60, 15, gap=2) == (10, 42, 60, 52)
+
+
+def test_find_free_spot_continues_in_next_column():
+    index = SpatialIndex([(0, 0, 50, 100, "a")])
+    assert index.find_free_spot(0, 0, 50, 10, bounds=(0, 0, 200, 100), gap=0) == (50, 0, 100, 10)
+
+
+def test_find_free_spot_without_room():
+    index = SpatialIndex([(0, 0, 100, 100, "a")])
+    assert index.find_free_spot(0, 0, 50, 10, bounds=(0, 0, 100, 100)) is None
@@ -0,0 +1,59 @@
+import pytest
+
+from src.utils.timing import DurationHistogram, StepTimer
+
+
+def test_histogram_percentiles_within_bucket_width():
+    histogram = DurationHistogram()
+    for millis in range(1, 1001):
+        histogram.add(millis / 1000)
+
+    assert histogram.count == 1000
+    assert histogram.total == pytest.approx(500.5)
+    assert histogram.max == pytest.approx(1.0)
+    assert histogram.percentile(0.5) == pytest.approx(0.5, rel=DurationHistogram.RATIO - 1)
+    assert histogram.percentile(0.95) == pytest.approx(0.95, rel=DurationHistogram.RATIO - 1)
+    assert histogram.percentile(1.0) == pytest.approx(1.0)
+
+
+def test_histogram_tiny_and_empty():
+    histogram = DurationHistogram()
+    assert histogram.percentile(0.5) == 0.0
+
+    histogram.add(0.0)
+    assert histogram.percentile(0.5) == 0.0
+
+
+def test_span_records_on_exception():
+    timer = StepTimer()
+    with timer.span("ok"):
+        pass
+    with pytest.raises(ValueError):
+        with timer.span("kaputt"):
+            raise ValueError()
+
+    assert sorted(timer.snapshot()) == ["kaputt", "ok"]
+    assert timer.snapshot()["ok"]["count"] == 1
+
+
+def test_snapshot_and_summary_lines():
+    timer = StepTimer()
+    for _ in range(3):
+        timer.record("drag_field", 0.8)
+    timer.record("select_tool", 0.1)
+
+    snapshot = timer.snapshot()
+    assert snapshot["drag_field"] == {'count': 3, 'total': 2.4, 'p50': pytest.approx(0.8, rel=0.05),
+                                      'p95': pytest.approx(0.8, rel=0.05), 'max': 0.8}
+
+    lines = timer.summary_lines(limit=1)
+    assert len(lines) == 1
+    assert lines[0].startswith("drag_field: p50 0.")
+    assert lines[0].endswith("(n=3)")
+
+
+def test_reset():
+    timer = StepTimer()
+    timer.record("a", 1.0)
+    timer.reset()
+    assert timer.snapshot() == {}